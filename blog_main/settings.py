@@ -1,6 +1,7 @@
 # settings.py — Render + Postgres (Supabase/Neon) + Cloudinary (MEDIA) uyumlu
 
 import os
+import tempfile
 from pathlib import Path
 import dj_database_url
 from dotenv import load_dotenv
@@ -66,6 +67,8 @@ CRISPY_TEMPLATE_PACK = "bootstrap4"
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    # REQUEST_INSTRUMENTATION kapalıyken zincirden kendini çıkarır
+    "blogs.instrumentation.RequestInstrumentationMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -124,6 +127,23 @@ else:
         }
     }
 
+# --- Önbellek ---
+# Gunicorn worker'ları ayrı process: sürüm sayaçları (blogs.cache) ve sayfa
+# önbelleği ancak tüm worker'ların gördüğü bir backend'de doğru çalışır.
+# Prod'da (DATABASE_URL) DatabaseCache; tablo deploy başında
+# `createcachetable` ile kurulur. Yerelde (tek process) locmem.
+SHARED_CACHE = bool(DATABASE_URL)
+if SHARED_CACHE:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "blogsite_cache",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+
 # --- Şifre doğrulama ---
 AUTH_PASSWORD_VALIDATORS = [
     {"NAME": "django.contrib.auth.password_validation.UserAttributeSimilarityValidator"},
@@ -184,12 +204,65 @@ NOTIFY_DEFAULT_RECIPIENTS = os.environ.get(
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# --- Görüntülenme sayacı (write-behind) ---
+# Tampon her N saniyede bir DB'ye yazılır; 0 => otomatik flush kapalı
+VIEW_COUNT_FLUSH_INTERVAL = int(os.environ.get("VIEW_COUNT_FLUSH_INTERVAL", 30))
+
+# --- Yorum moderasyonu ---
+# INSERT öncesi sırayla çalışan scorer'lar (blogs.moderation.Scorer)
+COMMENT_MODERATION_SCORERS = ["blogs.moderation.LexiconScorer"]
+# True => `expensive = True` scorer'lar arka planda; yorum o sırada PENDING
+COMMENT_MODERATION_ASYNC = os.environ.get("COMMENT_MODERATION_ASYNC", "False") == "True"
+
+# --- Anonim tam sayfa önbelleği (blogs.pagecache) ---
+# Generation sayaçları ve sayfalar cache'te: paylaşılan backend yoksa
+# (locmem) bir worker'daki geçersiz kılma diğerine ulaşmaz, varsayılan kapalı.
+ANONYMOUS_PAGE_CACHE = os.environ.get("ANONYMOUS_PAGE_CACHE", str(SHARED_CACHE)) == "True"
+
+# --- Responsive görsel türevleri (blogs.images) ---
+# Yüklemeden sonra arka planda WebP/JPEG genişlik kovaları üretilir
+IMAGE_DERIVATIVES = os.environ.get("IMAGE_DERIVATIVES", "True") == "True"
+
+# --- İlgili yazılar (blogs.related) ---
+# Blog kaydında komşu listeleri commit sonrası arka planda artımlı güncellenir
+RELATED_POSTS = os.environ.get("RELATED_POSTS", "True") == "True"
+
+# --- İstek ölçümü (blogs.instrumentation) ---
+# Staff'a Server-Timing başlığı + SLOW_REQUEST_MS üstü istekler için JSONL log
+REQUEST_INSTRUMENTATION = os.environ.get("REQUEST_INSTRUMENTATION", "False") == "True"
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 500))
+SLOW_REQUEST_TOP_SQL = int(os.environ.get("SLOW_REQUEST_TOP_SQL", 5))
+# Boşsa stdout (Render log akışı); dolu ise bu dosyaya satır satır JSON
+SLOW_REQUEST_LOG = os.environ.get("SLOW_REQUEST_LOG", "")
+
+# --- Metrikler (blogs.metrics, /metrics) ---
+# Her worker METRICS_DIR'de kendi mmap dosyasına yazar; /metrics hepsini toplar.
+# Dizin deploy başında `clear_metrics` ile temizlenir. Endpoint: staff ya da
+# "Authorization: Bearer <METRICS_TOKEN>".
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "True") == "True"
+METRICS_DIR = os.environ.get("METRICS_DIR") or os.path.join(tempfile.gettempdir(), "blogsite-metrics")
+METRICS_TOKEN = os.environ.get("METRICS_TOKEN", "")
+
 # --- Logging (özet) ---
 LOGGING = {
     "version": 1,
     "disable_existing_loggers": False,
-    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "formatters": {"jsonl": {"format": "%(message)s"}},
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+        "slow_requests": (
+            {"class": "logging.handlers.WatchedFileHandler", "filename": SLOW_REQUEST_LOG, "formatter": "jsonl"}
+            if SLOW_REQUEST_LOG
+            else {"class": "logging.StreamHandler", "stream": "ext://sys.stdout", "formatter": "jsonl"}
+        ),
+    },
     "root": {"handlers": ["console"], "level": "INFO" if not DEBUG else "DEBUG"},
+    "loggers": {
+        # Pillow DEBUG'da her plugin import'unu loglar
+        "PIL": {"level": "INFO"},
+        # Satır başına bir JSON nesnesi; root'a yayılmaz
+        "blogs.slow_requests": {"handlers": ["slow_requests"], "level": "INFO", "propagate": False},
+    },
 }
 
 
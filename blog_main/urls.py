@@ -4,14 +4,11 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.views.generic import TemplateView
 from django.contrib.auth import views as auth_views
-from django.views.generic import RedirectView
 from django.shortcuts import render
 
 from . import views
-from django.contrib.sitemaps.views import sitemap
-from blogs.sitemaps import BlogSitemap
-
-sitemaps = {"blogs": BlogSitemap}
+from blogs import views as blog_views
+from blogs import sitemaps
 
 urlpatterns = [
     path("admin/", admin.site.urls),
@@ -19,12 +16,14 @@ urlpatterns = [
     # Health
     path("healthz", views.healthz, name="healthz"),
     path("_home_smoke", views.home_smoke, name="home_smoke"),
+    path("metrics", views.metrics, name="metrics"),
 
     # Ana sayfa
     path("", views.home, name="home"),
 
     # Sitemap
-    path("sitemap.xml", sitemap, {"sitemaps": sitemaps}, name="sitemap"),
+    path("sitemap.xml", sitemaps.index, name="sitemap"),
+    path("sitemap-blogs-<int:shard>.xml", sitemaps.shard, name="sitemap_shard"),
 
     # Auth
     path("register/", views.register, name="register"),
@@ -43,7 +42,8 @@ urlpatterns = [
 
     # robots.txt
     path("robots.txt", TemplateView.as_view(template_name="robots.txt", content_type="text/plain")),
-    path("search/", RedirectView.as_view(pattern_name="blogs:search"), name="search"),
+    # Eski isim korunuyor; aynı path'e RedirectView sonsuz yönlendirme yapıyordu
+    path("search/", blog_views.search, name="search"),
 
     # Blog app (namespace = blogs)
     path("", include(("blogs.urls", "blogs"), namespace="blogs")),
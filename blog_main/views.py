@@ -1,6 +1,7 @@
+import hmac
+
 from django.shortcuts import render, redirect
-from django.http import HttpResponse
-from django.core.paginator import Paginator
+from django.http import Http404, HttpResponse
 from django.contrib import messages
 from django.contrib import auth
 from django.contrib.auth import login as auth_login
@@ -8,7 +9,10 @@ from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.models import User
 from django.conf import settings
 
+from blogs import metrics as blog_metrics
 from blogs.models import Blog
+from blogs.pagecache import LISTING, anonymous_page_cache, counts_scope
+from blogs.pagination import KeysetPaginator
 from .forms import RegistrationForm
 
 
@@ -20,7 +24,19 @@ def home_smoke(request):
     return HttpResponse("home ok", content_type="text/plain", status=200)
 
 
+def metrics(request):
+    """Prometheus text formatı; tüm gunicorn worker'larının toplamı."""
+    if not blog_metrics.enabled():
+        raise Http404
+    token = getattr(settings, "METRICS_TOKEN", "")
+    bearer = request.headers.get("Authorization", "")
+    if not (request.user.is_staff or (token and hmac.compare_digest(bearer, f"Bearer {token}"))):
+        return HttpResponse("forbidden", content_type="text/plain", status=403)
+    return HttpResponse(blog_metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 # ---- Home ----
+@anonymous_page_cache(lambda request: [LISTING, counts_scope()])
 def home(request):
     """
     Anasayfa. Kayıt sonrası tek seferlik 'new_user' bayrağını
@@ -35,9 +51,10 @@ def home(request):
 
     recent_posts_qs = Blog.objects.filter(
         is_featured=False, status="Published"
-    ).order_by("-updated_at")
+    ).select_related("author")
 
-    page_obj = Paginator(recent_posts_qs, 5).get_page(request.GET.get("page"))
+    # (updated_at, id) keyset: COUNT / OFFSET yok
+    page_obj = KeysetPaginator(recent_posts_qs, 5).get_page(request.GET.get("cursor"))
 
     return render(request, "home.html", {
         "featured_posts": featured_posts,
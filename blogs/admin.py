@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.admin.sites import NotRegistered
+from django.db import transaction
 
 from .models import (
     Category,
@@ -8,8 +9,12 @@ from .models import (
     Profile,
     CommentStatus,
     ContactMessage,
+    NotificationOutbox,
     # StaticPage  # aşağıda try/except ile ele alacağız
 )
+from .counters import sync_comment_counts
+from .pagecache import comment_count_scopes, invalidate as invalidate_pages
+from .remoderation import ADMIN_APPROVED, ADMIN_REJECTED, remoderate
 
 # -----------------------------
 # Category
@@ -46,18 +51,36 @@ class CommentAdmin(admin.ModelAdmin):
     list_display = ("id", "blog", "user", "short", "status", "toxicity", "sentiment", "is_spam", "created_at")
     list_filter = ("status", "is_spam", ("created_at", admin.DateFieldListFilter))
     search_fields = ("comment", "user__username", "blog__title")
-    actions = ["approve", "reject"]
+    actions = ["approve", "reject", "remoderate"]
 
     def short(self, obj):
         return (obj.comment or "")[:40]
 
     @admin.action(description="Seçili yorumları onayla")
     def approve(self, request, queryset):
-        queryset.update(status=CommentStatus.APPROVED, reason="admin onayı")
+        self._set_status(queryset, CommentStatus.APPROVED, ADMIN_APPROVED)
 
     @admin.action(description="Seçili yorumları reddet")
     def reject(self, request, queryset):
-        queryset.update(status=CommentStatus.REJECTED, reason="admin reddi")
+        self._set_status(queryset, CommentStatus.REJECTED, ADMIN_REJECTED)
+
+    @admin.action(description="Seçili yorumları güncel sözlükle yeniden değerlendir")
+    def remoderate(self, request, queryset):
+        # Elle verilmiş admin kararları korunur (bkz. blogs/remoderation.py)
+        report = remoderate(queryset)
+        changes = ", ".join(f"{old}→{new}: {n}" for (old, new), n in report.transitions.items())
+        self.message_user(
+            request, f"{report.scanned} yorum tarandı, {report.changed} güncellendi. {changes}".strip()
+        )
+
+    def _set_status(self, queryset, status, reason):
+        # queryset.update sinyal tetiklemez: sayaçlar aynı transaction'da yeniden hesaplanır
+        blogs = {pk: (slug, category_id) for pk, slug, category_id in
+                 queryset.values_list("blog_id", "blog__slug", "blog__category_id").distinct()}
+        with transaction.atomic():
+            queryset.update(status=status, reason=reason)
+            sync_comment_counts(blogs.keys())
+        invalidate_pages(*{scope for blog in blogs.values() for scope in comment_count_scopes(*blog)})
 
 
 # -----------------------------
@@ -77,6 +100,16 @@ class ContactMessageAdmin(admin.ModelAdmin):
     search_fields = ("name", "email")
 
 
+# -----------------------------
+# NotificationOutbox
+# -----------------------------
+@admin.register(NotificationOutbox)
+class NotificationOutboxAdmin(admin.ModelAdmin):
+    list_display = ("id", "blog", "status", "sent_count", "attempts", "next_attempt_at", "created_at")
+    list_filter = ("status",)
+    readonly_fields = ("cursor", "sent_count", "attempts", "locked_until", "last_error")
+
+
 # -----------------------------
 # StaticPage (varsa)
 # -----------------------------
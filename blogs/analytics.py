@@ -0,0 +1,128 @@
+# blogs/analytics.py
+"""
+Analitik olay -> günlük özet (rollup) hattı.
+
+Olaylar (AnalyticsEvent) sadece eklenir:
+- view: okuma yolunda yazılmaz; viewcounts tamponu flush ederken blog
+  başına tek satır (count = aralıktaki görüntülenme) ekler,
+- like / unlike / save: ilgili view'dan, comment: Comment post_save'den.
+
+`rollup()` artımlıdır: RollupCursor'dan sonraki olayların düştüğü
+günleri ve her çalışmada son TRAILING_DAYS günü olaylardan baştan
+hesaplar (DELETE + tek GROUP BY + bulk_create). Sabit pencere, cursor'dan
+küçük id ile geç commit olan olayları da (id'ler commit sırasıyla
+gelmez) kaçırmamak içindir. Gün bazında yeniden hesaplandığı için aynı
+günü tekrar toplamak aynı sonucu verir (idempotent); `replay()` bir tarih
+aralığını aynı yoldan, tek sorguda yeniden kurar. Prod'da `rollup_analytics`
+5 dakikada bir cron olarak çalışır (render.yaml).
+"""
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Max, Min, Q, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import AnalyticsEvent, Blog, DailyPostStats, EventKind, RollupCursor
+
+CURSOR_NAME = "daily_post_stats"
+BATCH = 2_000
+TRAILING_DAYS = 2  # bugün + dün: her rollup'ta yeniden toplanır
+
+# DailyPostStats kolonu -> olay türü
+COLUMNS = {
+    "views": EventKind.VIEW,
+    "likes": EventKind.LIKE,
+    "unlikes": EventKind.UNLIKE,
+    "comments": EventKind.COMMENT,
+    "saves": EventKind.SAVE,
+}
+
+
+def record(kind, blog_id, user_id=None, count=1):
+    AnalyticsEvent.objects.create(kind=kind, blog_id=blog_id, user_id=user_id, count=count)
+
+
+def record_views(counts, at=None):
+    """{blog_id: n} -> blog başına tek view olayı (viewcounts flush'ından)."""
+    at = at or timezone.now()
+    AnalyticsEvent.objects.bulk_create(
+        [AnalyticsEvent(kind=EventKind.VIEW, blog_id=pk, count=n, created_at=at) for pk, n in counts.items()],
+        batch_size=BATCH,
+    )
+
+
+def _start_of(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def replay(first_day, last_day):
+    """[first_day, last_day] günlerini olaylardan yeniden kurar; yazılan satır sayısını döner."""
+    aggregates = {col: Sum("count", filter=Q(kind=kind), default=0) for col, kind in COLUMNS.items()}
+    rows = (
+        AnalyticsEvent.objects.filter(
+            created_at__gte=_start_of(first_day), created_at__lt=_start_of(last_day + timedelta(days=1))
+        )
+        .annotate(day=TruncDate("created_at", tzinfo=timezone.get_current_timezone()))
+        .order_by()
+        .values("day", "blog_id")
+        .annotate(**aggregates)
+    )
+    with transaction.atomic():
+        live = set(Blog.objects.values_list("pk", flat=True))
+        stats = [DailyPostStats(**row) for row in rows if row["blog_id"] in live]
+        DailyPostStats.objects.filter(day__gte=first_day, day__lte=last_day).delete()
+        DailyPostStats.objects.bulk_create(stats, batch_size=BATCH)
+    return len(stats)
+
+
+def rollup():
+    """
+    Cursor'dan sonraki olayların günlerini ve son TRAILING_DAYS günü yeniden
+    toplar, cursor'ı ilerletir. (toplanan gün sayısı, yazılan satır sayısı) döner.
+    """
+    last = timezone.localdate()
+    first = last - timedelta(days=TRAILING_DAYS - 1)
+    with transaction.atomic():
+        cursor, _ = RollupCursor.objects.select_for_update().get_or_create(name=CURSOR_NAME)
+        new = AnalyticsEvent.objects.filter(pk__gt=cursor.last_event_id)
+        bounds = new.aggregate(last=Max("pk"), first_at=Min("created_at"), last_at=Max("created_at"))
+        if bounds["last"] is not None:
+            # Pencere dışına düşen yeni olayların günleri de (arada kalanlarla) eklenir
+            first = min(first, timezone.localdate(bounds["first_at"]))
+            last = max(last, timezone.localdate(bounds["last_at"]))
+            cursor.last_event_id = bounds["last"]
+            cursor.save(update_fields=["last_event_id", "updated_at"])
+        written = replay(first, last)
+    return (last - first).days + 1, written
+
+
+# ---- Dashboard okumaları (sadece özet tablodan) ----
+def daily_totals(days=30):
+    """Son `days` gün için [{day, views, likes, ...}] — eksik günler 0 ile doldurulur."""
+    today = timezone.localdate()
+    first = today - timedelta(days=days - 1)
+    rows = {
+        row["day"]: row
+        for row in DailyPostStats.objects.filter(day__gte=first)
+        .order_by()
+        .values("day")
+        .annotate(**{col: Sum(col) for col in COLUMNS})
+    }
+    empty = dict.fromkeys(COLUMNS, 0)
+    return [
+        rows.get(day, {"day": day, **empty})
+        for day in (first + timedelta(days=i) for i in range(days))
+    ]
+
+
+def top_posts(days=7, by="views", limit=10):
+    first = timezone.localdate() - timedelta(days=days - 1)
+    return list(
+        DailyPostStats.objects.filter(day__gte=first)
+        .order_by()
+        .values("blog_id", "blog__title", "blog__slug")
+        .annotate(total=Sum(by))
+        .filter(total__gt=0)
+        .order_by("-total")[:limit]
+    )
@@ -0,0 +1,11 @@
+# blogs/benchmark/__init__.py
+"""
+Uçtan uca performans ölçümü.
+
+- `data`: tohumlu (deterministik) veri üreteci — kullanıcılar, kategoriler,
+  yazılar, yorum ağaçları, beğeniler, kaydedilenler, görseller.
+  Komut: `seed_benchmark_data`.
+- `runner`: public view'ları Django test client ile sürer; p50/p95,
+  sorgu sayısı, tepe bellek. Sonuçlar JSON; kayıtlı baseline ile
+  karşılaştırılır. Komut: `run_benchmarks`.
+"""
@@ -0,0 +1,342 @@
+# blogs/benchmark/data.py
+"""
+Tohumlu veri üreteci: aynı ölçek + seed her seferinde aynı veriyi üretir.
+
+Zaman damgaları sabit BASE_TIME'a göredir; sadece dashboard özetleri
+(DailyPostStats) son 30 güne, yani bugüne göre yazılır.
+
+Her şey bulk_create ile yazılır (sinyaller çalışmaz); sinyallerin tuttuğu
+türetilmiş veriler — sayaçlar, arama indeksi, ilgili yazılar, görsel
+türevleri — `import_fixture`'daki gibi sonda toplu kurulur.
+
+Görseller default storage'a yazılır; ölçümlerde `temporary_media()`
+içinde çalıştırın (geliştirme medyasına / Cloudinary'ye dokunulmaz).
+"""
+import random
+import shutil
+import tempfile
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from io import BytesIO
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from PIL import Image, ImageDraw
+
+from .. import pagecache, related
+from ..context_processors import categories_cache, social_links_cache
+from ..counters import sync_comment_counts, sync_like_counts, sync_post_counts
+from ..images import build_derivatives
+from ..importer import raw_timestamps
+from ..models import Blog, Category, Comment, CommentStatus, DailyPostStats, Profile, SavedPost
+from ..search import get_backend
+from ..slugs import assign_slugs
+
+Scale = namedtuple("Scale", "users categories posts comments")
+
+SCALES = {
+    "tiny": Scale(users=8, categories=3, posts=24, comments=120),
+    "small": Scale(users=50, categories=6, posts=300, comments=3_000),
+    "medium": Scale(users=300, categories=12, posts=3_000, comments=30_000),
+    "large": Scale(users=2_000, categories=20, posts=20_000, comments=200_000),
+}
+
+BATCH = 2_000
+BASE_TIME = datetime(2025, 1, 1, tzinfo=dt_timezone.utc)
+USERNAME_PREFIX = "bench"
+STAFF_USERNAME = "bench_admin"
+PASSWORD = "bench-pass"
+
+PUBLISHED_SHARE = 0.9
+FEATURED_SHARE = 0.05
+ROOT_SHARE = 0.5          # yorumların kök olma olasılığı; kalanı yakın bir yoruma yanıt
+MAX_DEPTH = 6
+POST_LIKES = 8            # ortalama (üstel dağılım)
+COMMENT_LIKES = 0.6
+SAVES_PER_USER = 5
+DAILY_POSTS = 40          # dashboard: gün başına istatistiği olan yazı
+STATS_DAYS = 30
+IMAGE_COUNT = 6
+IMAGE_SIZE = (1600, 1000)
+
+TOPICS = {
+    "Teknoloji": "yazılım bilgisayar internet uygulama telefon yapay zeka veri sunucu kod geliştirici güvenlik bulut",
+    "Spor": "futbol basketbol maç takım gol antrenman lig şampiyon koşu forma stadyum taraftar",
+    "Yemek": "tarif fırın tavuk çorba salata tatlı baharat mutfak lezzet sebze hamur makarna",
+    "Seyahat": "şehir tatil otel uçak müze sahil rota kamp harita bilet yolculuk köy",
+    "Bilim": "deney uzay gezegen hücre enerji fizik kimya araştırma teori gözlem laboratuvar evrim",
+    "Sanat": "resim müzik sergi heykel tiyatro sinema roman şiir konser sahne fotoğraf galeri",
+}
+COMMON = "bugün gerçekten yeni güzel önemli farklı büyük küçük zaman insan hayat dünya yıl gün fikir deneyim".split()
+COMMENT_WORDS = (
+    "harika yazı teşekkürler çok güzel anlatım katılıyorum bence eksik bilgi faydalı oldu "
+    "merak ettim soru devamı gelsin süper iyi kaynak var mı"
+).split()
+
+
+# ---- Metin ----
+def _sentence(rng, words, n):
+    return " ".join(rng.choice(words) for _ in range(n)).capitalize() + "."
+
+
+def _title(rng, words):
+    return " ".join(rng.choice(words) for _ in range(rng.randint(3, 7))).title()[:100]
+
+
+def _body(rng, words):
+    paragraphs = [
+        " ".join(_sentence(rng, words, rng.randint(6, 14)) for _ in range(rng.randint(2, 4)))
+        for _ in range(rng.randint(2, 4))
+    ]
+    return "".join(f"<p>{p}</p>" for p in paragraphs)[:2000]
+
+
+# ---- Görseller ----
+@contextmanager
+def temporary_media():
+    """Geçici MEDIA_ROOT'lu FileSystemStorage; çıkışta dizin silinir."""
+    media = tempfile.mkdtemp(prefix="bench-media-")
+    storages = {**settings.STORAGES, "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"}}
+    try:
+        with override_settings(MEDIA_ROOT=media, STORAGES=storages):
+            yield media
+    finally:
+        shutil.rmtree(media, ignore_errors=True)
+
+
+def _images():
+    """IMAGE_COUNT adet JPEG (storage'da yoksa üretilir); rng'ye dokunmaz."""
+    names = []
+    for i in range(IMAGE_COUNT):
+        name = f"bench/image-{i}.jpg"
+        if not default_storage.exists(name):
+            img = Image.new("RGB", IMAGE_SIZE, ((i * 73) % 256, (i * 151) % 256, (i * 199) % 256))
+            draw = ImageDraw.Draw(img)
+            for band in range(0, IMAGE_SIZE[0], 100):
+                draw.rectangle([band, 0, band + 40, IMAGE_SIZE[1]], fill=((band + i * 40) % 256, 128, 200))
+            buf = BytesIO()
+            img.save(buf, "JPEG", quality=85)
+            name = default_storage.save(name, ContentFile(buf.getvalue()))
+        names.append(name)
+    return names
+
+
+# ---- Üretim adımları ----
+def _users(rng, scale, images):
+    User = get_user_model()
+    password = make_password(PASSWORD)
+    users = [User(
+        username=STAFF_USERNAME, email=f"{STAFF_USERNAME}@example.com", password=password,
+        is_staff=True, is_superuser=True, date_joined=BASE_TIME,
+    )]
+    users += [
+        User(
+            username=f"{USERNAME_PREFIX}{i:05d}", email=f"{USERNAME_PREFIX}{i:05d}@example.com",
+            password=password, date_joined=BASE_TIME + timedelta(hours=i),
+        )
+        for i in range(scale.users)
+    ]
+    User.objects.bulk_create(users, batch_size=BATCH)
+    Profile.objects.bulk_create(
+        [
+            Profile(
+                user=u, bio=_sentence(rng, COMMON, rng.randint(4, 12)),
+                avatar=rng.choice(images) if images and rng.random() < 0.5 else None,
+            )
+            for u in users
+        ],
+        batch_size=BATCH,
+    )
+    return users
+
+
+def _categories(scale):
+    names = list(TOPICS)
+    categories = [
+        Category(
+            category_name=names[i % len(names)] + (f" {i // len(names) + 1}" if i >= len(names) else ""),
+            created_at=BASE_TIME, updated_at=BASE_TIME,
+        )
+        for i in range(scale.categories)
+    ]
+    return Category.objects.bulk_create(categories)
+
+
+def _posts(rng, scale, users, categories, images):
+    topics = list(TOPICS.values())
+    posts = []
+    for i in range(scale.posts):
+        c = rng.randrange(len(categories))
+        words = topics[c % len(topics)].split() + COMMON
+        created = BASE_TIME + timedelta(minutes=37 * i + rng.randrange(30))
+        posts.append(Blog(
+            title=_title(rng, words),
+            category=categories[c],
+            author=rng.choice(users),
+            short_description=_sentence(rng, words, rng.randint(8, 20)),
+            blog_body=_body(rng, words),
+            status="Published" if rng.random() < PUBLISHED_SHARE else "Draft",
+            is_featured=rng.random() < FEATURED_SHARE,
+            featured_image=rng.choice(images) if images and rng.random() < 0.6 else None,
+            view_count=rng.randrange(5_000),
+            created_at=created,
+            updated_at=created,
+        ))
+    for start in range(0, len(posts), BATCH):
+        batch = posts[start:start + BATCH]
+        assign_slugs(batch)
+        Blog.objects.bulk_create(batch)
+    return posts
+
+
+def _comments(rng, scale, users, published, images):
+    """Yorum ağaçları; seviye seviye yazılır ki yanıtlar ebeveyn pk'sını bilsin."""
+    if not published:
+        return []
+    weights = [rng.paretovariate(1.3) for _ in published]
+    per_post = [0] * len(published)
+    for p in rng.choices(range(len(published)), weights, k=scale.comments):
+        per_post[p] += 1
+
+    levels = [[] for _ in range(MAX_DEPTH + 1)]
+    for post, n in zip(published, per_post):
+        nodes = []
+        for k in range(n):
+            r = rng.random()
+            status = (
+                CommentStatus.APPROVED if r < 0.9 else CommentStatus.PENDING if r < 0.96 else CommentStatus.REJECTED
+            )
+            created = post.created_at + timedelta(minutes=5 + 11 * k + rng.randrange(10))
+            comment = Comment(
+                blog=post, user=rng.choice(users),
+                comment=_sentence(rng, COMMENT_WORDS, rng.randint(3, 25))[:250],
+                status=status, sentiment=round(rng.uniform(-1, 1), 3),
+                image=rng.choice(images) if images and rng.random() < 0.02 else None,
+                created_at=created, updated_at=created,
+            )
+            parents = [c for c in nodes[-12:] if c.depth < MAX_DEPTH]
+            if nodes and parents and rng.random() >= ROOT_SHARE:
+                comment._parent = rng.choice(parents)
+                comment.depth = comment._parent.depth + 1
+            else:
+                comment._parent = None
+            nodes.append(comment)
+            levels[comment.depth].append(comment)
+
+    for level in levels:
+        for comment in level:
+            parent = comment._parent
+            if parent is not None:
+                comment.parent_comment_id = parent.pk
+                comment.root_id = parent.root_id or parent.pk
+                comment.path = f"{parent.path}{parent.pk:010d}/"
+        Comment.objects.bulk_create(level, batch_size=BATCH)
+    return [c for level in levels for c in level]
+
+
+def _sample(rng, population, mean):
+    return rng.sample(population, min(len(population), int(rng.expovariate(1 / mean))))
+
+
+def _likes_and_saves(rng, users, published, comments):
+    user_ids = [u.pk for u in users]
+    post_likes = [
+        Blog.likes.through(blog_id=post.pk, user_id=uid)
+        for post in published for uid in _sample(rng, user_ids, POST_LIKES)
+    ]
+    Blog.likes.through.objects.bulk_create(post_likes, batch_size=BATCH)
+    comment_likes = [
+        Comment.likes.through(comment_id=c.pk, user_id=uid)
+        for c in comments for uid in _sample(rng, user_ids, COMMENT_LIKES)
+    ]
+    Comment.likes.through.objects.bulk_create(comment_likes, batch_size=BATCH)
+    saved = [
+        SavedPost(user_id=uid, post=post, saved_at=post.created_at + timedelta(days=1))
+        for uid in user_ids for post in _sample(rng, published, SAVES_PER_USER)
+    ]
+    SavedPost.objects.bulk_create(saved, batch_size=BATCH)
+    return len(post_likes), len(comment_likes), len(saved)
+
+
+def _daily_stats(rng, published):
+    today = timezone.localdate()
+    rows = [
+        DailyPostStats(
+            day=today - timedelta(days=d), blog=post,
+            views=rng.randint(1, 500), likes=rng.randint(0, 20), unlikes=rng.randint(0, 3),
+            comments=rng.randint(0, 10), saves=rng.randint(0, 5),
+        )
+        for d in range(STATS_DAYS)
+        for post in rng.sample(published, min(len(published), DAILY_POSTS))
+    ]
+    DailyPostStats.objects.bulk_create(rows, batch_size=BATCH)
+    return len(rows)
+
+
+def _derived(images):
+    """Sinyallerin yerine: sayaçlar, arama indeksi, ilgili yazılar, görsel türevleri, önbellekler."""
+    with transaction.atomic():
+        sync_like_counts(Blog)
+        sync_like_counts(Comment)
+        sync_comment_counts()
+        sync_post_counts()
+    get_backend().rebuild(
+        Blog.objects.filter(status="Published")
+        .values_list("id", "title", "short_description", "blog_body")
+        .iterator()
+    )
+    related.rebuild()
+    for name in images:
+        build_derivatives(name)
+    categories_cache.invalidate()
+    social_links_cache.invalidate()
+    pagecache.invalidate(pagecache.GLOBAL)
+
+
+def generate(scale, seed=42, images=True, log=None):
+    """
+    scale (ad veya Scale) kadar veri üretir; {ad: satır sayısı} döner.
+    log(adım, saniye) verilirse her adımdan sonra çağrılır.
+    """
+    if isinstance(scale, str):
+        scale = SCALES[scale]
+    rng = random.Random(seed)
+    image_names = _images() if images else []
+    counts = {}
+    t0 = time.perf_counter()
+
+    def step(name):
+        nonlocal t0
+        if log:
+            log(name, time.perf_counter() - t0)
+        t0 = time.perf_counter()
+
+    with transaction.atomic(), raw_timestamps([Blog, Category, Comment, SavedPost]):
+        users = _users(rng, scale, image_names)
+        counts["users"] = len(users)
+        step("users")
+        categories = _categories(scale)
+        counts["categories"] = len(categories)
+        posts = _posts(rng, scale, users, categories, image_names)
+        published = [p for p in posts if p.status == "Published"]
+        counts["posts"], counts["published"] = len(posts), len(published)
+        step("posts")
+        comments = _comments(rng, scale, users, published, image_names)
+        counts["comments"] = len(comments)
+        step("comments")
+        counts["post_likes"], counts["comment_likes"], counts["saved"] = _likes_and_saves(
+            rng, users, published, comments
+        )
+        counts["daily_stats"] = _daily_stats(rng, published)
+        step("likes, saves, stats")
+    _derived(image_names)
+    step("derived")
+    return counts
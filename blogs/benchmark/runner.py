@@ -0,0 +1,279 @@
+# blogs/benchmark/runner.py
+"""
+Public view'ları Django test client ile sürer ve ölçer.
+
+Her senaryo için: `warmup` ısınma isteği, `repeat` zamanlanmış istek
+(p50 / p95 / ortalama), ayrıca sorgu sayısı için bir istek
+(CaptureQueriesContext) ve tepe bellek için bir istek (tracemalloc).
+Ölçüm araçları zamanlanan isteklere eklenmez. Hedefler (yazı, kategori,
+yorum, arama kelimesi) istek sırasına göre döndürülür; aynı seed aynı
+istek dizisini verir.
+
+Sonuçlar:
+    {"meta": {...}, "scales": {"small": {"data": {...}, "generate_s": ..,
+     "views": {"home": {"p50_ms", "p95_ms", "mean_ms", "queries", "peak_kb", "status"}}}}}
+"""
+import math
+import platform
+import random
+import statistics
+import subprocess
+import time
+import tracemalloc
+from collections import Counter
+from pathlib import Path
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection, reset_queries
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from ..models import Blog, Category, Comment, CommentStatus
+from ..viewcounts import buffer as view_buffer
+from .data import SCALES, STAFF_USERNAME, USERNAME_PREFIX, generate
+
+TARGETS = 20
+KEYWORDS = ["futbol", "yazılım", "tarif", "müze", "deney", "resim", "yapay zeka", "şehir tatil"]
+# Göreli karşılaştırılan metrikler ve gürültü tabanı (bundan küçük artış gerileme sayılmaz);
+# sorgu sayısı birebir karşılaştırılır
+NOISE_FLOOR = {"p50_ms": 2.0, "p95_ms": 2.0, "peak_kb": 64}
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+class Targets:
+    """Senaryoların döndürerek kullandığı hedefler (veri üretildikten sonra kurulur)."""
+
+    def __init__(self, seed):
+        rng = random.Random(seed)
+        published = Blog.objects.filter(status="Published")
+        hot = list(published.order_by("-comment_count", "pk").values_list("pk", "slug")[:TARGETS // 2])
+        rest = list(published.order_by("pk").values_list("pk", "slug"))
+        self.posts = hot + rng.sample(rest, min(len(rest), TARGETS - len(hot)))
+        self.categories = list(Category.objects.order_by("pk").values_list("pk", flat=True))
+        self.comments = list(
+            Comment.objects.filter(blog_id__in=[pk for pk, _ in self.posts], status=CommentStatus.APPROVED)
+            .order_by("pk").values_list("pk", flat=True)[:TARGETS]
+        )
+        User = get_user_model()
+        # En hareketli okur: profil sekmeleri dolu olsun
+        self.user = (
+            User.objects.filter(username__startswith=USERNAME_PREFIX, is_staff=False)
+            .annotate(n=Count("liked_posts"))
+            .order_by("-n", "pk")
+            .first()
+        )
+        self.staff = User.objects.get(username=STAFF_USERNAME)
+
+    @staticmethod
+    def _pick(items, i):
+        return items[i % len(items)]
+
+    def post(self, i):
+        return self._pick(self.posts, i)
+
+    def category(self, i):
+        return self._pick(self.categories, i)
+
+    def comment(self, i):
+        return self._pick(self.comments, i)
+
+    def keyword(self, i):
+        return self._pick(KEYWORDS, i)
+
+
+class Scenario:
+    """path(targets, i) -> URL; data(targets, i) -> POST gövdesi; user: None | "user" | "staff"."""
+
+    def __init__(self, name, path, user=None, method="get", data=None, ajax=False):
+        self.name = name
+        self.path = path
+        self.user = user
+        self.method = method
+        self.data = data
+        self.ajax = ajax
+
+    def request(self, client, targets, i):
+        extra = {"secure": True}
+        if self.ajax:
+            extra["HTTP_X_REQUESTED_WITH"] = "XMLHttpRequest"
+        url = self.path(targets, i)
+        if self.method == "post":
+            return client.post(url, self.data(targets, i) if self.data else {}, **extra)
+        return client.get(url, **extra)
+
+
+def _post_url(name):
+    return lambda t, i: reverse(name, args=[t.post(i)[1]])
+
+
+SCENARIOS = [
+    Scenario("home", lambda t, i: reverse("home")),
+    Scenario("blogs", _post_url("blogs:blogs")),
+    Scenario("blogs_auth", _post_url("blogs:blogs"), user="user"),
+    Scenario("search", lambda t, i: reverse("blogs:search") + "?" + urlencode({"keyword": t.keyword(i)})),
+    Scenario("posts_by_category", lambda t, i: reverse("blogs:posts_by_category", args=[t.category(i)])),
+    Scenario("profile_view", lambda t, i: reverse("blogs:profile", args=[t.user.username]), user="user"),
+    Scenario(
+        "profile_tab",
+        lambda t, i: reverse("blogs:profile_tab", args=[t.user.username, ("liked", "comments", "saved")[i % 3]]),
+        user="user",
+    ),
+    Scenario("like_post", _post_url("blogs:like_post"), user="user", method="post", ajax=True),
+    Scenario("toggle_save_post", _post_url("blogs:toggle_save_post"), user="user", method="post", ajax=True),
+    Scenario(
+        "like_comment", lambda t, i: reverse("blogs:like_comment", args=[t.comment(i)]),
+        user="user", method="post", ajax=True,
+    ),
+    Scenario(
+        "comment_add", lambda t, i: reverse("blogs:comment_add", args=[t.post(i)[0]]),
+        user="user", method="post", ajax=True,
+        data=lambda t, i: {"comment": f"Güzel bir yazı olmuş, teşekkürler ({i})"},
+    ),
+    Scenario("feed_rss", lambda t, i: reverse("blogs:feed_rss")),
+    Scenario("dashboard", lambda t, i: reverse("dashboard"), user="staff"),
+    Scenario("dashboard_posts", lambda t, i: reverse("posts"), user="staff"),
+    Scenario("dashboard_categories", lambda t, i: reverse("categories"), user="staff"),
+    Scenario("dashboard_users", lambda t, i: reverse("users"), user="staff"),
+]
+
+
+# ---- Ölçüm ----
+def percentile(values, pct):
+    """En yakın sıra yöntemiyle yüzdelik."""
+    ordered = sorted(values)
+    return ordered[max(0, math.ceil(pct / 100 * len(ordered)) - 1)]
+
+
+def measure(scenario, client, targets, repeat, warmup):
+    i = 0
+    for _ in range(warmup):
+        scenario.request(client, targets, i)
+        i += 1
+
+    times, statuses = [], Counter()
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        response = scenario.request(client, targets, i)
+        times.append((time.perf_counter() - t0) * 1000)
+        statuses[str(response.status_code)] += 1
+        i += 1
+
+    reset_queries()  # queries_log sınırlı bir deque; doluysa yakalanan dilim boş kalır
+    with CaptureQueriesContext(connection) as ctx:
+        scenario.request(client, targets, i)
+    queries = len(ctx)  # sonraki istek (request_started) queries_log'u sıfırlar
+    tracemalloc.start()
+    try:
+        scenario.request(client, targets, i + 1)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "p50_ms": round(percentile(times, 50), 2),
+        "p95_ms": round(percentile(times, 95), 2),
+        "mean_ms": round(statistics.fmean(times), 2),
+        "queries": queries,
+        "peak_kb": peak // 1024,
+        "status": dict(statuses),
+    }
+
+
+def _clients(targets):
+    clients = {None: Client(), "user": Client(), "staff": Client()}
+    clients["user"].force_login(targets.user)
+    clients["staff"].force_login(targets.staff)
+    return clients
+
+
+def run_scale(scale, seed=42, repeat=20, warmup=3, scenarios=SCENARIOS, log=None):
+    """Mevcut (boş) veritabanına scale kadar veri üretip senaryoları ölçer."""
+    cache.clear()
+    t0 = time.perf_counter()
+    data = generate(scale, seed=seed, log=(lambda step, secs: log(f"  üretim: {step} {secs:.1f}s")) if log else None)
+    generate_s = round(time.perf_counter() - t0, 2)
+
+    targets = Targets(seed)
+    clients = _clients(targets)
+    views = {}
+    for scenario in scenarios:
+        views[scenario.name] = result = measure(scenario, clients[scenario.user], targets, repeat, warmup)
+        if log:
+            log(
+                f"  {scenario.name:22s} p50 {result['p50_ms']:8.2f}ms  p95 {result['p95_ms']:8.2f}ms  "
+                f"{result['queries']:4d} sorgu  {result['peak_kb']:7d} KB"
+            )
+    view_buffer.flush()
+    return {"data": data, "generate_s": generate_s, "views": views}
+
+
+def _git_revision():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=settings.BASE_DIR,
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def run(scales, seed=42, repeat=20, warmup=3, scenarios=SCENARIOS, log=None):
+    """
+    Her ölçeği boş veritabanında sırayla çalıştırır (ölçekler arasında flush).
+    Test veritabanı içinde çağrılmalı: mevcut veriyi siler.
+    """
+    results = {
+        "meta": {
+            "created": timezone.now().isoformat(timespec="seconds"),
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "database": connection.vendor,
+            "seed": seed,
+            "repeat": repeat,
+            "warmup": warmup,
+            "page_cache": getattr(settings, "ANONYMOUS_PAGE_CACHE", False),
+        },
+        "scales": {},
+    }
+    for n, name in enumerate(scales):
+        if name not in SCALES:
+            raise ValueError(f"Bilinmeyen ölçek: {name}")
+        if n:
+            call_command("flush", interactive=False, verbosity=0)
+        if log:
+            log(f"{name}: {SCALES[name]}")
+        results["scales"][name] = run_scale(name, seed, repeat, warmup, scenarios, log)
+    return results
+
+
+# ---- Baseline karşılaştırması ----
+def compare(results, baseline, tolerance=0.25):
+    """
+    [(ölçek, senaryo, metrik, baseline, şimdi, gerilemiş mi)] — iki tarafta
+    da olan ölçek/senaryolar için. Süre ve bellek `tolerance` oranında
+    ve NOISE_FLOOR kadar pay ile, sorgu sayısı birebir karşılaştırılır.
+    """
+    rows = []
+    for scale, current in results["scales"].items():
+        base_scale = baseline.get("scales", {}).get(scale)
+        if not base_scale:
+            continue
+        for view, now in current["views"].items():
+            before = base_scale["views"].get(view)
+            if not before:
+                continue
+            for metric, floor in NOISE_FLOOR.items():
+                regressed = now[metric] > max(before[metric] * (1 + tolerance), before[metric] + floor)
+                rows.append((scale, view, metric, before[metric], now[metric], regressed))
+            rows.append((scale, view, "queries", before["queries"], now["queries"], now["queries"] > before["queries"]))
+    return rows
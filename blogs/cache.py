@@ -0,0 +1,96 @@
+# blogs/cache.py
+"""
+Sürüm (generation) anahtarlı önbellek yardımcıları.
+
+Paylaşılan cache'te `<ad>:version` sayacı tutulur; veri `<ad>:v<sürüm>`
+anahtarında durur. Geçersiz kılma sadece sayacı artırır, eski veri
+kendiliğinden düşer. Önünde process içi bir katman vardır: LOCAL_TTL
+saniye boyunca ne cache'e ne DB'ye gidilir. Aynı process'teki
+invalidate() yerel katmanı hemen temizler; diğer worker'lar en geç
+LOCAL_TTL sonra yeni sürümü görür.
+
+Bu, sayacın tüm worker'larca görülen bir cache'te olmasına dayanır
+(settings.CACHES, SHARED_CACHE); locmem'de her process kendi sayacını
+tutar ve diğer worker'lar eski veriyi sunmaya devam eder.
+"""
+import threading
+import time
+
+from django.core.cache import cache
+
+LOCAL_TTL = 5          # sn; process içi katman
+SHARED_TTL = 60 * 60   # sn; paylaşılan cache'teki veri
+
+
+def get_version(name):
+    key = f"{name}:version"
+    version = cache.get(key)
+    if version is None:
+        # Eski bir sürüme geri dönmemek için başlangıç değeri zamandan
+        cache.add(key, int(time.time() * 1000), None)
+        version = cache.get(key)
+    return version
+
+
+def get_versions(names):
+    """get_version'ın çoklu hali: paylaşılan cache'e tek get_many."""
+    found = cache.get_many([f"{name}:version" for name in names])
+    return [found.get(f"{name}:version") or get_version(name) for name in names]
+
+
+def bump_version(name):
+    key = f"{name}:version"
+    try:
+        return cache.incr(key)
+    except ValueError:
+        version = int(time.time() * 1000)
+        cache.set(key, version, None)
+        return version
+
+
+class VersionedValue:
+    """
+    loader() sonucunu (ör. materialize edilmiş liste) sürüm anahtarıyla
+    önbelleğe alır.
+    """
+
+    _registry = {}
+
+    def __init__(self, name, loader, local_ttl=LOCAL_TTL, shared_ttl=SHARED_TTL):
+        self.name = name
+        self.loader = loader
+        self.local_ttl = local_ttl
+        self.shared_ttl = shared_ttl
+        self._local = None  # (version, value, checked_at)
+        self._lock = threading.Lock()
+        VersionedValue._registry[name] = self
+
+    def get(self):
+        now = time.monotonic()
+        local = self._local
+        if local is not None and now - local[2] < self.local_ttl:
+            return local[1]
+
+        version = get_version(self.name)
+        if local is not None and local[0] == version:
+            self._local = (version, local[1], now)
+            return local[1]
+
+        with self._lock:
+            data_key = f"{self.name}:v{version}"
+            value = cache.get(data_key)
+            if value is None:
+                value = self.loader()
+                cache.set(data_key, value, self.shared_ttl)
+            self._local = (version, value, now)
+        return value
+
+    def invalidate(self):
+        self._local = None
+        bump_version(self.name)
+
+    @classmethod
+    def clear_local(cls):
+        """Testler için: tüm process içi katmanları boşaltır."""
+        for value in cls._registry.values():
+            value._local = None
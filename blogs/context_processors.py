@@ -1,11 +1,17 @@
+from .cache import VersionedValue
 from .models import Category
 from assignments.models import SocialLink
 
+# Her template render'ında DB'ye gitmemek için sürümlü önbellek;
+# Category / SocialLink değişince signals.py sürümü artırır.
+categories_cache = VersionedValue("ctx:categories", lambda: list(Category.objects.all()))
+social_links_cache = VersionedValue("ctx:social_links", lambda: list(SocialLink.objects.all()))
+
 
 def get_categories(request):
-    categories=Category.objects.all()
+    categories = categories_cache.get()
     return dict(categories=categories)
 
 def get_social_links(request):
-    social_links=SocialLink.objects.all()
-    return dict(social_links=social_links)  
+    social_links = social_links_cache.get()
+    return dict(social_links=social_links)
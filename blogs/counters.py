@@ -0,0 +1,152 @@
+# blogs/counters.py
+"""
+Denormalize sayaçlar (like_count, comment_count, post_count) için yardımcılar.
+
+Sayaç kolonları tekil yollarda atomik F() güncellemesiyle tutulur;
+toplu işlemlerde ve sapma olursa (`recount` komutu / m2m sinyali)
+gerçek değerden tek UPDATE ile yeniden yazılır.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from .models import Blog, Category, Comment, CommentStatus, SavedPost
+
+
+def _like_fields(model):
+    """(through modeli, kaynak FK adı, hedef FK adı) döner."""
+    field = model._meta.get_field("likes")
+    through = field.remote_field.through
+    return through, field.m2m_field_name(), field.m2m_reverse_field_name()
+
+
+def like_count_subquery(model):
+    """Through tablosundan gerçek beğeni sayısını veren korele alt sorgu."""
+    through, source, _ = _like_fields(model)
+    counts = (
+        through.objects.filter(**{source: OuterRef("pk")})
+        .order_by()
+        .values(source)
+        .annotate(c=Count("*"))
+        .values("c")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def sync_like_counts(model, pks=None):
+    """
+    like_count kolonunu through tablosuna göre tek UPDATE ile onarır.
+    pks verilirse sadece o satırlar; yalnızca sapmış satırlar yazılır.
+    Güncellenen satır sayısını döner.
+    """
+    qs = model.objects.all()
+    if pks is not None:
+        qs = qs.filter(pk__in=list(pks))
+    drifted = (
+        qs.annotate(actual=like_count_subquery(model))
+        .exclude(like_count=F("actual"))
+        .values("pk")
+    )
+    return model.objects.filter(pk__in=Subquery(drifted)).update(
+        like_count=like_count_subquery(model)
+    )
+
+
+def toggle_like(obj, user):
+    """
+    Beğeni toggle: through tablosuna tek DELETE (varlık kontrolü yerine),
+    silinen yoksa INSERT; sayaç aynı transaction içinde F() ile güncellenir.
+    (liked, like_count) döner.
+    """
+    through, source, target = _like_fields(type(obj))
+    model = type(obj)
+    row = {f"{source}_id": obj.pk, f"{target}_id": user.pk}
+
+    with transaction.atomic():
+        deleted, _ = through.objects.filter(**row).delete()
+        if deleted:
+            liked = False
+            model.objects.filter(pk=obj.pk).update(
+                like_count=Greatest(F("like_count") - 1, 0)
+            )
+        else:
+            liked = True
+            try:
+                with transaction.atomic():
+                    through.objects.create(**row)
+            except IntegrityError:
+                # Eşzamanlı ikinci istek aynı satırı eklemiş; sayaç zaten arttı
+                pass
+            else:
+                model.objects.filter(pk=obj.pk).update(like_count=F("like_count") + 1)
+        obj.refresh_from_db(fields=["like_count"])
+
+    return liked, obj.like_count
+
+
+# ---- Yorum / yazı sayaçları ----
+def _count_subquery(model, source, **filters):
+    counts = (
+        model.objects.filter(**{source: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(source)
+        .annotate(c=Count("*"))
+        .values("c")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def profile_stat_annotations():
+    """
+    Profil başlık sayıları: User queryset'ine annotate edilecek korele alt
+    sorgular (beğenilen yazı / yorum / kaydedilen) — üçü tek SELECT'te gelir.
+    """
+    through, _, target = _like_fields(Blog)
+    return {
+        "total_likes": _count_subquery(through, target),
+        "total_comments": _count_subquery(Comment, "user"),
+        "total_saved": _count_subquery(SavedPost, "user"),
+    }
+
+
+def _sync(model, pks, **fields):
+    """fields: kolon -> gerçek değer ifadesi; sadece sapmış satırları yazar."""
+    qs = model.objects.all()
+    if pks is not None:
+        qs = qs.filter(pk__in=list(pks))
+    drifted = Q()
+    for name, expr in fields.items():
+        qs = qs.annotate(**{f"actual_{name}": expr})
+        drifted |= ~Q(**{name: F(f"actual_{name}")})
+    return model.objects.filter(pk__in=Subquery(qs.filter(drifted).values("pk"))).update(**fields)
+
+
+def sync_comment_counts(pks=None):
+    """Blog.comment_count / root_comment_count (sadece APPROVED yorumlar)."""
+    return _sync(
+        Blog, pks,
+        comment_count=_count_subquery(Comment, "blog", status=CommentStatus.APPROVED),
+        root_comment_count=_count_subquery(
+            Comment, "blog", status=CommentStatus.APPROVED, parent_comment__isnull=True
+        ),
+    )
+
+
+def sync_post_counts(pks=None):
+    """Category.post_count (sadece Published yazılar)."""
+    return _sync(Category, pks, post_count=_count_subquery(Blog, "category", status="Published"))
+
+
+def adjust_comment_counts(blog_id, is_root, delta):
+    """Tek yorumun onay durumu değişti: blog sayaçlarını delta kadar kaydır."""
+    if not delta:
+        return
+    fields = {"comment_count": Greatest(F("comment_count") + delta, 0)}
+    if is_root:
+        fields["root_comment_count"] = Greatest(F("root_comment_count") + delta, 0)
+    Blog.objects.filter(pk=blog_id).update(**fields)
+
+
+def adjust_post_count(category_id, delta):
+    if delta and category_id:
+        Category.objects.filter(pk=category_id).update(post_count=Greatest(F("post_count") + delta, 0))
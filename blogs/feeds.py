@@ -0,0 +1,153 @@
+# blogs/feeds.py
+"""
+RSS / Atom beslemeleri (site geneli + kategori başına).
+
+Feed okuyucular sık yoklar; çoğu istek 304 ile, DB'ye gitmeden dönmeli:
+
+- ETag / Last-Modified, ilgili generation'da (pagecache.LISTING veya
+  kategori scope'u) cache'lenmiş en yeni updated_at'ten üretilir;
+  generation başına en fazla bir MAX(updated_at) sorgusu çalışır.
+  Durum istek başına bir kez hesaplanır (iki sürüm tek get_many'de).
+- 200 dönülecekse render edilmiş gövde yine generation anahtarıyla
+  cache'ten gelir.
+"""
+import hashlib
+
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.db.models import Max
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.feedgenerator import Atom1Feed
+from django.views.decorators.http import condition
+
+from .cache import get_versions
+from .models import Blog, Category
+from .pagecache import GLOBAL, LISTING, PAGE_TTL, category_scope
+
+FEED_SIZE = 20
+
+
+def _published(category_id=None):
+    qs = Blog.objects.filter(status="Published")
+    if category_id is not None:
+        qs = qs.filter(category_id=category_id)
+    return qs
+
+
+def feed_state(category_id=None):
+    """(generation, en yeni updated_at) — generation değişmedikçe DB'ye gitmez."""
+    scope = LISTING if category_id is None else category_scope(category_id)
+    # GLOBAL: kategori adı değişirse başlık da değişir
+    generation = ".".join(str(v) for v in get_versions([GLOBAL, scope]))
+    key = f"feed:latest:{scope}:{generation}"
+    latest = cache.get(key)
+    if latest is None:
+        latest = _published(category_id).aggregate(m=Max("updated_at"))["m"] or ""
+        cache.set(key, latest, PAGE_TTL)
+    return generation, latest or None
+
+
+class LatestPostsFeed(Feed):
+    title = "Blogend — son yazılar"
+    description = "Blogend'de yayınlanan son yazılar."
+
+    def link(self):
+        return reverse("home")
+
+    def items(self):
+        return _published().select_related("author", "category").order_by("-updated_at")[:FEED_SIZE]
+
+    def item_title(self, item):
+        return item.title
+
+    def item_description(self, item):
+        return item.short_description
+
+    def item_link(self, item):
+        return item.get_absolute_url()
+
+    def item_pubdate(self, item):
+        return item.created_at
+
+    def item_updateddate(self, item):
+        return item.updated_at
+
+    def item_author_name(self, item):
+        return item.author.get_username()
+
+    def item_categories(self, item):
+        return [item.category.category_name]
+
+
+class CategoryPostsFeed(LatestPostsFeed):
+    def get_object(self, request, category_id):
+        return get_object_or_404(Category, pk=category_id)
+
+    def title(self, obj):
+        return f"Blogend — {obj.category_name}"
+
+    def description(self, obj):
+        return f"{obj.category_name} kategorisindeki son yazılar."
+
+    def link(self, obj):
+        return reverse("blogs:posts_by_category", args=[obj.pk])
+
+    def items(self, obj):
+        return (
+            _published(obj.pk).select_related("author", "category").order_by("-updated_at")[:FEED_SIZE]
+        )
+
+
+class LatestPostsAtomFeed(LatestPostsFeed):
+    feed_type = Atom1Feed
+    subtitle = LatestPostsFeed.description
+
+
+class CategoryPostsAtomFeed(CategoryPostsFeed):
+    feed_type = Atom1Feed
+
+    def subtitle(self, obj):
+        return self.description(obj)
+
+
+def _request_state(request, category_id=None):
+    """feed_state'in istek başına tek hesaplanan hali (ETag, Last-Modified ve gövde ortak)."""
+    if not hasattr(request, "_feed_state"):
+        request._feed_state = feed_state(category_id)
+    return request._feed_state
+
+
+def _etag(request, category_id=None):
+    generation, latest = _request_state(request, category_id)
+    raw = f"{request.path}:{generation}:{latest}"
+    return hashlib.md5(raw.encode()).hexdigest()
+
+
+def _last_modified(request, category_id=None):
+    return _request_state(request, category_id)[1]
+
+
+def cached_feed(feed):
+    """Feed örneğini koşullu GET + generation anahtarlı gövde önbelleğiyle sarar."""
+
+    @condition(etag_func=_etag, last_modified_func=_last_modified)
+    def view(request, category_id=None):
+        generation, _ = _request_state(request, category_id)
+        key = f"feed:body:{request.path}:{generation}"
+        entry = cache.get(key)
+        if entry is not None:
+            return HttpResponse(entry[0], content_type=entry[1])
+        args = () if category_id is None else (category_id,)
+        response = feed(request, *args)
+        cache.set(key, (response.content, response["Content-Type"]), PAGE_TTL)
+        return response
+
+    return view
+
+
+latest_rss = cached_feed(LatestPostsFeed())
+latest_atom = cached_feed(LatestPostsAtomFeed())
+category_rss = cached_feed(CategoryPostsFeed())
+category_atom = cached_feed(CategoryPostsAtomFeed())
@@ -3,6 +3,8 @@ from .models import Comment
 from .models import Profile
 from django.core.validators import FileExtensionValidator
 from django.core.exceptions import ValidationError
+from django.core.files.uploadedfile import UploadedFile
+from .uploads import ingest_image
 from .models import Comment
 class CommentForm(forms.ModelForm):
     class Meta:
@@ -16,6 +18,7 @@ class ContactForm(forms.Form):
 
 
 MAX_AVATAR_MB = 5
+AVATAR_MAX_SIDE = 1024
 
 def validate_file_size(f):
     if f and f.size > MAX_AVATAR_MB * 1024 * 1024:
@@ -30,6 +33,13 @@ class ProfileForm(forms.ModelForm):
     # cover alanı eklemek istemezsen forms'tan çıkar; modelinde yoksa ekleme.
     # cover = forms.ImageField(required=False, validators=[...])
 
+    def clean_avatar(self):
+        avatar = self.cleaned_data.get("avatar")
+        if isinstance(avatar, UploadedFile):
+            # Yeni yükleme: header'dan biçim, piksel sınırı, EXIF temizliği, küçültme
+            avatar = ingest_image(avatar, max_bytes=MAX_AVATAR_MB * 1024 * 1024, max_side=AVATAR_MAX_SIDE)
+        return avatar
+
     class Meta:
         model = Profile
         fields = ['avatar', 'bio']   # cover kullanıyorsan: ['avatar', 'cover', 'bio']
@@ -0,0 +1,209 @@
+# blogs/images.py
+"""
+Responsive görsel türevleri (srcset).
+
+Yüklenen her görsel için genişlik kovalarında (WIDTHS) WebP + JPEG
+türevleri üretilir ve STORAGES["default"] üzerinden
+`derivatives/<kaynak>-w<genişlik>.<uzantı>` adıyla saklanır
+(FileSystemStorage veya Cloudinary). Üretim istek yolunda yapılmaz:
+model kaydı commit olunca arka plan thread'ine verilir; mevcut dosyalar
+için `build_image_derivatives` komutu vardır.
+
+Hangi türevlerin hazır olduğu (ve storage'ın verdiği gerçek adları)
+ImageDerivative tablosunda tutulur ve cache'lenir; template tag'leri
+(blogs/templatetags/responsive.py) storage'a hiç sormaz. Birden çok görsel
+gösteren sayfalar prefetch() ile hepsini tek get_many'de yükler.
+"""
+import io
+import logging
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.signals import request_started
+from django.db import connections, transaction
+from PIL import Image, ImageOps
+
+from .models import ImageDerivative
+
+logger = logging.getLogger(__name__)
+
+WIDTHS = (320, 640, 960, 1280)
+FORMATS = (
+    ("webp", "WEBP", {"quality": 80, "method": 4}),
+    ("jpg", "JPEG", {"quality": 82, "optimize": True, "progressive": True}),
+)
+CACHE_TTL = 60 * 60
+
+
+def derivative_name(source, width, ext):
+    stem, _ = posixpath.splitext(source)
+    return f"derivatives/{stem}-w{width}.{ext}"
+
+
+def _cache_key(source):
+    return f"imgd:{source}"
+
+
+def _flatten(img):
+    """JPEG için alfa kanalını beyaz zemine indirger."""
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        img = img.convert("RGBA")
+        background = Image.new("RGB", img.size, (255, 255, 255))
+        background.paste(img, mask=img.getchannel("A"))
+        return background
+    return img.convert("RGB")
+
+
+def render_derivatives(source, storage=None, widths=WIDTHS):
+    """
+    Kaynağı bir kez decode edip kaynaktan küçük her kova için türev yazar.
+    (genişlik, yükseklik, üretilen genişlikler, {uzantı: {genişlik: ad}})
+    döner; adlar storage.save()'in döndürdüğü gerçek adlardır. DB'ye
+    dokunmaz; process havuzundan da çağrılabilir.
+    """
+    storage = storage or default_storage
+    with storage.open(source, "rb") as fh:
+        img = Image.open(fh)
+        if getattr(img, "is_animated", False):
+            return img.width, img.height, [], {}  # animasyonlu GIF olduğu gibi kalır
+
+        width, height = img.size
+        largest = max((w for w in widths if w < max(width, height)), default=None)
+        if largest:
+            # JPEG: DCT seviyesinde küçültülmüş decode (bellek ve CPU çok daha az);
+            # iki kenar da en büyük kovadan küçük düşmez
+            img.draft("RGB", (largest, largest))
+        img = ImageOps.exif_transpose(img)
+        img.load()
+
+    if (img.width > img.height) != (width > height):
+        width, height = height, width  # EXIF ile 90° döndürülmüş
+    produced = []
+    files = {ext: {} for ext, _, _ in FORMATS}
+    current = img
+    for target in sorted((w for w in widths if w < width), reverse=True):
+        # Büyükten küçüğe: her adım bir öncekinden küçültülür
+        current = current.resize((target, max(1, round(height * target / width))), Image.LANCZOS)
+        for ext, fmt, options in FORMATS:
+            frame = current if fmt == "WEBP" else _flatten(current)
+            if fmt == "WEBP" and frame.mode not in ("RGB", "RGBA"):
+                frame = frame.convert("RGBA" if "A" in frame.getbands() else "RGB")
+            buf = io.BytesIO()
+            frame.save(buf, fmt, **options)
+            name = derivative_name(source, target, ext)
+            if storage.exists(name):
+                storage.delete(name)  # aynı adla yaz (storage ad çakışmasında sonek ekler)
+            # Cloudinary vb. adı değiştirebilir; URL'ler dönen addan kurulur
+            files[ext][str(target)] = storage.save(name, ContentFile(buf.getvalue()))
+        produced.append(target)
+    return width, height, sorted(produced), files
+
+
+def record_derivatives(source, width, height, widths, files):
+    ImageDerivative.objects.update_or_create(
+        source=source, defaults={"width": width, "height": height, "widths": widths, "files": files}
+    )
+    cache.set(_cache_key(source), (width, files), CACHE_TTL)
+
+
+def build_derivatives(source, storage=None):
+    width, height, widths, files = render_derivatives(source, storage)
+    record_derivatives(source, width, height, widths, files)
+    return widths
+
+
+# ---- Okuma yolu ----
+# İstek boyunca kaynak -> info; prefetch() doldurur, her istek başında sıfırlanır
+_request_memo = ContextVar("image_derivatives", default=None)
+
+
+def _reset_memo(**kwargs):
+    _request_memo.set(None)
+
+
+request_started.connect(_reset_memo, dispatch_uid="blogs.images.reset_memo")
+
+
+def _load(sources):
+    """Cache'te olmayanları tek sorguda DB'den okur ve cache'e yazar."""
+    rows = {
+        source: (width, files)
+        for source, width, files in ImageDerivative.objects.filter(source__in=sources)
+        .values_list("source", "width", "files")
+    }
+    cache.set_many({_cache_key(s): info for s, info in rows.items()}, CACHE_TTL)
+    missing = {_cache_key(s): (0, {}) for s in sources if s not in rows}
+    if missing:
+        cache.set_many(missing, 5 * 60)
+    return {s: rows.get(s, (0, {})) for s in sources}
+
+
+def prefetch(images):
+    """
+    Bir sayfadaki görsellerin (FieldFile veya ad) türev bilgisini toplu
+    yükler: tek get_many, eksikler için tek SELECT. Aynı istekteki
+    derivative_info çağrıları cache'e gitmez.
+    """
+    memo = _request_memo.get()
+    if memo is None:
+        memo = {}
+        _request_memo.set(memo)
+    sources = {getattr(image, "name", image) for image in images if image}
+    sources -= memo.keys()
+    if not sources:
+        return
+    found = cache.get_many([_cache_key(s) for s in sources])
+    for source in sources:
+        if _cache_key(source) in found:
+            memo[source] = found[_cache_key(source)]
+    missing = [s for s in sources if s not in memo]
+    if missing:
+        memo.update(_load(missing))
+
+
+def derivative_info(source):
+    """(orijinal genişlik, {uzantı: {genişlik: ad}}); türev yoksa (0, {})."""
+    memo = _request_memo.get()
+    if memo is not None and source in memo:
+        return memo[source]
+    info = cache.get(_cache_key(source))
+    if info is None:
+        info = _load([source])[source]
+    return info
+
+
+# ---- Arka plan üretimi (istek yolunun dışında) ----
+_pool = None
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-derivatives")
+    return _pool
+
+
+def _build_background(source):
+    try:
+        if not ImageDerivative.objects.filter(source=source).exists():
+            build_derivatives(source)
+    except Exception:
+        logger.exception("Görsel türevleri üretilemedi: %s", source)
+    finally:
+        connections.close_all()
+
+
+def schedule(*sources):
+    """Commit sonrası türev üretimini arka plana verir (IMAGE_DERIVATIVES kapalıysa hiçbir şey)."""
+    if not getattr(settings, "IMAGE_DERIVATIVES", True):
+        return
+    for source in filter(None, sources):
+        info = cache.get(_cache_key(source))
+        if info and info[1]:
+            continue  # zaten üretilmiş
+        transaction.on_commit(lambda s=source: _executor().submit(_build_background, s))
@@ -0,0 +1,289 @@
+# blogs/importer.py
+"""
+`dumpdata` fixture'larını hızlı içe aktarma (bkz. `import_fixture` komutu).
+
+loaddata'dan farkları:
+- Dosya bütün olarak belleğe alınmaz: UTF-8 / UTF-16 (BOM'dan tespit)
+  metin parça parça okunup liste elemanları tek tek çözülür.
+- Nesneler model başına biriktirilir, `bulk_create` ile toplu yazılır;
+  kalan parçalar model bağımlılık sırasıyla (FK hedefi önce) boşaltılır.
+  Sıra dışı gelen kayıtlar için FK kontrolleri loaddata'daki gibi
+  transaction sonuna ertelenir. pk'sı zaten olan satırların üzerine
+  yazılır (bulk_update).
+- M2M (likes, groups, ...) satırları through tablosuna toplu eklenir.
+- Sinyaller çalışmaz (bulk_create). Yan etkiler komut tarafından sonda
+  toplu çalıştırılır veya tamamen atlanır; e-posta fan-out'u hiç yapılmaz.
+
+auto_now / auto_now_add alanları içe aktarma süresince kapatılır; dump'taki
+created_at / updated_at değerleri korunur.
+"""
+import codecs
+import json
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.python import Deserializer
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import DateField
+
+from .models import Blog, Comment
+from .slugs import assign_slugs
+
+BATCH = 1_000
+READ_SIZE = 1 << 16
+
+
+# ---- Akış halinde JSON okuma ----
+def detect_encoding(head):
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    # BOM'suz UTF-16: ilk karakter ASCII ("[") olduğundan bir baytı sıfırdır
+    if head[1:2] == b"\x00":
+        return "utf-16-le"
+    if head[:1] == b"\x00":
+        return "utf-16-be"
+    return "utf-8"
+
+
+def iter_fixture(path, read_size=READ_SIZE):
+    """Fixture'daki (üst seviye JSON listesi) nesneleri sırayla üretir."""
+    with open(path, "rb") as fh:
+        encoding = detect_encoding(fh.read(4))
+
+    decoder = json.JSONDecoder()
+    with open(path, encoding=encoding) as fh:
+        buf, pos, eof = "", 0, False
+
+        def fill():
+            nonlocal buf, pos, eof
+            data = fh.read(read_size)
+            eof = not data
+            buf, pos = buf[pos:] + data, 0
+
+        def next_char(skip):
+            """skip'teki karakterleri atlayıp sıradaki karakteri döner (dosya sonunda "")."""
+            nonlocal pos
+            while True:
+                while pos < len(buf) and buf[pos] in skip:
+                    pos += 1
+                if pos < len(buf) or eof:
+                    return buf[pos:pos + 1]
+                fill()
+
+        if next_char(" \t\r\n") != "[":
+            raise ValueError("Fixture bir JSON listesi olmalı.")
+        pos += 1
+        while True:
+            ch = next_char(" \t\r\n,")
+            if ch == "]":
+                return
+            if not ch:
+                raise ValueError("Fixture beklenmedik şekilde bitti.")
+            try:
+                obj, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            pos = end
+            yield obj
+
+
+# ---- Toplu yazma ----
+@contextmanager
+def raw_timestamps(models):
+    """auto_now / auto_now_add'i geçici kapatır: bulk_create dump'taki değeri yazar."""
+    saved = []
+    for model in models:
+        for field in model._meta.concrete_fields:
+            if isinstance(field, DateField) and (field.auto_now or field.auto_now_add):
+                saved.append((field, field.auto_now, field.auto_now_add))
+                field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def dependency_order(models):
+    """FK / M2M hedefi olan modeller önce gelecek şekilde sıralar (döngüler kırılır)."""
+    models = list(models)
+    pending = set(models)
+    ordered = []
+
+    def deps(model):
+        related = {
+            f.related_model._meta.concrete_model
+            for f in model._meta.get_fields()
+            if (f.many_to_one or f.one_to_one) and f.concrete and f.related_model
+        }
+        return (related & pending) - {model}
+
+    while pending:
+        ready = [m for m in models if m in pending and not deps(m)] or [next(m for m in models if m in pending)]
+        for model in ready:
+            pending.discard(model)
+            ordered.append(model)
+    return ordered
+
+
+class Stats:
+    """model label -> [satır, saniye]"""
+
+    def __init__(self):
+        self.rows = defaultdict(int)
+        self.seconds = defaultdict(float)
+
+    @contextmanager
+    def timed(self, label, rows):
+        t0 = time.perf_counter()
+        yield
+        self.rows[label] += rows
+        self.seconds[label] += time.perf_counter() - t0
+
+
+class FixtureImporter:
+    def __init__(self, batch_size=BATCH, using=DEFAULT_DB_ALIAS):
+        self.batch_size = batch_size
+        self.using = using
+        self.stats = Stats()
+        self.objects = defaultdict(list)   # model -> bekleyen nesneler
+        self.m2m = defaultdict(list)       # through modeli -> bekleyen satırlar
+        self.models = set()
+        self.tree = {}                     # comment pk -> (root_id, path, depth)
+        self.parse_seconds = 0.0
+
+    # -- biriktirme --
+    def _place_comment(self, obj):
+        """
+        Eski dump'larda root/path/depth yok: ebeveyn bu akışta daha önce
+        geldiyse (dumpdata pk sırasıyla yazar) konum INSERT'ten önce hesaplanır.
+        Kalanları `fill_comment_tree` sonradan doldurur.
+        """
+        if obj.parent_comment_id is not None and not obj.path:
+            parent = self.tree.get(obj.parent_comment_id)
+            if parent is None:
+                return
+            p_root, p_path, p_depth = parent
+            obj.root_id = p_root or obj.parent_comment_id
+            obj.path = f"{p_path}{obj.parent_comment_id:010d}/"
+            obj.depth = p_depth + 1
+        self.tree[obj.pk] = (obj.root_id, obj.path, obj.depth)
+
+    def add(self, deserialized):
+        obj = deserialized.object
+        model = type(obj)
+        if model is Comment:
+            self._place_comment(obj)
+        self.models.add(model)
+        self.objects[model].append(obj)
+        for name, pks in (deserialized.m2m_data or {}).items():
+            field = model._meta.get_field(name)
+            through = field.remote_field.through
+            if not through._meta.auto_created:
+                continue  # açık through modelleri dump'ta ayrı kayıt olarak gelir
+            self.models.add(through)
+            source, target = field.m2m_field_name(), field.m2m_reverse_field_name()
+            self.m2m[through].extend(through(**{f"{source}_id": obj.pk, f"{target}_id": pk}) for pk in pks)
+            if len(self.m2m[through]) >= self.batch_size:
+                self.flush(through)
+        if len(self.objects[model]) >= self.batch_size:
+            self.flush(model)
+
+    def flush(self, model):
+        manager = model._base_manager.using(self.using)
+        links = self.m2m.pop(model, None)
+        if links:
+            with self.stats.timed(model._meta.label, len(links)):
+                # Var olan ilişki satırları atlanır (unique_together)
+                manager.bulk_create(links, batch_size=self.batch_size, ignore_conflicts=True)
+
+        batch = self.objects.pop(model, None)
+        if not batch:
+            return
+        if model is Blog:
+            assign_slugs(batch)
+        with self.stats.timed(model._meta.label, len(batch)):
+            if model._meta.parents:
+                # Çok tablolu kalıtım bulk_create ile yazılamaz
+                for obj in batch:
+                    obj.save_base(raw=True, using=self.using)
+                return
+            # loaddata gibi: aynı pk'lı satır varsa üzerine yaz (tek sorguyla tespit)
+            pks = [obj.pk for obj in batch if obj.pk is not None]
+            existing = set(manager.filter(pk__in=pks).values_list("pk", flat=True)) if pks else set()
+            if existing:
+                fields = [f.name for f in model._meta.concrete_fields if not f.primary_key]
+                manager.bulk_update([o for o in batch if o.pk in existing], fields, batch_size=self.batch_size)
+            manager.bulk_create([o for o in batch if o.pk not in existing], batch_size=self.batch_size)
+
+    # -- çalıştırma --
+    def run(self, path):
+        """Tek transaction'da içe aktarır; {model: yazılan satır} döner."""
+        connection = connections[self.using]
+        stream = Deserializer(iter_fixture(path), using=self.using, ignorenonexistent=True)
+        with transaction.atomic(using=self.using):
+            with connection.constraint_checks_disabled(), raw_timestamps(apps.get_models(include_auto_created=True)):
+                while True:
+                    t0 = time.perf_counter()
+                    deserialized = next(stream, None)
+                    self.parse_seconds += time.perf_counter() - t0
+                    if deserialized is None:
+                        break
+                    self.add(deserialized)
+                for model in dependency_order(self.models):
+                    self.flush(model)
+            connection.check_constraints(table_names=[m._meta.db_table for m in self.models])
+            self._reset_sequences(connection)
+        return dict(self.stats.rows)
+
+    def _reset_sequences(self, connection):
+        # Açık pk ile eklenen satırlardan sonra (Postgres) sequence'ları ileri al
+        statements = connection.ops.sequence_reset_sql(no_style(), list(self.models))
+        with connection.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+# ---- İçe aktarma sonrası onarımlar ----
+def fill_comment_tree():
+    """
+    root/path/depth alanı olmayan (eski dump) yanıtların ağaç konumunu
+    ebeveyn zincirinden hesaplar; güncellenen satır sayısını döner.
+    """
+    parents = dict(Comment.objects.values_list("id", "parent_comment_id"))
+    memo = {}
+
+    def position(cid):
+        chain = []
+        cur = cid
+        while cur is not None and cur not in memo:
+            chain.append(cur)
+            cur = parents.get(cur)
+        for node in reversed(chain):
+            parent = parents.get(node)
+            if parent is None or parent not in parents:
+                memo[node] = (None, "", 0)
+            else:
+                p_root, p_path, p_depth = memo[parent]
+                memo[node] = (p_root or parent, f"{p_path}{parent:010d}/", p_depth + 1)
+        return memo[cid]
+
+    batch, fixed = [], 0
+    missing = Comment.objects.filter(parent_comment__isnull=False, path="").only("id")
+    for comment in missing.iterator(chunk_size=BATCH):
+        comment.root_id, comment.path, comment.depth = position(comment.id)
+        batch.append(comment)
+        if len(batch) >= BATCH:
+            fixed += Comment.objects.bulk_update(batch, ["root", "path", "depth"])
+            batch = []
+    if batch:
+        fixed += Comment.objects.bulk_update(batch, ["root", "path", "depth"])
+    return fixed
@@ -0,0 +1,220 @@
+# blogs/instrumentation.py
+"""
+İstek ölçümü: SQL sayısı / süresi, template render süresi, cache
+isabet / ıska ve toplam süre.
+
+REQUEST_INSTRUMENTATION ve METRICS_ENABLED ikisi de kapalıyken middleware
+MiddlewareNotUsed ile zincirden çıkar ve hiçbir şey patch'lenmez (sıfır
+maliyet). Metrikler için bkz. blogs.metrics. REQUEST_INSTRUMENTATION açıkken:
+
+- Staff kullanıcılara `Server-Timing` başlığı (tarayıcı devtools'ta görünür).
+- SLOW_REQUEST_MS üzerindeki istekler `blogs.slow_requests` logger'ına tek
+  satır JSON olarak yazılır (en pahalı SLOW_REQUEST_TOP_SQL SQL şekliyle).
+  Handler / dosya LOGGING'de tanımlı.
+
+SQL connection.execute_wrapper ile, template süresi backend
+Template.render ile, cache cache backend sınıfının get / get_many'si ile
+ölçülür; sayaçlar isteğe ait ContextVar'da tutulur (thread'ler ayrı).
+"""
+import json
+import logging
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.base import BaseCache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connection
+from django.template.backends.django import Template as BackendTemplate
+from django.utils import timezone
+
+from . import metrics
+from .querybudget import shape
+
+slow_log = logging.getLogger("blogs.slow_requests")
+
+SQL_WIDTH = 500
+_MISSING = object()
+_current = ContextVar("request_stats", default=None)
+_in_get = ContextVar("cache_get", default=False)  # get'i get_many'ye devreden backend'ler (DatabaseCache)
+
+
+class RequestStats:
+    __slots__ = ("started", "queries", "db_ms", "template_ms", "template_depth", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = []  # (sql, ms); şekil sadece yavaş istekte hesaplanır
+        self.db_ms = 0.0
+        self.template_ms = 0.0
+        self.template_depth = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self.db_ms += ms
+            self.queries.append((sql, ms))
+
+    def top_sql(self, n):
+        """Süreye göre en pahalı n SQL şekli: [{"sql", "count", "ms"}]."""
+        by_shape = defaultdict(lambda: [0, 0.0])
+        for sql, ms in self.queries:
+            entry = by_shape[shape(sql)]
+            entry[0] += 1
+            entry[1] += ms
+        ranked = sorted(by_shape.items(), key=lambda item: -item[1][1])[:n]
+        return [{"sql": sql[:SQL_WIDTH], "count": count, "ms": round(ms, 2)} for sql, (count, ms) in ranked]
+
+
+# ---- Patch'ler (sadece açıkken, process başına bir kez) ----
+def _timed_render(render):
+    @wraps(render)
+    def wrapper(self, *args, **kwargs):
+        stats = _current.get()
+        if stats is None:
+            return render(self, *args, **kwargs)
+        # İç içe render_to_string çağrıları tek kez sayılsın
+        stats.template_depth += 1
+        t0 = time.perf_counter()
+        try:
+            return render(self, *args, **kwargs)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_ms += (time.perf_counter() - t0) * 1000
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def _counted_get(get):
+    @wraps(get)
+    def wrapper(self, key, default=None, version=None):
+        token = _in_get.set(True)
+        try:
+            value = get(self, key, _MISSING, version)
+        finally:
+            _in_get.reset(token)
+        stats = _current.get()
+        if value is _MISSING:
+            if stats is not None:
+                stats.cache_misses += 1
+            return default
+        if stats is not None:
+            stats.cache_hits += 1
+        return value
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def _counted_get_many(get_many):
+    @wraps(get_many)
+    def wrapper(self, keys, version=None):
+        if _in_get.get():
+            return get_many(self, keys, version)  # get içinden: get sayar
+        keys = list(keys)
+        found = get_many(self, keys, version)
+        stats = _current.get()
+        if stats is not None:
+            stats.cache_hits += len(found)
+            stats.cache_misses += len(keys) - len(found)
+        return found
+
+    wrapper._instrumented = True
+    return wrapper
+
+
+def install():
+    """Template ve cache ölçümünü kurar (idempotent)."""
+    patches = [(BackendTemplate, "render", _timed_render)]
+    backend = type(caches["default"])
+    patches.append((backend, "get", _counted_get))
+    if backend.get_many is not BaseCache.get_many:
+        # BaseCache.get_many get'i çağırır; o durumda ayrıca sayılmaz
+        patches.append((backend, "get_many", _counted_get_many))
+    for cls, name, decorate in patches:
+        method = getattr(cls, name)
+        if not getattr(method, "_instrumented", False):
+            setattr(cls, name, decorate(method))
+
+
+# ---- Middleware ----
+class RequestInstrumentationMiddleware:
+    """
+    MIDDLEWARE'de olabildiğince üstte (SecurityMiddleware'den hemen sonra).
+    Ölçümleri iki tüketiciye verir: Server-Timing / yavaş istek logu
+    (REQUEST_INSTRUMENTATION) ve worker'lar arası metrikler (METRICS_ENABLED).
+    """
+
+    def __init__(self, get_response):
+        self.timing = getattr(settings, "REQUEST_INSTRUMENTATION", False)
+        self.metrics = metrics.enabled()
+        if not (self.timing or self.metrics):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_ms = getattr(settings, "SLOW_REQUEST_MS", 500)
+        self.top_n = getattr(settings, "SLOW_REQUEST_TOP_SQL", 5)
+        install()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        try:
+            with connection.execute_wrapper(stats):
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - stats.started) * 1000
+
+        if self.metrics:
+            match = getattr(request, "resolver_match", None)
+            metrics.observe_request(
+                match.view_name if match else "<unresolved>", str(response.status_code), total_ms / 1000,
+                len(stats.queries), stats.cache_hits, stats.cache_misses,
+            )
+        if not self.timing:
+            return response
+        user = getattr(request, "user", None)
+        if user is not None and user.is_staff:
+            response["Server-Timing"] = server_timing(stats, total_ms)
+        if total_ms >= self.slow_ms:
+            slow_log.warning(json.dumps(self.record(request, response, stats, total_ms), ensure_ascii=False))
+        return response
+
+    def record(self, request, response, stats, total_ms):
+        match = getattr(request, "resolver_match", None)
+        user = getattr(request, "user", None)
+        return {
+            "ts": timezone.now().isoformat(timespec="milliseconds"),
+            "method": request.method,
+            "path": request.path,
+            "view": match.view_name if match else None,
+            "status": response.status_code,
+            "user": user.pk if user is not None and user.is_authenticated else None,
+            "total_ms": round(total_ms, 2),
+            "db_ms": round(stats.db_ms, 2),
+            "db_queries": len(stats.queries),
+            "template_ms": round(stats.template_ms, 2),
+            "cache_hits": stats.cache_hits,
+            "cache_misses": stats.cache_misses,
+            "top_sql": stats.top_sql(self.top_n),
+        }
+
+
+def server_timing(stats, total_ms):
+    return ", ".join([
+        f'db;dur={stats.db_ms:.1f};desc="{len(stats.queries)} queries"',
+        f"tpl;dur={stats.template_ms:.1f}",
+        f'cache;desc="{stats.cache_hits} hit / {stats.cache_misses} miss"',
+        f"total;dur={total_ms:.1f}",
+    ])
@@ -0,0 +1,82 @@
+import math
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from blogs import ml
+
+WORDS = (
+    "bu bir yazı çok güzeldi ve ile ama gerçekten okudum konu teşekkürler "
+    "harika berbat saçma süper kötü iyi mal salak siktir lanet great bad "
+    "http://x.co www.site.com @kullanici 05551234567 aaaaaa İstanbul IŞIK t.me/x"
+).split()
+ALPHABET = "abcçdefgğhıijklmnoöprsştuüvyz"
+
+
+def legacy_analyze_text(text, offensive, positive, negative):
+    """Eski implementasyon: her sözlük kelimesi için ayrı substring araması."""
+    t = (text or "").lower()
+    tox = max(0.0, min(1.0, 1 - math.exp(-1.2 * sum(1 for w in offensive if w in t))))
+    pos = sum(1 for w in positive if w in t)
+    neg = sum(1 for w in negative if w in t)
+    sen = 0.0 if pos == 0 and neg == 0 else max(-1.0, min(1.0, (pos - neg) / (pos + neg)))
+    reasons = []
+    if ml.URL_PAT.search(t): reasons.append("url/shortener")
+    if ml.CONTACT_PAT.search(t): reasons.append("iletişim/handle")
+    if ml.REPEAT_PAT.search(t): reasons.append("aşırı tekrar")
+    if len(t.strip()) < 5: reasons.append("çok kısa")
+    if sum(ch.isalpha() for ch in t) < 6 and (ml.URL_PAT.search(t) or ml.CONTACT_PAT.search(t)):
+        reasons.append("metin yok")
+    return round(tox, 3), round(sen, 3), bool(reasons)
+
+
+class Command(BaseCommand):
+    help = "analyze_text mikro-benchmark: eski (kelime başına arama) vs derlenmiş eşleştirici."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--n", type=int, default=100_000, help="Sentetik yorum sayısı")
+        parser.add_argument("--extra-words", type=int, default=0,
+                            help="OFFENSIVE sözlüğüne eklenecek rastgele kelime sayısı (ölçek testi)")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        offensive = set(ml.OFFENSIVE)
+        offensive |= {
+            "".join(rng.choice(ALPHABET) for _ in range(rng.randint(4, 10)))
+            for _ in range(options["extra_words"])
+        }
+        matcher = ml.LexiconMatcher(
+            {"offensive": offensive, "positive": ml.POSITIVE, "negative": ml.NEGATIVE}
+        )
+        texts = [
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 30)))
+            for _ in range(options["n"])
+        ]
+        self.stdout.write(f"{len(texts)} yorum, sözlük={len(offensive) + len(ml.POSITIVE) + len(ml.NEGATIVE)} kelime")
+
+        t0 = time.perf_counter()
+        legacy = [legacy_analyze_text(t, offensive, ml.POSITIVE, ml.NEGATIVE) for t in texts]
+        legacy_s = time.perf_counter() - t0
+
+        original, ml.MATCHER = ml.MATCHER, matcher
+        try:
+            t0 = time.perf_counter()
+            compiled = [ml.analyze_text(t) for t in texts]
+            compiled_s = time.perf_counter() - t0
+        finally:
+            ml.MATCHER = original
+
+        mismatches = sum(
+            1 for old, new in zip(legacy, compiled)
+            if old != (new["toxicity"], new["sentiment"], new["is_spam"])
+        )
+
+        for label, secs in (("legacy", legacy_s), ("compiled", compiled_s)):
+            self.stdout.write(
+                f"{label:9s} {secs:8.3f}s  {len(texts) / secs:10.0f} yorum/s"
+            )
+        self.stdout.write(f"hızlanma: {legacy_s / compiled_s:.2f}x, farklı sonuç: {mismatches}")
+        if mismatches:
+            self.stderr.write(self.style.ERROR("Sonuçlar eski implementasyonla uyuşmuyor!"))
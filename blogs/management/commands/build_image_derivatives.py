@@ -0,0 +1,80 @@
+import os
+import posixpath
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import django
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from blogs.images import record_derivatives
+from blogs.models import ImageDerivative
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+DEFAULT_ROOTS = ["uploads", "avatars", "covers", "comment_images"]
+
+
+def _init_worker():
+    # spawn başlangıcında Django'yu kur (fork'ta zaten kurulu; tekrar çağrı zararsız)
+    django.setup()
+
+
+def _render(source):
+    """Worker: sadece storage okur/yazar; DB kaydını ana process yapar."""
+    from blogs.images import render_derivatives
+
+    try:
+        return source, render_derivatives(source), None
+    except Exception as exc:
+        return source, None, repr(exc)
+
+
+def walk(storage, root):
+    """storage içinde root altındaki görsel dosya adları (derivatives/ hariç)."""
+    try:
+        dirs, files = storage.listdir(root)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    for name in files:
+        if posixpath.splitext(name)[1].lower() in IMAGE_EXTS:
+            yield posixpath.join(root, name)
+    for sub in dirs:
+        yield from walk(storage, posixpath.join(root, sub))
+
+
+class Command(BaseCommand):
+    help = "Mevcut yüklemeler için responsive WebP/JPEG türevlerini process havuzunda üretir."
+
+    def add_arguments(self, parser):
+        parser.add_argument("roots", nargs="*", default=DEFAULT_ROOTS,
+                            help="Taranacak storage klasörleri (varsayılan: %(default)s)")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--force", action="store_true", help="Türevi olanları da yeniden üret")
+
+    def handle(self, *args, **options):
+        sources = [s for root in options["roots"] for s in walk(default_storage, root)]
+        if not options["force"]:
+            done = set(ImageDerivative.objects.filter(source__in=sources).values_list("source", flat=True))
+            sources = [s for s in sources if s not in done]
+        self.stdout.write(f"{len(sources)} görsel işlenecek ({options['workers']} worker)")
+        if not sources:
+            return
+
+        # Fork edilen process'ler açık DB bağlantısını paylaşmasın
+        connections.close_all()
+        t0 = time.perf_counter()
+        ok = failed = 0
+        with ProcessPoolExecutor(max_workers=options["workers"], initializer=_init_worker) as pool:
+            futures = [pool.submit(_render, s) for s in sources]
+            for future in as_completed(futures):
+                source, result, error = future.result()
+                if error:
+                    failed += 1
+                    self.stderr.write(f"{source}: {error}")
+                    continue
+                record_derivatives(source, *result)
+                ok += 1
+
+        elapsed = time.perf_counter() - t0
+        self.stdout.write(self.style.SUCCESS(f"{ok} görsel işlendi, {failed} hata, {elapsed:.1f}s"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blogs import metrics
+
+
+class Command(BaseCommand):
+    help = "METRICS_DIR'deki worker metrik dosyalarını siler (deploy başında, gunicorn'dan önce)."
+
+    def handle(self, *args, **options):
+        metrics.reset()
+        self.stdout.write(self.style.SUCCESS(f"Metrik dosyaları temizlendi: {metrics.metrics_dir()}"))
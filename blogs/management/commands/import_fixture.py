@@ -0,0 +1,91 @@
+import os
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from blogs import pagecache
+from blogs.context_processors import categories_cache, social_links_cache
+from blogs.counters import sync_comment_counts, sync_like_counts, sync_post_counts
+from blogs.importer import BATCH, FixtureImporter, fill_comment_tree
+from blogs.models import Blog, Comment, CommentStatus, Profile
+from blogs.related import rebuild as rebuild_related
+from blogs.remoderation import remoderate
+
+
+class Command(BaseCommand):
+    help = (
+        "dumpdata fixture'ını (UTF-8/UTF-16) akış halinde okuyup bulk_create ile içe aktarır. "
+        "Sinyaller çalışmaz; yan etkiler sonda toplu çalıştırılır (--side-effects)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("fixture", help="JSON fixture yolu (ör. data.json)")
+        parser.add_argument("--batch-size", type=int, default=BATCH)
+        parser.add_argument(
+            "--side-effects", choices=["batch", "none"], default="batch",
+            help="batch: profil, moderasyon, arama indeksi, ilgili yazılar, önbellekler sonda toplu; "
+                 "none: hiçbiri (e-posta fan-out'u her iki durumda da yapılmaz).",
+        )
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2,
+                            help="Moderasyon process havuzu boyutu")
+
+    def handle(self, *args, **options):
+        if not os.path.exists(options["fixture"]):
+            raise CommandError(f"Dosya yok: {options['fixture']}")
+
+        importer = FixtureImporter(batch_size=options["batch_size"])
+        t0 = time.perf_counter()
+        try:
+            importer.run(options["fixture"])
+        except ValueError as exc:  # JSONDecodeError dahil
+            raise CommandError(f"Fixture okunamadı: {exc}")
+
+        stats = importer.stats
+        for label in sorted(stats.rows, key=stats.seconds.get, reverse=True):
+            rows, secs = stats.rows[label], stats.seconds[label]
+            self.stdout.write(f"{label:32s} {rows:>9} satır {secs:8.2f}s {rows / max(secs, 1e-9):>10,.0f}/s")
+        self.stdout.write(f"{'(okuma + çözümleme)':32s} {'':>15} {importer.parse_seconds:8.2f}s")
+
+        # Veri bütünlüğü: her durumda (sinyallerin tuttuğu türetilmiş alanlar)
+        steps = [
+            ("comment tree", fill_comment_tree),
+            ("counters", self._sync_counters),
+        ]
+        if options["side_effects"] == "batch":
+            steps += [
+                ("profiles", self._create_profiles),
+                ("moderation", lambda: remoderate(
+                    Comment.objects.filter(status=CommentStatus.PENDING, reason=""), workers=options["workers"]
+                ).changed),
+                ("search index", lambda: call_command("rebuild_search_index", stdout=self.stdout)),
+                ("related posts", lambda: rebuild_related()[1]),
+                ("caches", self._invalidate_caches),
+            ]
+        for name, step in steps:
+            t1 = time.perf_counter()
+            result = step()
+            suffix = f" ({result})" if result is not None else ""
+            self.stdout.write(f"{'↳ ' + name:32s} {'':>15} {time.perf_counter() - t1:8.2f}s{suffix}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{sum(stats.rows.values())} satır içe aktarıldı, toplam {time.perf_counter() - t0:.1f}s"
+        ))
+
+    def _sync_counters(self):
+        with transaction.atomic():
+            return (
+                sync_like_counts(Blog) + sync_like_counts(Comment) + sync_comment_counts() + sync_post_counts()
+            )
+
+    def _create_profiles(self):
+        # create_or_update_user_profile sinyalinin toplu karşılığı
+        missing = get_user_model().objects.filter(profile__isnull=True).values_list("pk", flat=True)
+        return len(Profile.objects.bulk_create([Profile(user_id=pk) for pk in missing], batch_size=BATCH))
+
+    def _invalidate_caches(self):
+        categories_cache.invalidate()
+        social_links_cache.invalidate()
+        pagecache.invalidate(pagecache.GLOBAL, pagecache.LISTING)
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blogs.related import K, rebuild
+
+
+class Command(BaseCommand):
+    help = "Yayındaki tüm yazılar için TF-IDF vektörlerini ve ilgili yazı listelerini sıfırdan kurar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("-k", type=int, default=K, help="Yazı başına komşu sayısı")
+
+    def handle(self, *args, **options):
+        t0 = time.perf_counter()
+        posts, links = rebuild(options["k"])
+        self.stdout.write(self.style.SUCCESS(
+            f"{posts} yazı, {links} ilişki; {time.perf_counter() - t0:.1f}s"
+        ))
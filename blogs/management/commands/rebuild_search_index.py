@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from blogs.models import Blog
+from blogs.search import get_backend
+
+
+class Command(BaseCommand):
+    help = "Yayındaki tüm yazılar için tam metin arama indeksini sıfırdan kurar."
+
+    def handle(self, *args, **options):
+        backend = get_backend()
+        rows = (
+            Blog.objects.filter(status="Published")
+            .values_list("id", "title", "short_description", "blog_body")
+            .iterator()
+        )
+        n = backend.rebuild(rows)
+        self.stdout.write(self.style.SUCCESS(
+            f"{type(backend).__name__}: {n} yazı indekslendi."
+        ))
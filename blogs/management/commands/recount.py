@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from blogs.counters import sync_comment_counts, sync_like_counts, sync_post_counts
+from blogs.models import Blog, Comment
+
+
+class Command(BaseCommand):
+    help = (
+        "Denormalize sayaçları (like_count, comment_count, post_count) "
+        "gerçek tablolardan yeniden hesaplar / onarır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            choices=["blog", "comment", "category"],
+            help="Sadece bu modelin sayaçlarını onar (varsayılan: hepsi).",
+        )
+
+    def handle(self, *args, **options):
+        jobs = {
+            "blog": [
+                ("like_count", lambda: sync_like_counts(Blog)),
+                ("comment_count/root_comment_count", sync_comment_counts),
+            ],
+            "comment": [("like_count", lambda: sync_like_counts(Comment))],
+            "category": [("post_count", sync_post_counts)],
+        }
+        if options["model"]:
+            jobs = {options["model"]: jobs[options["model"]]}
+
+        for name, fields in jobs.items():
+            for label, sync in fields:
+                fixed = sync()
+                self.stdout.write(f"{name}.{label}: {fixed} satır düzeltildi")
+
+        self.stdout.write(self.style.SUCCESS("Sayaçlar güncel."))
@@ -0,0 +1,70 @@
+import os
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from blogs.models import Comment, CommentStatus
+from blogs.remoderation import CHUNK, FIELDS, remoderate
+
+
+def _day_start(value):
+    try:
+        return timezone.make_aware(datetime.combine(date.fromisoformat(value), dtime.min))
+    except ValueError:
+        raise CommandError("Tarih biçimi YYYY-MM-DD olmalı.")
+
+
+class Command(BaseCommand):
+    help = "Mevcut yorumları güncel ml.py sözlükleriyle process havuzunda yeniden değerlendirir."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--since", help="Bu günden (YYYY-MM-DD) itibaren oluşturulan yorumlar")
+        parser.add_argument("--until", help="Bu gün (YYYY-MM-DD) dahil, öncesinde oluşturulan yorumlar")
+        parser.add_argument("--pending-only", action="store_true", help="Sadece PENDING yorumlar")
+        parser.add_argument("--include-manual", action="store_true",
+                            help="Admin'in elle onayladığı/reddettiği yorumları da değerlendir")
+        parser.add_argument("--dry-run", action="store_true", help="Yazma; değişiklik raporu göster")
+        parser.add_argument("--show", type=int, default=20, help="--dry-run'da gösterilecek örnek fark sayısı")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+        parser.add_argument("--chunk-size", type=int, default=CHUNK)
+
+    def handle(self, *args, **options):
+        qs = Comment.objects.all()
+        if options["since"]:
+            qs = qs.filter(created_at__gte=_day_start(options["since"]))
+        if options["until"]:
+            qs = qs.filter(created_at__lt=_day_start(options["until"]) + timedelta(days=1))
+        if options["pending_only"]:
+            qs = qs.filter(status=CommentStatus.PENDING)
+
+        dry_run = options["dry_run"]
+        t0 = time.perf_counter()
+
+        def progress(report):
+            rate = report.scanned / max(time.perf_counter() - t0, 1e-9) * 60
+            self.stdout.write(f"  {report.scanned} tarandı, {report.changed} değişti ({rate:,.0f} yorum/dk)")
+
+        report = remoderate(
+            qs,
+            workers=options["workers"],
+            chunk_size=options["chunk_size"],
+            dry_run=dry_run,
+            keep_manual=not options["include_manual"],
+            sample_size=options["show"] if dry_run else 0,
+            on_chunk=progress if options["verbosity"] > 1 else None,
+        )
+        elapsed = time.perf_counter() - t0
+
+        for pk, old, new in report.samples:
+            diff = ", ".join(f"{f}: {old[f]!r} → {new[f]!r}" for f in FIELDS if old[f] != new[f])
+            self.stdout.write(f"#{pk}  {diff}")
+        for (old, new), n in sorted(report.transitions.items()):
+            self.stdout.write(f"{old:>8} → {new:<8} {n}")
+
+        verb = "değişecek" if dry_run else "güncellendi"
+        rate = report.scanned / max(elapsed, 1e-9) * 60
+        self.stdout.write(self.style.SUCCESS(
+            f"{report.scanned} yorum tarandı, {report.changed} {verb}; {elapsed:.1f}s ({rate:,.0f} yorum/dk)"
+        ))
@@ -0,0 +1,37 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import close_old_connections
+
+from blogs.analytics import replay, rollup
+
+
+class Command(BaseCommand):
+    help = "Analitik olaylarını günlük yazı özetlerine (DailyPostStats) toplar."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Sürekli çalış (worker modu).")
+        parser.add_argument("--interval", type=int, default=300, help="--loop için bekleme (sn).")
+        parser.add_argument("--replay", nargs=2, metavar=("BAŞLANGIÇ", "BİTİŞ"),
+                            help="YYYY-MM-DD aralığını olaylardan baştan kur (cursor'a dokunmaz).")
+
+    def handle(self, *args, **options):
+        if options["replay"]:
+            try:
+                first, last = (date.fromisoformat(d) for d in options["replay"])
+            except ValueError:
+                raise CommandError("Tarih biçimi YYYY-MM-DD olmalı.")
+            t0 = time.perf_counter()
+            written = replay(first, last)
+            self.stdout.write(f"{first}..{last}: {written} satır, {time.perf_counter() - t0:.2f}s")
+            return
+
+        while True:
+            days, written = rollup()
+            if written or not options["loop"]:
+                self.stdout.write(f"{days} gün yeniden toplandı, {written} satır yazıldı.")
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,97 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import (
+    override_settings, setup_databases, setup_test_environment, teardown_databases, teardown_test_environment,
+)
+
+from blogs.benchmark.data import SCALES, temporary_media
+from blogs.benchmark.runner import DEFAULT_BASELINE, SCENARIOS, compare, run
+from blogs.viewcounts import buffer as view_buffer
+
+
+class Command(BaseCommand):
+    help = (
+        "Public view'ları ayrı bir test veritabanında, tohumlu veriyle ve birden çok ölçekte ölçer "
+        "(p50/p95, sorgu sayısı, tepe bellek); sonucu JSON yazar ve baseline ile karşılaştırır."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scales", default="small,medium", help=f"Virgülle: {', '.join(SCALES)}")
+        parser.add_argument("--only", help="Sadece bu senaryolar (virgülle)")
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument("--warmup", type=int, default=3)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--page-cache", action="store_true",
+                            help="Anonim sayfa önbelleği açık ölçülsün (varsayılan: kapalı, view maliyeti ölçülür)")
+        parser.add_argument("--output", default="benchmark-results.json")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--save-baseline", action="store_true", help="Sonucu baseline olarak da yaz")
+        parser.add_argument("--tolerance", type=float, default=0.25, help="Süre/bellek için izin verilen artış oranı")
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        scales = [s.strip() for s in options["scales"].split(",") if s.strip()]
+        unknown = [s for s in scales if s not in SCALES]
+        if unknown:
+            raise CommandError(f"Bilinmeyen ölçek: {', '.join(unknown)}")
+        scenarios = SCENARIOS
+        if options["only"]:
+            wanted = {s.strip() for s in options["only"].split(",")}
+            scenarios = [s for s in SCENARIOS if s.name in wanted]
+            if not scenarios:
+                raise CommandError("--only hiçbir senaryoyla eşleşmedi.")
+
+        results = self._run(scales, scenarios, options)
+
+        with open(options["output"], "w", encoding="utf-8") as fh:
+            json.dump(results, fh, ensure_ascii=False, indent=2)
+        self.stdout.write(f"Sonuçlar: {options['output']}")
+        if options["save_baseline"]:
+            with open(options["baseline"], "w", encoding="utf-8") as fh:
+                json.dump(results, fh, ensure_ascii=False, indent=2)
+            self.stdout.write(f"Baseline güncellendi: {options['baseline']}")
+            return
+        self._compare(results, options)
+
+    def _run(self, scales, scenarios, options):
+        # Geliştirme veritabanına ve medya klasörüne dokunmamak için: test DB + geçici MEDIA_ROOT
+        setup_test_environment(debug=False)
+        old_config = setup_databases(verbosity=0, interactive=False, aliases={"default"}, serialized_aliases=set())
+        try:
+            with temporary_media(), override_settings(
+                STORAGES={
+                    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+                    "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+                },
+                ANONYMOUS_PAGE_CACHE=options["page_cache"],
+                IMAGE_DERIVATIVES=False,  # arka plan thread'i geçici dizin silindikten sonra yazmasın
+                VIEW_COUNT_FLUSH_INTERVAL=0,
+            ):
+                return run(
+                    scales, seed=options["seed"], repeat=options["repeat"], warmup=options["warmup"],
+                    scenarios=scenarios, log=self.stdout.write,
+                )
+        finally:
+            view_buffer.drain()  # atexit flush'ı silinmiş test DB'sine yazmaya çalışmasın
+            teardown_databases(old_config, verbosity=0)
+            teardown_test_environment()
+
+    def _compare(self, results, options):
+        try:
+            with open(options["baseline"], encoding="utf-8") as fh:
+                baseline = json.load(fh)
+        except FileNotFoundError:
+            self.stdout.write(f"Baseline yok ({options['baseline']}); --save-baseline ile oluşturun.")
+            return
+
+        rows = compare(results, baseline, options["tolerance"])
+        regressions = [row for row in rows if row[-1]]
+        for scale, view, metric, before, now, regressed in rows:
+            if regressed or (metric == "queries" and before != now):
+                mark = self.style.ERROR("GERİLEME") if regressed else ""
+                self.stdout.write(f"{scale:7s} {view:22s} {metric:8s} {before:>10} → {now:<10} {mark}")
+        summary = f"{len(regressions)} gerileme (tolerans %{options['tolerance'] * 100:.0f}, baseline: {options['baseline']})"
+        if regressions and options["fail_on_regression"]:
+            raise CommandError(summary)
+        self.stdout.write(self.style.WARNING(summary) if regressions else self.style.SUCCESS(summary))
@@ -0,0 +1,28 @@
+from django.contrib.auth import get_user_model
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.management.base import BaseCommand, CommandError
+
+from blogs.benchmark.data import SCALES, STAFF_USERNAME, generate
+
+
+class Command(BaseCommand):
+    help = "Mevcut veritabanına tohumlu (deterministik) benchmark verisi üretir."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=list(SCALES), default="small")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--no-images", action="store_true",
+                            help="Görsel üretme / atama (görseller MEDIA_ROOT/bench altına yazılır)")
+
+    def handle(self, *args, **options):
+        if get_user_model().objects.filter(username=STAFF_USERNAME).exists():
+            raise CommandError("Benchmark verisi zaten var; önce temiz bir veritabanı kullanın.")
+        if not options["no_images"] and not isinstance(default_storage, FileSystemStorage):
+            # Cloudinary vb. uzak storage'a sentetik görsel yüklenmez
+            raise CommandError("Default storage yerel değil; --no-images ile çalıştırın.")
+
+        def log(step, secs):
+            self.stdout.write(f"{step:24s} {secs:6.1f}s")
+
+        counts = generate(options["scale"], seed=options["seed"], images=not options["no_images"], log=log)
+        self.stdout.write(self.style.SUCCESS(", ".join(f"{k}={v}" for k, v in counts.items())))
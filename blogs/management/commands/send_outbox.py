@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from blogs.outbox import CHUNK_SIZE, process_outbox
+
+
+class Command(BaseCommand):
+    help = "Bekleyen bildirim e-postalarını (NotificationOutbox) gönderir."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--loop", action="store_true", help="Sürekli çalış (worker modu).")
+        parser.add_argument("--interval", type=int, default=15, help="--loop için bekleme (sn).")
+        parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        while True:
+            jobs, messages = process_outbox(chunk_size=options["chunk_size"])
+            if jobs or not options["loop"]:
+                self.stdout.write(f"{jobs} iş işlendi, {messages} e-posta gönderildi.")
+            if not options["loop"]:
+                return
+            close_old_connections()
+            time.sleep(options["interval"])
@@ -0,0 +1,305 @@
+# blogs/metrics.py
+"""
+Worker'lar arası toplanan sayaç / histogramlar (Prometheus metin formatı).
+
+Gunicorn her worker'ı ayrı process: process içi sayaçlar tek başına
+yanıltıcı olur. Bu yüzden her process METRICS_DIR altında kendi
+`metrics-<pid>.db` dosyasını mmap ile tutar; `/metrics` isteğini hangi
+worker karşılarsa karşılasın dizindeki tüm dosyaları okuyup toplar
+(prometheus_client'ın multiprocess modu ile aynı fikir). Ölen
+worker'ların dosyaları da sayılır; dizin deploy başında `clear_metrics`
+ile temizlenir.
+
+Dosya düzeni: [kullanılan bayt: u32][boşluk: 4] sonra kayıtlar:
+[anahtar uzunluğu: u32][anahtar (utf-8, 8'e hizalı)][değer: f64].
+Yazan tek process olduğu için kilit process içidir; okuyucu önce
+"kullanılan bayt"ı okur, kayıt onu artırmadan önce tamamen yazılır.
+
+METRICS_ENABLED kapalıysa inc / observe hiçbir şey yapmaz.
+"""
+import glob
+import json
+import math
+import mmap
+import os
+import struct
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+
+INITIAL_SIZE = 64 * 1024
+_HEADER = struct.Struct("<I4x")
+_LENGTH = struct.Struct("<I")
+_VALUE = struct.Struct("<d")
+
+
+def enabled():
+    return getattr(settings, "METRICS_ENABLED", False)
+
+
+def metrics_dir():
+    return str(settings.METRICS_DIR)
+
+
+# ---- Depolama ----
+class MmapStore:
+    """Bir process'in metrik dosyası: anahtar (JSON) -> f64."""
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            size = os.fstat(fd).st_size
+            if size < INITIAL_SIZE:
+                os.ftruncate(fd, INITIAL_SIZE)
+                size = INITIAL_SIZE
+            self._fd = fd
+            self._map = mmap.mmap(fd, size)
+        except BaseException:
+            os.close(fd)
+            raise
+        self._used = _HEADER.unpack_from(self._map, 0)[0] or _HEADER.size
+        # Aynı pid ile yeniden açılan dosyada kaldığı yerden devam
+        self._positions = {key: pos for key, _, pos in _entries(self._map, self._used)}
+
+    def _append(self, key):
+        encoded = key.encode("utf-8")
+        padded = len(encoded) + (-(_LENGTH.size + len(encoded)) % 8)
+        needed = _LENGTH.size + padded + _VALUE.size
+        if self._used + needed > len(self._map):
+            size = len(self._map)
+            while self._used + needed > size:
+                size *= 2
+            os.ftruncate(self._fd, size)
+            self._map.close()
+            self._map = mmap.mmap(self._fd, size)
+        pos = self._used
+        _LENGTH.pack_into(self._map, pos, len(encoded))
+        self._map[pos + _LENGTH.size:pos + _LENGTH.size + len(encoded)] = encoded
+        value_pos = pos + _LENGTH.size + padded
+        _VALUE.pack_into(self._map, value_pos, 0.0)
+        self._used += needed
+        _HEADER.pack_into(self._map, 0, self._used)  # kayıt tamamlandıktan sonra görünür
+        self._positions[key] = value_pos
+        return value_pos
+
+    def inc(self, key, amount):
+        with self._lock:
+            pos = self._positions.get(key)
+            if pos is None:
+                pos = self._append(key)
+            _VALUE.pack_into(self._map, pos, _VALUE.unpack_from(self._map, pos)[0] + amount)
+
+    def close(self):
+        self._map.close()
+        os.close(self._fd)
+
+
+def _entries(buf, used):
+    """(anahtar, değer, değer ofseti) üreteci."""
+    pos = _HEADER.size
+    while pos + _LENGTH.size <= used:
+        length = _LENGTH.unpack_from(buf, pos)[0]
+        key = bytes(buf[pos + _LENGTH.size:pos + _LENGTH.size + length]).decode("utf-8")
+        value_pos = pos + _LENGTH.size + length + (-(_LENGTH.size + length) % 8)
+        yield key, _VALUE.unpack_from(buf, value_pos)[0], value_pos
+        pos = value_pos + _VALUE.size
+
+
+_store = None
+_store_key = None  # (pid, dizin)
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """Bu process'in deposu (fork sonrası pid değişince yenisi açılır)."""
+    global _store, _store_key
+    key = (os.getpid(), metrics_dir())
+    if _store_key != key:
+        with _store_lock:
+            if _store_key != key:
+                os.makedirs(key[1], exist_ok=True)
+                # Fork'tan kalan ebeveyn haritası bu process'e ait değil; kapatılmaz
+                if _store is not None and _store_key[0] == key[0]:
+                    _store.close()
+                _store = MmapStore(os.path.join(key[1], f"metrics-{key[0]}.db"))
+                _store_key = key
+    return _store
+
+
+def reset():
+    """Dizindeki tüm dosyaları siler (deploy başı / testler)."""
+    global _store, _store_key
+    with _store_lock:
+        if _store is not None and _store_key[0] == os.getpid():
+            _store.close()
+        _store = _store_key = None
+        for path in glob.glob(os.path.join(metrics_dir(), "metrics-*.db")):
+            os.remove(path)
+
+
+def collect():
+    """Tüm process dosyalarının toplamı: {(ad, ((etiket, değer), ...)): değer}."""
+    totals = defaultdict(float)
+    for path in glob.glob(os.path.join(metrics_dir(), "metrics-*.db")):
+        try:
+            with open(path, "rb") as fh:
+                buf = fh.read()
+        except FileNotFoundError:
+            continue
+        if len(buf) < _HEADER.size:
+            continue
+        used = min(_HEADER.unpack_from(buf, 0)[0], len(buf))
+        for key, value, _ in _entries(buf, used):
+            name, labels = json.loads(key)
+            totals[(name, tuple(map(tuple, labels)))] += value
+    return totals
+
+
+# ---- Metrik tipleri ----
+REGISTRY = {}
+
+
+class Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._keys = {}  # (ek, etiketler, ek etiketler) -> dosya anahtarı
+        REGISTRY[name] = self
+
+    def _key(self, suffix, labels, extra=()):
+        cache_key = (suffix, tuple(labels.items()), extra)
+        key = self._keys.get(cache_key)
+        if key is None:
+            if set(labels) != set(self.labelnames):
+                raise ValueError(f"{self.name}: etiketler {self.labelnames} olmalı, gelen {tuple(labels)}")
+            pairs = [[name, str(labels[name])] for name in self.labelnames] + [list(e) for e in extra]
+            key = json.dumps([self.name + suffix, pairs], ensure_ascii=False, separators=(",", ":"))
+            self._keys[cache_key] = key
+        return key
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        if enabled():
+            get_store().inc(self._key("_total", labels), amount)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=()):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        if not enabled():
+            return
+        store = get_store()
+        # Kovalar kümülatif değil tutulur (gözlem başına 3 yazım); render'da toplanır
+        le = next((b for b in self.buckets if value <= b), math.inf)
+        store.inc(self._key("_bucket", labels, (("le", _format(le)),)), 1)
+        store.inc(self._key("_sum", labels), value)
+        store.inc(self._key("_count", labels), 1)
+
+
+# ---- Prometheus metin formatı ----
+def _format(value):
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value)) if abs(value) < 1e15 else repr(float(value))
+    return repr(float(value))
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name, labels, value):
+    label_text = ",".join(f'{k}="{_escape(v)}"' for k, v in labels)
+    return f"{name}{{{label_text}}} {_format(value)}" if label_text else f"{name} {_format(value)}"
+
+
+def render():
+    """Tüm worker'ların toplamı, Prometheus text exposition formatında."""
+    totals = collect()
+    by_name = defaultdict(list)
+    for (name, labels), value in totals.items():
+        by_name[name].append((labels, value))
+
+    lines = []
+    for metric in REGISTRY.values():
+        # 0.0.4 formatında sayaç ailesinin adı örnek adıyla aynı (_total dahil)
+        family = metric.name + "_total" if metric.kind == "counter" else metric.name
+        lines.append(f"# HELP {family} {metric.documentation}")
+        lines.append(f"# TYPE {family} {metric.kind}")
+        if metric.kind == "counter":
+            for labels, value in sorted(by_name.get(family, ())):
+                lines.append(_series(family, labels, value))
+        else:
+            lines.extend(_histogram_lines(metric, by_name))
+    lines.extend(_cache_ratio_lines(totals))
+    return "\n".join(lines) + "\n"
+
+
+def _histogram_lines(metric, by_name):
+    counts = defaultdict(dict)  # etiketler -> {le: sayı}
+    for labels, value in by_name.get(metric.name + "_bucket", ()):
+        base = tuple(pair for pair in labels if pair[0] != "le")
+        le = dict(labels)["le"]
+        counts[base][math.inf if le == "+Inf" else float(le)] = value
+    sums = dict(by_name.get(metric.name + "_sum", ()))
+    lines = []
+    for labels in sorted(counts):
+        running = 0
+        for bound in metric.buckets + (math.inf,):
+            running += counts[labels].get(bound, 0)
+            lines.append(_series(metric.name + "_bucket", labels + (("le", _format(bound)),), running))
+        lines.append(_series(metric.name + "_sum", labels, sums.get(labels, 0.0)))
+        lines.append(_series(metric.name + "_count", labels, running))
+    return lines
+
+
+def _cache_ratio_lines(totals):
+    hits = totals.get((cache_requests.name + "_total", (("result", "hit"),)), 0)
+    misses = totals.get((cache_requests.name + "_total", (("result", "miss"),)), 0)
+    lookups = hits + misses
+    return [
+        "# HELP blog_cache_hit_ratio Cache isabet oranı (tüm worker'lar, process başından beri)",
+        "# TYPE blog_cache_hit_ratio gauge",
+        f"blog_cache_hit_ratio {_format(hits / lookups if lookups else 0.0)}",
+    ]
+
+
+# ---- Uygulama metrikleri ----
+request_duration = Histogram(
+    "blog_request_duration_seconds", "İstek süresi (URL adı ve HTTP durumuna göre)",
+    ("view", "status"), buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+request_queries = Histogram(
+    "blog_request_db_queries", "İstek başına SQL sorgusu (URL adına göre)",
+    ("view",), buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+moderation_decisions = Counter(
+    "blog_moderation_decisions", "Yorum moderasyon kararları (stage: sync = kayıt anı, background = ertelenen)",
+    ("stage", "status"),
+)
+mail_messages = Counter("blog_mail_messages", "Gönderilmeye çalışılan e-postalar", ("source", "outcome"))
+cache_requests = Counter("blog_cache_requests", "İstek sırasında cache okumaları", ("result",))
+
+
+def observe_request(view, status, seconds, queries, cache_hits, cache_misses):
+    request_duration.observe(seconds, view=view, status=status)
+    request_queries.observe(queries, view=view)
+    if cache_hits:
+        cache_requests.inc(cache_hits, result="hit")
+    if cache_misses:
+        cache_requests.inc(cache_misses, result="miss")
@@ -0,0 +1,42 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:56
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def backfill_like_counts(apps, schema_editor):
+    for model_name in ("Blog", "Comment"):
+        model = apps.get_model("blogs", model_name)
+        field = model._meta.get_field("likes")
+        through = field.remote_field.through
+        source = field.m2m_field_name()
+        counts = (
+            through.objects.filter(**{source: OuterRef("pk")})
+            .order_by()
+            .values(source)
+            .annotate(c=Count("*"))
+            .values("c")
+        )
+        model.objects.update(like_count=Coalesce(Subquery(counts), Value(0)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0022_comment_image'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_like_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,54 @@
+from django.db import migrations
+
+
+def create_search_index(apps, schema_editor):
+    from blogs.search import backend_for
+
+    conn = schema_editor.connection
+    with conn.cursor() as cur:
+        if conn.vendor == "sqlite":
+            cur.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS blogs_blog_fts "
+                "USING fts5(title, short_description, blog_body, tokenize='unicode61')"
+            )
+        elif conn.vendor == "postgresql":
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS blogs_blog_search ("
+                " blog_id bigint PRIMARY KEY REFERENCES blogs_blog(id) ON DELETE CASCADE"
+                " DEFERRABLE INITIALLY DEFERRED,"
+                " document tsvector NOT NULL)"
+            )
+            cur.execute(
+                "CREATE INDEX IF NOT EXISTS blogs_blog_search_document_gin "
+                "ON blogs_blog_search USING GIN (document)"
+            )
+        else:
+            return
+
+    Blog = apps.get_model("blogs", "Blog")
+    rows = (
+        Blog.objects.filter(status="Published")
+        .values_list("id", "title", "short_description", "blog_body")
+        .iterator()
+    )
+    backend_for(conn).rebuild(rows, conn=conn)
+
+
+def drop_search_index(apps, schema_editor):
+    conn = schema_editor.connection
+    with conn.cursor() as cur:
+        if conn.vendor == "sqlite":
+            cur.execute("DROP TABLE IF EXISTS blogs_blog_fts")
+        elif conn.vendor == "postgresql":
+            cur.execute("DROP TABLE IF EXISTS blogs_blog_search")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0023_blog_like_count_comment_like_count'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
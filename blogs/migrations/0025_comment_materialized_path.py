@@ -0,0 +1,71 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_paths(apps, schema_editor):
+    Comment = apps.get_model("blogs", "Comment")
+    parents = dict(Comment.objects.values_list("id", "parent_comment_id"))
+
+    memo = {}
+
+    def position(cid):
+        # (root_id, path, depth) — ebeveyn zincirini bir kez çözer
+        if cid in memo:
+            return memo[cid]
+        chain = []
+        cur = parents.get(cid)
+        while cur is not None and cur not in memo and cur in parents:
+            chain.append(cur)
+            cur = parents[cur]
+        for node in list(reversed(chain)) + [cid]:
+            parent = parents.get(node)
+            if parent is None or parent not in parents:
+                memo[node] = (None, "", 0)
+            else:
+                p_root, p_path, p_depth = memo[parent]
+                memo[node] = (p_root or parent, f"{p_path}{parent:010d}/", p_depth + 1)
+        return memo[cid]
+
+    batch = []
+    for comment in Comment.objects.filter(parent_comment__isnull=False).only("id").iterator():
+        comment.root_id, comment.path, comment.depth = position(comment.id)
+        batch.append(comment)
+        if len(batch) >= 1000:
+            Comment.objects.bulk_update(batch, ["root", "path", "depth"])
+            batch = []
+    if batch:
+        Comment.objects.bulk_update(batch, ["root", "path", "depth"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0024_blog_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.TextField(blank=True, default='', editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='root',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='thread_comments', to='blogs.comment'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['root', 'path'], name='blogs_comme_root_id_c30e66_idx'),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:12
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def _count(model, source, **filters):
+    counts = (
+        model.objects.filter(**{source: OuterRef("pk")}, **filters)
+        .order_by()
+        .values(source)
+        .annotate(c=Count("*"))
+        .values("c")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+def backfill_counters(apps, schema_editor):
+    Blog = apps.get_model("blogs", "Blog")
+    Category = apps.get_model("blogs", "Category")
+    Comment = apps.get_model("blogs", "Comment")
+    Blog.objects.update(
+        comment_count=_count(Comment, "blog", status="APPROVED"),
+        root_comment_count=_count(Comment, "blog", status="APPROVED", parent_comment__isnull=True),
+    )
+    Category.objects.update(post_count=_count(Blog, "category", status="Published"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blogs', '0026_notificationoutbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='blog',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='blog',
+            name='root_comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='post_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
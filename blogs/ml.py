@@ -12,35 +12,128 @@ URL_PAT = re.compile(r"(https?://|www\.)|\b(t\.me|wa\.me|bit\.ly|tinyurl)\b", re
 CONTACT_PAT = re.compile(r"(\b\d{10,}\b|@[\w\d_]{3,})")
 REPEAT_PAT = re.compile(r"(.)\1{4,}")
 
-def _toxicity_score(text: str) -> float:
-    t = (text or "").lower()
-    hits = sum(1 for w in OFFENSIVE if w in t)
+
+# -------------------------------------------------------------------
+# Derlenmiş tek geçişli eşleştirici
+# -------------------------------------------------------------------
+# Üç sözlük tek bir trie-regex'te birleşir: her pozisyonda en fazla
+# "en uzun kelime" kadar adım atılır, maliyet sözlük boyutuyla büyümez.
+# Mevcut ~50 kelimelik sözlükte eski döngüden biraz yavaştır (~0.85x);
+# kazanç sözlük büyüdükçe gelir (3k kelimede ~8x, bkz. bench_moderation).
+# Lookahead sayesinde örtüşen eşleşmeler de görülür ("sik" / "siktir").
+# Aynı pozisyondan başlayan kısa kelimeler (uzun eşleşmenin ön eki) ve
+# genel olarak bir kelimenin içinde geçen diğer sözlük kelimeleri
+# `_contains` ile önceden hesaplanır; sonuç eski `w in t` semantiğiyle aynıdır.
+def _trie_regex(words):
+    trie = {}
+    for w in words:
+        node = trie
+        for ch in w:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node):
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        # Terminal düğüm: devam opsiyonel, greedy => önce en uzun kelime denenir
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+class LexiconMatcher:
+    """
+    categories: {"offensive": {...}, "positive": {...}, ...}
+    scan(text) -> {kategori: metinde geçen farklı kelime sayısı} + spam bayrakları
+    """
+
+    # Spam sinyalleri: her biri tek regex, ilk eşleşmede durur (C tarafında)
+    SPAM = (("url", URL_PAT), ("contact", CONTACT_PAT), ("repeat", REPEAT_PAT))
+
+    def __init__(self, categories):
+        self.categories = {name: frozenset(words) for name, words in categories.items()}
+        self._word_cats = {}
+        for name, words in self.categories.items():
+            for w in words:
+                self._word_cats.setdefault(w, set()).add(name)
+        vocab = sorted(self._word_cats)
+        # Metin zaten lower() edildiği için sözlük regex'inde re.I yok (ı/i eşlemesini bozardı)
+        self._lex = re.compile(f"(?=({_trie_regex(vocab)}))", re.S)
+
+        # Her kelime için: içinde geçen sözlük kelimeleri (kendisi dahil).
+        # Özalt dizgiler w[:-1] veya w[1:] içindedir; kısadan uzuna memoize
+        # edilerek aynı trie-regex ile bulunur (O(V^2) tarama yok).
+        self._contains = {}
+        for w in sorted(vocab, key=len):
+            inner = {w}
+            for f in self._lex.findall(w[:-1]) + self._lex.findall(w[1:]):
+                inner.update(self._contains[f])
+            self._contains[w] = frozenset(inner)
+
+    def scan(self, t):
+        """
+        t: normalize edilmiş (lower) metin. Sözlük kelimeleri tek findall
+        geçişinde toplanır; maliyet metin uzunluğuyla orantılı, sözlükle değil.
+        """
+        contains = self._contains
+        seen = set().union(*[contains[w] for w in set(self._lex.findall(t))])
+        counts = {name: len(seen & words) for name, words in self.categories.items()}
+        flags = {name: pat.search(t) is not None for name, pat in self.SPAM}
+        return counts, flags
+
+
+MATCHER = LexiconMatcher({"offensive": OFFENSIVE, "positive": POSITIVE, "negative": NEGATIVE})
+
+
+def normalize(text: str) -> str:
+    return (text or "").lower()
+
+
+def _toxicity_from_hits(hits: int) -> float:
     return max(0.0, min(1.0, 1 - math.exp(-1.2 * hits)))
 
-def _sentiment_score(text: str) -> float:
-    t = (text or "").lower()
-    pos = sum(1 for w in POSITIVE if w in t)
-    neg = sum(1 for w in NEGATIVE if w in t)
+
+def _sentiment_from_hits(pos: int, neg: int) -> float:
     if pos == 0 and neg == 0:
         return 0.0
     raw = (pos - neg) / (pos + neg)
     return max(-1.0, min(1.0, raw))
 
-def _is_spam(text: str):
-    t = (text or "").lower()
+
+def _spam_reasons(t: str, flags) -> list:
     reasons = []
-    if URL_PAT.search(t): reasons.append("url/shortener")
-    if CONTACT_PAT.search(t): reasons.append("iletişim/handle")
-    if REPEAT_PAT.search(t): reasons.append("aşırı tekrar")
+    if flags["url"]: reasons.append("url/shortener")
+    if flags["contact"]: reasons.append("iletişim/handle")
+    if flags["repeat"]: reasons.append("aşırı tekrar")
     if len(t.strip()) < 5: reasons.append("çok kısa")
-    if sum(ch.isalpha() for ch in t) < 6 and (URL_PAT.search(t) or CONTACT_PAT.search(t)):
+    if (flags["url"] or flags["contact"]) and sum(ch.isalpha() for ch in t) < 6:
         reasons.append("metin yok")
+    return reasons
+
+
+def _toxicity_score(text: str) -> float:
+    counts, _ = MATCHER.scan(normalize(text))
+    return _toxicity_from_hits(counts["offensive"])
+
+def _sentiment_score(text: str) -> float:
+    counts, _ = MATCHER.scan(normalize(text))
+    return _sentiment_from_hits(counts["positive"], counts["negative"])
+
+def _is_spam(text: str):
+    t = normalize(text)
+    _, flags = MATCHER.scan(t)
+    reasons = _spam_reasons(t, flags)
     return (True, ", ".join(reasons)) if reasons else (False, "")
 
 def analyze_text(text: str):
-    tox = _toxicity_score(text)
-    sen = _sentiment_score(text)
-    spam, reason = _is_spam(text)
+    t = normalize(text)
+    counts, flags = MATCHER.scan(t)  # tek geçiş: toksisite + duygu + spam sinyalleri
+    tox = _toxicity_from_hits(counts["offensive"])
+    sen = _sentiment_from_hits(counts["positive"], counts["negative"])
+    reasons = _spam_reasons(t, flags)
+    spam, reason = (True, ", ".join(reasons)) if reasons else (False, "")
 
     decision, dec_reason = "APPROVED", "temiz"
     if spam:
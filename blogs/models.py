@@ -1,13 +1,17 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.urls import reverse
-from django.utils.text import slugify
+from django.utils import timezone
+
+from .slugs import SAVE_RETRIES, allocate_slug
 
 # -------------------------------------------------------------------
 # Category
 # -------------------------------------------------------------------
 class Category(models.Model):
     category_name = models.CharField(max_length=50, unique=True, db_index=True)
+    post_count = models.PositiveIntegerField(default=0, editable=False)  # Published yazı sayısı (denormalize)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -40,7 +44,11 @@ class Blog(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     updated_at = models.DateTimeField(auto_now=True)
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="liked_posts", blank=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)  # likes için denormalize sayaç
     view_count = models.PositiveIntegerField(default=0)
+    # Onaylı yorum sayaçları (denormalize; bkz. blogs/counters.py)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    root_comment_count = models.PositiveIntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ["-updated_at"]
@@ -62,15 +70,19 @@ class Blog(models.Model):
         return self.blog_body
 
     def save(self, *args, **kwargs):
-        if not self.slug:
-            base = slugify(self.title)[:50] or "yazi"
-            slug = base
-            i = 1
-            while Blog.objects.filter(slug=slug).exclude(pk=self.pk).exists():
-                i += 1
-                slug = f"{base}-{i}"
-            self.slug = slug
-        super().save(*args, **kwargs)
+        if self.slug:
+            return super().save(*args, **kwargs)
+        # Tek önek sorgusuyla tahsis; yarışta unique kısıtı patlarsa yeniden dene
+        for attempt in range(SAVE_RETRIES):
+            self.slug = allocate_slug(Blog, self.title, exclude_pk=self.pk)
+            try:
+                with transaction.atomic():
+                    return super().save(*args, **kwargs)
+            except IntegrityError:
+                conflict = Blog.objects.filter(slug=self.slug).exclude(pk=self.pk).exists()
+                self.slug = ""
+                if not conflict or attempt == SAVE_RETRIES - 1:
+                    raise
 
 
 # -------------------------------------------------------------------
@@ -85,6 +97,12 @@ class CommentStatus(models.TextChoices):
 # -------------------------------------------------------------------
 # Comment  (ML alanları + indeksler)
 # -------------------------------------------------------------------
+# Materialized path: her segment 10 haneli sıfır dolgulu ata id'si + "/"
+PATH_SEGMENT = 11
+# 200 * 11 = 2200 bayt: Postgres btree indeks satır sınırının (~2700) altında
+MAX_COMMENT_DEPTH = 200
+
+
 class Comment(models.Model):
     user = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -102,7 +120,18 @@ class Comment(models.Model):
     parent_comment = models.ForeignKey(
         "self", on_delete=models.CASCADE, null=True, blank=True, related_name="replies"
     )
+    # ---- Thread ağacı (materialized path) ----
+    # root: thread'in kök yorumu (kökler için NULL); path: kökten ebeveyne
+    # kadar ataların id zinciri; depth: ata sayısı. Hepsi insert anında
+    # ebeveynden hesaplanır, ek UPDATE gerekmez.
+    root = models.ForeignKey(
+        "self", on_delete=models.CASCADE, null=True, blank=True,
+        related_name="thread_comments", editable=False,
+    )
+    path = models.TextField(blank=True, default="", editable=False)
+    depth = models.PositiveSmallIntegerField(default=0, editable=False)
     likes = models.ManyToManyField(settings.AUTH_USER_MODEL, related_name="comment_likes", blank=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)  # likes için denormalize sayaç
     image = models.ImageField(upload_to="comment_images/%Y/%m/%d", blank=True, null=True)
 
     # ---- ML / Moderasyon ----
@@ -116,10 +145,26 @@ class Comment(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["blog", "status", "-created_at"]),
+            models.Index(fields=["root", "path"]),
         ]
 
+    def save(self, *args, **kwargs):
+        if self._state.adding and self.parent_comment_id:
+            self.set_tree_position(self.parent_comment)
+        super().save(*args, **kwargs)
+
+    def set_tree_position(self, parent):
+        """root/path/depth alanlarını ebeveynden doldurur."""
+        if parent.depth + 1 > MAX_COMMENT_DEPTH:
+            raise ValidationError(
+                "Bu yanıt zinciri çok derin; daha üstteki bir yoruma yanıt verin.", code="too_deep"
+            )
+        self.root_id = parent.root_id or parent.pk
+        self.path = f"{parent.path}{parent.pk:010d}/"
+        self.depth = parent.depth + 1
+
     def total_likes(self):
-        return self.likes.count()
+        return self.like_count
 
     def __str__(self):
         return (self.comment or "")[:40]
@@ -190,3 +235,157 @@ class SavedPost(models.Model):
         return f"{getattr(self.user, 'username', 'user')} saved {self.post.title}"
 
 
+
+
+# -------------------------------------------------------------------
+# NotificationOutbox  (yeni yazı e-postaları; `send_outbox` worker'ı işler)
+# -------------------------------------------------------------------
+class OutboxStatus(models.TextChoices):
+    PENDING = "PENDING", "Pending"
+    DONE = "DONE", "Done"
+    FAILED = "FAILED", "Failed"
+
+
+class NotificationOutbox(models.Model):
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="notifications")
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=OutboxStatus.choices, default=OutboxStatus.PENDING)
+    # Alıcılar user.id sırasıyla akar; cursor son başarılı gönderimin id'si (kaldığı yerden devam)
+    cursor = models.BigIntegerField(default=0)
+    sent_count = models.PositiveIntegerField(default=0)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_until = models.DateTimeField(null=True, blank=True)  # worker kiralaması
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ["created_at"]
+        indexes = [
+            models.Index(fields=["status", "next_attempt_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} [{self.status}]"
+
+
+# -------------------------------------------------------------------
+# Görsel türevleri (responsive srcset; bkz. blogs/images.py)
+# -------------------------------------------------------------------
+class ImageDerivative(models.Model):
+    # Kaynak dosyanın storage adı (ör. uploads/2025/01/02/kapak.jpg)
+    source = models.CharField(max_length=255, unique=True)
+    width = models.PositiveIntegerField(default=0)
+    height = models.PositiveIntegerField(default=0)
+    # Üretilmiş genişlik kovaları, ör. [320, 640, 960]
+    widths = models.JSONField(default=list)
+    # storage.save()'in döndürdüğü adlar: {"webp": {"320": "derivatives/..."}, "jpg": {...}}
+    files = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.source} {self.widths}"
+
+
+# -------------------------------------------------------------------
+# Analitik: ham olaylar + günlük özet (bkz. blogs/analytics.py)
+# -------------------------------------------------------------------
+class EventKind(models.TextChoices):
+    VIEW = "view", "View"
+    LIKE = "like", "Like"
+    UNLIKE = "unlike", "Unlike"
+    COMMENT = "comment", "Comment"
+    SAVE = "save", "Save"
+
+
+class AnalyticsEvent(models.Model):
+    # Sadece eklenir; blog silinse de satır kalır (FK yok => cascade maliyeti yok)
+    kind = models.CharField(max_length=10, choices=EventKind.choices)
+    blog_id = models.BigIntegerField()
+    user_id = models.BigIntegerField(null=True, blank=True)
+    count = models.PositiveIntegerField(default=1)  # view'lar flush aralığında toplanmış gelir
+    created_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} blog={self.blog_id} x{self.count}"
+
+
+class DailyPostStats(models.Model):
+    day = models.DateField()
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="daily_stats")
+    views = models.PositiveIntegerField(default=0)
+    likes = models.PositiveIntegerField(default=0)
+    unlikes = models.PositiveIntegerField(default=0)
+    comments = models.PositiveIntegerField(default=0)
+    saves = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        ordering = ["-day"]
+        constraints = [
+            models.UniqueConstraint(fields=["day", "blog"], name="uniq_daily_post_stats"),
+        ]
+        indexes = [
+            models.Index(fields=["blog", "day"]),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.blog_id}"
+
+
+class RollupCursor(models.Model):
+    """Toplanan son AnalyticsEvent id'si (artımlı rollup için tek satır)."""
+    name = models.CharField(max_length=50, unique=True)
+    last_event_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}@{self.last_event_id}"
+
+
+# -------------------------------------------------------------------
+# İlgili yazılar: TF-IDF vektörleri + önceden hesaplanmış komşular
+# (bkz. blogs/related.py)
+# -------------------------------------------------------------------
+class TermStat(models.Model):
+    """Son tam yeniden kurulumdaki doküman frekansı (artımlı güncellemede idf için)."""
+    term = models.CharField(max_length=32, unique=True)
+    df = models.PositiveIntegerField()
+
+    def __str__(self):
+        return f"{self.term} df={self.df}"
+
+
+class PostTerm(models.Model):
+    """Yazının seyrek TF-IDF vektörü: terim başına L2 normalize ağırlık."""
+    # blog_id aramaları uniq_post_term indeksinin ilk sütununu kullanır
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="terms", db_index=False)
+    term = models.CharField(max_length=32)
+    weight = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["blog", "term"], name="uniq_post_term"),
+        ]
+        indexes = [
+            models.Index(fields=["term"]),
+        ]
+
+    def __str__(self):
+        return f"{self.blog_id}:{self.term}={self.weight:.3f}"
+
+
+class RelatedPost(models.Model):
+    source = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="related_links", db_index=False)
+    target = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name="+")
+    score = models.FloatField()
+
+    class Meta:
+        ordering = ["-score"]
+        constraints = [
+            models.UniqueConstraint(fields=["source", "target"], name="uniq_related_post"),
+        ]
+
+    def __str__(self):
+        return f"{self.source_id} -> {self.target_id} ({self.score:.3f})"
@@ -0,0 +1,151 @@
+# blogs/moderation.py
+"""
+Yorum moderasyon pipeline'ı.
+
+Scorer'lar COMMENT_MODERATION_SCORERS ayarındaki sırayla, INSERT'ten önce
+(pre_save) çalışır; sonuç aynı INSERT ile yazılır, ikinci bir UPDATE yok.
+
+`expensive = True` işaretli scorer'lar COMMENT_MODERATION_ASYNC açıksa
+request'te çalışmaz: yorum PENDING olarak kaydedilir, commit sonrası
+arka plan thread'inde değerlendirilip sonuç tek UPDATE ile yazılır.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.utils.module_loading import import_string
+
+from . import metrics
+from .counters import adjust_comment_counts
+from .ml import analyze_text
+from .pagecache import comment_count_scopes, invalidate as invalidate_pages
+from .models import Comment, CommentStatus
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCORERS = ["blogs.moderation.LexiconScorer"]
+
+# Karar önceliği: en sert karar kazanır
+_SEVERITY = {CommentStatus.APPROVED: 0, CommentStatus.PENDING: 1, CommentStatus.REJECTED: 2}
+
+
+class Scorer:
+    """
+    score(text) -> dict; anahtarlar opsiyonel:
+    toxicity, sentiment, is_spam, reason, decision ("APPROVED"/"PENDING"/"REJECTED")
+    """
+
+    expensive = False
+
+    def score(self, text):
+        raise NotImplementedError
+
+
+class LexiconScorer(Scorer):
+    """blogs.ml sözlük + spam kuralları (ucuz, her zaman senkron)."""
+
+    def score(self, text):
+        return analyze_text(text)
+
+
+def get_scorers():
+    paths = getattr(settings, "COMMENT_MODERATION_SCORERS", None) or DEFAULT_SCORERS
+    return [import_string(path)() for path in paths]
+
+
+def combine(results):
+    """Birden fazla scorer sonucunu tek karar + skorlar olarak birleştirir."""
+    out = {
+        "toxicity": 0.0,
+        "sentiment": 0.0,
+        "is_spam": False,
+        "reason": "temiz",
+        "status": CommentStatus.APPROVED,
+    }
+    for r in results:
+        out["toxicity"] = max(out["toxicity"], r.get("toxicity", 0.0))
+        if "sentiment" in r:
+            out["sentiment"] = r["sentiment"]
+        out["is_spam"] = out["is_spam"] or r.get("is_spam", False)
+        status = getattr(CommentStatus, r.get("decision", "APPROVED"), CommentStatus.PENDING)
+        if _SEVERITY[status] > _SEVERITY[out["status"]]:
+            out["status"] = status
+            out["reason"] = r.get("reason", "")
+    return out
+
+
+def _apply(comment, result):
+    comment.toxicity = result["toxicity"]
+    comment.sentiment = result["sentiment"]
+    comment.is_spam = result["is_spam"]
+    comment.reason = result["reason"]
+    comment.status = result["status"]
+
+
+def moderate(comment):
+    """
+    pre_save aşaması: senkron scorer'ları çalıştırıp alanları doldurur.
+    Ertelenen (expensive) scorer varsa yorumu PENDING bırakır ve commit
+    sonrası arka plan değerlendirmesini planlar.
+    """
+    text = comment.comment or ""
+    run_async = getattr(settings, "COMMENT_MODERATION_ASYNC", False)
+    scorers = get_scorers()
+    now = [s for s in scorers if not (run_async and s.expensive)]
+    later = [s for s in scorers if run_async and s.expensive]
+
+    results = [s.score(text) for s in now]
+    result = combine(results)
+    if later and result["status"] != CommentStatus.REJECTED:
+        result["status"] = CommentStatus.PENDING
+        result["reason"] = "arka plan moderasyonu bekliyor"
+        paths = [f"{type(s).__module__}.{type(s).__qualname__}" for s in later]
+        # pk INSERT sonrası belli olur; on_commit o zaman çalışır
+        transaction.on_commit(lambda: _executor().submit(_run_background, comment.pk, results, paths))
+    _apply(comment, result)
+    return result
+
+
+_pool = None
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="moderation")
+    return _pool
+
+
+def _finalize(comment_id, sync_results, scorer_paths):
+    """Arka plan: ertelenen scorer'ları çalıştırıp PENDING yorumu sonuçlandırır."""
+    try:
+        comment = (
+            Comment.objects.select_related("blog")
+            .only("comment", "parent_comment_id", "blog__slug", "blog__category")
+            .get(pk=comment_id)
+        )
+        results = list(sync_results) + [import_string(p)().score(comment.comment or "") for p in scorer_paths]
+        result = combine(results)
+        approved = result["status"] == CommentStatus.APPROVED
+        with transaction.atomic():
+            # Bu arada admin karar verdiyse (PENDING değilse) dokunma
+            updated = Comment.objects.filter(pk=comment_id, status=CommentStatus.PENDING).update(**result)
+            if updated and approved:
+                adjust_comment_counts(comment.blog_id, comment.parent_comment_id is None, +1)
+        if updated:
+            metrics.moderation_decisions.inc(stage="background", status=result["status"])
+        if updated and approved:
+            invalidate_pages(*comment_count_scopes(comment.blog.slug, comment.blog.category_id))
+    except Comment.DoesNotExist:
+        pass
+    except Exception:
+        logger.exception("Arka plan moderasyonu başarısız (comment=%s)", comment_id)
+
+
+def _run_background(*args):
+    try:
+        _finalize(*args)
+    finally:
+        # Havuz thread'inin açtığı bağlantıyı bekletme
+        connections.close_all()
@@ -0,0 +1,136 @@
+# blogs/outbox.py
+"""
+Yeni yazı bildirimleri için kalıcı outbox.
+
+Blog kaydı sadece NotificationOutbox satırı ekler (aynı transaction);
+SMTP işi `python manage.py send_outbox` worker'ındadır (Render'da dakikalık
+cron, bkz. render.yaml):
+
+- alıcılar user.id sırasıyla parçalar halinde akar (CHUNK_SIZE),
+- her parça tek SMTP bağlantısı üzerinden, alıcı başına ayrı mesajla gider,
+- her başarılı gönderimden sonra cursor ilerler; worker çökse bile
+  kaldığı yerden devam eder (en fazla o anki tek mesaj tekrarlanabilir),
+- hata halinde üstel geri çekilme ile yeniden denenir.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import metrics
+from .models import NotificationOutbox, OutboxStatus
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 200
+MAX_ATTEMPTS = 6
+BACKOFF_BASE = 60          # saniye; 1, 2, 4, 8... dakika
+BACKOFF_MAX = 6 * 60 * 60
+LEASE = timedelta(minutes=10)
+
+
+def full_url(path: str) -> str:
+    return f"{settings.SITE_DOMAIN.rstrip('/')}{path}"
+
+
+def enqueue_new_post(blog):
+    """Blog post_save'den çağrılır: sadece bir outbox satırı ekler."""
+    post_url = full_url(blog.get_absolute_url())
+    snippet = (getattr(blog, "short_description", "") or "")[:160]
+    return NotificationOutbox.objects.create(
+        blog=blog,
+        subject=f"Yeni Yazı Yayında: {blog.title}",
+        body=f"{snippet}...\nDevamını oku: {post_url}",
+    )
+
+
+def recipients_after(cursor, limit):
+    """(id, email) — aktif, e-postası olan kullanıcılar, id > cursor."""
+    User = get_user_model()
+    return list(
+        User.objects.filter(is_active=True, pk__gt=cursor)
+        .exclude(email__isnull=True)
+        .exclude(email__exact="")
+        .exclude(email__icontains="example.com")
+        .order_by("pk")
+        .values_list("pk", "email")[:limit]
+    )
+
+
+def _claim(job, now):
+    """Kiralama: aynı işi iki worker aynı anda işlemesin (SQLite'ta da çalışır)."""
+    return NotificationOutbox.objects.filter(
+        Q(locked_until__isnull=True) | Q(locked_until__lt=now),
+        pk=job.pk, status=OutboxStatus.PENDING,
+    ).update(locked_until=now + LEASE) == 1
+
+
+def _backoff(attempts):
+    return timedelta(seconds=min(BACKOFF_BASE * 2 ** (attempts - 1), BACKOFF_MAX))
+
+
+def process_job(job, chunk_size=CHUNK_SIZE, connection=None):
+    """Bir outbox işini bitirene ya da hata alana kadar gönderir. Gönderilen mesaj sayısını döner."""
+    sent = 0
+    cursor = job.cursor
+    try:
+        while True:
+            batch = recipients_after(cursor, chunk_size)
+            if not batch:
+                NotificationOutbox.objects.filter(pk=job.pk).update(
+                    status=OutboxStatus.DONE, locked_until=None, last_error=""
+                )
+                return sent
+
+            conn = connection or get_connection(timeout=getattr(settings, "EMAIL_TIMEOUT", None))
+            conn.open()
+            try:
+                for user_id, email in batch:
+                    EmailMessage(
+                        job.subject, job.body, settings.DEFAULT_FROM_EMAIL, [email], connection=conn
+                    ).send(fail_silently=False)
+                    metrics.mail_messages.inc(source="outbox", outcome="sent")
+                    cursor = user_id
+                    sent += 1
+                    # Her başarılı gönderimden sonra ilerle: yeniden başlatmada tekrar yok
+                    NotificationOutbox.objects.filter(pk=job.pk).update(
+                        cursor=cursor, sent_count=F("sent_count") + 1, locked_until=timezone.now() + LEASE
+                    )
+            finally:
+                conn.close()
+    except Exception as exc:
+        metrics.mail_messages.inc(source="outbox", outcome="error")
+        attempts = job.attempts + 1
+        failed = attempts >= MAX_ATTEMPTS
+        logger.warning("Outbox #%s gönderim hatası (deneme %s): %r", job.pk, attempts, exc)
+        NotificationOutbox.objects.filter(pk=job.pk).update(
+            attempts=attempts,
+            status=OutboxStatus.FAILED if failed else OutboxStatus.PENDING,
+            next_attempt_at=timezone.now() + _backoff(attempts),
+            locked_until=None,
+            last_error=repr(exc)[:2000],
+        )
+        return sent
+
+
+def process_outbox(chunk_size=CHUNK_SIZE, limit=None):
+    """Zamanı gelmiş tüm PENDING işleri sırayla işler. (iş sayısı, mesaj sayısı) döner."""
+    now = timezone.now()
+    jobs = NotificationOutbox.objects.filter(
+        status=OutboxStatus.PENDING, next_attempt_at__lte=now
+    ).order_by("next_attempt_at", "pk")
+    if limit:
+        jobs = jobs[:limit]
+
+    done = messages = 0
+    for job in jobs:
+        if not _claim(job, now):
+            continue
+        job.refresh_from_db()
+        messages += process_job(job, chunk_size=chunk_size)
+        done += 1
+    return done, messages
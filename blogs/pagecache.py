@@ -0,0 +1,151 @@
+# blogs/pagecache.py
+"""
+Anonim GET istekleri için tam sayfa önbelleği.
+
+Anahtar = path + query string + sayfanın bağlı olduğu generation
+sayaçları (blogs.cache.get_version). Sayaçlar signals.py'den hassas
+şekilde artırılır:
+
+    page:global        -> her sayfa (kategori adı, sosyal linkler, navbar)
+    page:listing       -> anasayfa (yazı eklendi / düzenlendi / silindi)
+    page:cat:<id>      -> kategori sayfası (aynı şekilde)
+    page:counts[:<id>] -> anasayfa / kategori listelerindeki 💬 sayıları
+                          (onaylı yorum sayısı değişti)
+    page:post:<slug>   -> detay sayfası (onaylı yorum, beğeni, düzenleme)
+
+Sitemap ve feed'ler sadece page:listing / page:cat:<id>'e bağlıdır; yorum
+onayı onları düşürmez.
+
+ETag generation durumunun özetidir; If-None-Match eşleşirse sayfa
+render edilmeden (ve cache'teki gövde okunmadan) 304 döner.
+
+Sayaçlar ve sayfalar default cache'te durur; bu yüzden ancak tüm
+worker'ların paylaştığı bir backend ile açılmalıdır (settings.SHARED_CACHE,
+ANONYMOUS_PAGE_CACHE varsayılanı buna bağlı).
+"""
+import hashlib
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils.cache import patch_vary_headers
+from django.utils.http import http_date, parse_http_date_safe
+
+from .cache import bump_version, get_versions
+
+PAGE_TTL = 10 * 60
+
+GLOBAL = "page:global"
+LISTING = "page:listing"
+
+
+def category_scope(category_id):
+    return f"page:cat:{category_id}"
+
+
+def post_scope(slug):
+    return f"page:post:{slug}"
+
+
+def counts_scope(category_id=None):
+    """Listelerdeki yorum sayıları: anasayfa (None) veya kategori sayfası."""
+    return "page:counts" if category_id is None else f"page:counts:{category_id}"
+
+
+def comment_count_scopes(slug, category_id):
+    """Onaylı yorum sayısı değişti: detay + sayıyı gösteren listeler."""
+    return [counts_scope(), counts_scope(category_id), post_scope(slug)]
+
+
+def invalidate(*scopes):
+    for scope in scopes:
+        bump_version(scope)
+
+
+def _cacheable_request(request):
+    if not getattr(settings, "ANONYMOUS_PAGE_CACHE", False):
+        return False
+    if request.method not in ("GET", "HEAD"):
+        return False
+    # Oturum / flash mesajı olan istekler kişiye özeldir (new_user, messages...)
+    if request.COOKIES.get("sessionid") or request.COOKIES.get("messages"):
+        return False
+    return True
+
+
+def _etag(key):
+    return 'W/"%s"' % hashlib.md5(key.encode()).hexdigest()
+
+
+def anonymous_page_cache(scopes, timeout=PAGE_TTL, on_hit=None):
+    """
+    scopes(request, *args, **kwargs) -> generation adları listesi
+    on_hit(request, meta): cache'ten dönülen isteklerde yan etki (ör. view sayacı);
+    view, response.page_cache_meta ile meta sözlüğü bırakabilir.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapped(request, *args, **kwargs):
+            if not _cacheable_request(request):
+                return view(request, *args, **kwargs)
+
+            names = [GLOBAL] + list(scopes(request, *args, **kwargs))
+            gens = ":".join(str(v) for v in get_versions(names))
+            key = f"page:{request.get_full_path()}:{gens}"
+            etag = _etag(key)
+
+            if etag in request.headers.get("If-None-Match", ""):
+                entry = None
+                if on_hit:
+                    entry = cache.get(key)
+                    if entry:
+                        on_hit(request, entry["meta"])
+                return _not_modified(etag, entry)
+
+            entry = cache.get(key)
+            if entry is None:
+                response = view(request, *args, **kwargs)
+                if (
+                    response.status_code != 200
+                    or response.cookies
+                    or getattr(response, "streaming", False)
+                    or request.user.is_authenticated
+                ):
+                    return response
+                entry = {
+                    "content": response.content,
+                    "content_type": response["Content-Type"],
+                    "last_modified": http_date(),
+                    "meta": getattr(response, "page_cache_meta", {}),
+                }
+                cache.set(key, entry, timeout)
+                response["ETag"] = etag
+                response["Last-Modified"] = entry["last_modified"]
+                patch_vary_headers(response, ["Cookie"])
+                return response
+
+            if on_hit:
+                on_hit(request, entry["meta"])
+
+            since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+            last = parse_http_date_safe(entry["last_modified"])
+            if since and last and last <= since:
+                return _not_modified(etag, entry)
+
+            response = HttpResponse(entry["content"], content_type=entry["content_type"])
+            response["ETag"] = etag
+            response["Last-Modified"] = entry["last_modified"]
+            patch_vary_headers(response, ["Cookie"])
+            return response
+
+        return wrapped
+    return decorator
+
+
+def _not_modified(etag, entry):
+    response = HttpResponseNotModified()
+    response["ETag"] = etag
+    if entry:
+        response["Last-Modified"] = entry["last_modified"]
+    return response
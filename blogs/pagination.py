@@ -0,0 +1,117 @@
+# blogs/pagination.py
+"""
+Keyset (cursor) sayfalama.
+
+Paginator'ın aksine COUNT(*) ve OFFSET yok: sıralama anahtarının son
+değerinden devam edilir, (status, updated_at) / (blog, status, -created_at)
+indeksleri doğrudan kullanılır. 500. sayfa 1. sayfa kadar ucuzdur.
+
+Cursor opak bir stringdir (base64 JSON): [yön, değer, id].
+"""
+import base64
+import json
+from datetime import datetime
+
+from django.db.models import Q
+
+NEXT = "n"
+PREV = "p"
+
+
+def encode_cursor(direction, value, pk):
+    if isinstance(value, datetime):
+        value = value.isoformat()
+    raw = json.dumps([direction, value, pk], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    """Bozuk / elle yazılmış cursor ilk sayfa sayılır (None)."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        direction, value, pk = json.loads(raw)
+        if direction not in (NEXT, PREV):
+            return None
+        return direction, datetime.fromisoformat(value), int(pk)
+    except (ValueError, TypeError):
+        return None
+
+
+class KeysetPage:
+    """Template tarafında Paginator Page'e benzer şekilde kullanılır (sayısız)."""
+
+    def __init__(self, object_list, next_cursor, previous_cursor):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+class KeysetPaginator:
+    """
+    En yeniden eskiye (`-field`, `-id`) sıralı queryset'i sayfalar.
+    field bir tarih alanıdır (updated_at / created_at); eşitlikte id bağlar.
+    """
+
+    def __init__(self, queryset, per_page, field="updated_at"):
+        self.queryset = queryset
+        self.per_page = per_page
+        self.field = field
+
+    def _after(self, value, pk):
+        # (field, id) < (value, pk)
+        return Q(**{f"{self.field}__lt": value}) | Q(**{self.field: value, "pk__lt": pk})
+
+    def _before(self, value, pk):
+        return Q(**{f"{self.field}__gt": value}) | Q(**{self.field: value, "pk__gt": pk})
+
+    def _cursor(self, direction, obj):
+        return encode_cursor(direction, getattr(obj, self.field), obj.pk)
+
+    def get_page(self, cursor=None):
+        state = decode_cursor(cursor)
+        qs = self.queryset
+        n = self.per_page
+
+        if state and state[0] == PREV:
+            # Geri giderken ters sırayla oku, sonra çevir
+            _, value, pk = state
+            rows = list(qs.filter(self._before(value, pk)).order_by(self.field, "pk")[: n + 1])
+            more = len(rows) > n
+            rows = rows[:n][::-1]
+            if not rows:
+                return self.get_page(None)
+            return KeysetPage(
+                rows,
+                next_cursor=self._cursor(NEXT, rows[-1]),
+                previous_cursor=self._cursor(PREV, rows[0]) if more else None,
+            )
+
+        if state:
+            _, value, pk = state
+            qs = qs.filter(self._after(value, pk))
+        rows = list(qs.order_by(f"-{self.field}", "-pk")[: n + 1])
+        more = len(rows) > n
+        rows = rows[:n]
+        return KeysetPage(
+            rows,
+            next_cursor=self._cursor(NEXT, rows[-1]) if more else None,
+            # İlk sayfada geri yok; sonraki sayfalarda en az bir önceki satır vardır
+            previous_cursor=self._cursor(PREV, rows[0]) if state and rows else None,
+        )
@@ -0,0 +1,146 @@
+# blogs/querybudget.py
+"""
+View başına sorgu bütçesi (regresyon testleri için).
+
+Her URL adı için en fazla kaç sorgu ve en fazla kaç *tekrarlanan SQL
+şekli* olabileceği tanımlanır. Şekil: parametreler / sabitler / IN
+listeleri / savepoint adları atılmış SQL; aynı şekil bir istekte birden
+çok kez çalışıyorsa (N+1'in imzası) "tekrarlanan" sayılır. Savepoint
+komutları sorgu sayısına girer, tekrar sayılmaz.
+
+    recorder = QueryRecorder()
+    with recorder:
+        response = client.get(url)
+    problems = recorder.check(Budget(queries=8, duplicates=0))
+    if problems:
+        raise AssertionError(recorder.report("blogs:blogs", problems))
+
+Her sorgu için çağrıldığı template satırı (varsa) ve projedeki en içteki
+çağrı noktaları kaydedilir; rapor tekrarlanan şekilleri bu kökenlerle
+birlikte, ardından tüm sorgu listesini verir.
+"""
+import re
+import sys
+import time
+from collections import Counter, namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connection
+
+Budget = namedtuple("Budget", "queries duplicates", defaults=(0,))
+Query = namedtuple("Query", "sql shape ms template stack")
+
+STACK_DEPTH = 3
+SQL_WIDTH = 160
+
+_SAVEPOINT_RE = re.compile(r'"s\d+_x\d+"')
+_IN_RE = re.compile(r"\bIN \((?:\s*(?:%s|\?|'[^']*'|-?\d+(?:\.\d+)?)\s*,?)+\)", re.IGNORECASE)
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_RE = re.compile(r"(?<![\w\"])-?\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+# İşlem kontrolü (atomic blokları) tekrar sayılmaz
+_TRANSACTION = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def shape(sql):
+    """Parametresiz SQL: aynı sorgunun farklı değerlerle çalışması aynı şekli verir."""
+    sql = _SAVEPOINT_RE.sub('"sp"', sql)
+    sql = _IN_RE.sub("IN (…)", sql)
+    sql = _STRING_RE.sub("?", sql)
+    sql = _NUMBER_RE.sub("?", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+# ---- Köken ----
+_ROOT = str(Path(settings.BASE_DIR).resolve())
+_SKIP = (str(Path(__file__).resolve()), "site-packages", f"{_ROOT}/.venv", f"{_ROOT}/venv")
+_CLIENT = str(Path("django", "test", "client.py"))
+
+
+def _origin(frame):
+    """(en içteki template satırı, projedeki en içteki STACK_DEPTH çağrı noktası)."""
+    template, stack = None, []
+    while frame is not None:
+        code = frame.f_code
+        if code.co_filename.endswith(_CLIENT):
+            break  # dışarısı test sürücüsü
+        if template is None and code.co_name == "render_annotated":
+            node = frame.f_locals.get("self")
+            origin, token = getattr(node, "origin", None), getattr(node, "token", None)
+            if origin is not None and token is not None:
+                template = f"{origin.template_name or origin.name}:{token.lineno}"
+        filename = code.co_filename
+        if len(stack) < STACK_DEPTH and filename.startswith(_ROOT) and not any(s in filename for s in _SKIP):
+            stack.append(f"{filename[len(_ROOT) + 1:]}:{frame.f_lineno} {code.co_name}")
+        frame = frame.f_back
+    return template, tuple(stack)
+
+
+# ---- Kayıt ----
+class QueryRecorder:
+    """connection.execute_wrapper ile bloktaki tüm sorguları köken bilgisiyle toplar."""
+
+    def __init__(self, using=connection):
+        self.connection = using
+        self.queries = []
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        template, stack = _origin(sys._getframe(1))
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            self.queries.append(Query(sql, shape(sql), ms, template, stack))
+
+    def __enter__(self):
+        self.queries = []
+        self._wrapper = self.connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        self._wrapper.__exit__(*exc)
+
+    def duplicates(self):
+        """{şekil: çalışma sayısı} — birden çok kez çalışan şekiller."""
+        counts = Counter(q.shape for q in self.queries if not q.shape.startswith(_TRANSACTION))
+        return {s: n for s, n in counts.items() if n > 1}
+
+    def check(self, budget):
+        """Bütçe aşımlarının okunur listesi (boşsa bütçe içinde)."""
+        problems = []
+        if len(self.queries) > budget.queries:
+            problems.append(f"{len(self.queries)} sorgu (bütçe {budget.queries})")
+        dupes = self.duplicates()
+        if len(dupes) > budget.duplicates:
+            problems.append(f"{len(dupes)} tekrarlanan SQL şekli (bütçe {budget.duplicates})")
+        return problems
+
+    def report(self, title, problems=()):
+        lines = [f"{title}: " + "; ".join(problems or [f"{len(self.queries)} sorgu"])]
+        dupes = self.duplicates()
+        if dupes:
+            lines.append("Tekrarlanan şekiller:")
+            for sql, n in sorted(dupes.items(), key=lambda item: -item[1]):
+                lines.append(f"  {n}× {_clip(sql)}")
+                for where in sorted({_where(q) for q in self.queries if q.shape == sql}):
+                    lines.append(f"       ← {where}")
+        lines.append("Sorgular:")
+        for i, q in enumerate(self.queries, 1):
+            mark = "*" if q.shape in dupes else " "
+            lines.append(f" {mark}{i:3d}. {q.ms:6.2f}ms {_clip(q.sql)}")
+            lines.append(f"        ← {_where(q)}")
+        return "\n".join(lines)
+
+
+def _clip(sql):
+    sql = _SPACE_RE.sub(" ", sql)
+    return sql if len(sql) <= SQL_WIDTH else sql[:SQL_WIDTH - 1] + "…"
+
+
+def _where(query):
+    parts = ([f"[{query.template}]"] if query.template else []) + list(query.stack)
+    return " ← ".join(parts) or "?"
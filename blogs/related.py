@@ -0,0 +1,309 @@
+# blogs/related.py
+"""
+İlgili yazılar: TF-IDF kosinüs benzerliği, önceden hesaplanmış top-K.
+
+Terimler title (x3), short_description (x2) ve blog_body'den
+`search.normalize` ile Türkçe katlanarak (İ/ı, ş, ğ, ...) çıkarılır: sadece
+harflerden oluşan, en az MIN_LEN harfli kelimelerin ilk PREFIX harfi.
+Eklemeli Türkçe için basit ama etkili bir gövdeleme: "yazılım",
+"yazılımlar", "yazılımcı" -> "yazil". Durak kelimeler de önek olarak atılır.
+
+Ağırlık (1 + log tf) * log(N / df); yazı başına en ağır MAX_TERMS terim
+tutulur, L2 normalize edilir. Vektörler PostTerm'de, komşular RelatedPost'ta.
+
+- `rebuild()`: tüm yayındaki yazılar, bellekte. Ters indeksin her posting
+  listesi array('i') / array('d') çiftidir ve terimin en ağır
+  POSTING_LIMIT yazısıyla sınırlıdır (düşük katkılı eşleşmeler atlanır,
+  maliyet yazı sayısıyla doğrusal kalır). Yazma toplu executemany ile;
+  sayfa önbelleği tek GLOBAL sürüm artışıyla düşürülür.
+- `update_post(id)`: tek yazı kaydında; idf son rebuild'in TermStat'ından
+  (+1 yumuşatma), skorlar DB'de tek GROUP BY ile. Sadece bu yazının
+  listesi, onu listesinde tutan yazılar ve yeni skoru listelerine girmeye
+  yeten yazılar yeniden hesaplanır.
+"""
+import heapq
+import logging
+import math
+import re
+from array import array
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from operator import itemgetter
+
+from django.conf import settings
+from django.db import connection, connections, transaction
+from django.db.models import Case, Count, F, FloatField, Min, Sum, Value, When
+
+from .models import Blog, PostTerm, RelatedPost, TermStat
+from .pagecache import GLOBAL, invalidate as invalidate_pages, post_scope
+from .search import normalize
+
+logger = logging.getLogger(__name__)
+
+K = 6
+MAX_TERMS = 20
+POSTING_LIMIT = 256
+PREFIX = 5
+MIN_LEN = 3
+MAX_DF_RATIO = 0.5   # yazıların yarısından fazlasında geçen terim ayırt edici değil
+MIN_SCORE = 0.05
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 2     # blog_body: 1
+WRITE_BATCH = 5_000
+
+# Katlanmış biçimde (ç -> c, ş -> s, ı -> i)
+STOPWORDS = frozenset("""
+    acaba ama ancak artik asla bana bazi belki ben beni benim bile bir biraz birkac birsey biz bize
+    bizim bu buna bunda bundan bunu bunun burada cok cunku daha dahi dan de defa degil diye da
+    eger en gibi hem hep hepsi her hic icin ile ise iste kadar ki kim kimse mi mu nasil ne neden
+    nerede nicin niye olan olarak oldu olsun onlar onu onun sadece sanki sen siz sey sonra su
+    sunu tum ve veya ya yani yine zaten the and for are but not you all any can had her was one
+    our out has him his how its may new now see two who with that this from they have will your
+    what when were been more than then them into also just about which there their would
+""".split())
+STOP_PREFIXES = frozenset(word[:PREFIX] for word in STOPWORDS)
+
+# Harf dışı karakter içermeyen kelimenin öneki (grup), kelimenin tamamı eşleşir
+_PREFIX_RE = re.compile(r"\b([^\W\d_]{%d,%d})[^\W\d_]*\b" % (MIN_LEN, PREFIX))
+
+
+def _prefix_counts(text):
+    # Bölme, sayma ve süzme C'de (regex, Counter, küme kesişimi)
+    counts = Counter(_PREFIX_RE.findall(normalize(text)))
+    for stop in counts.keys() & STOP_PREFIXES:
+        del counts[stop]
+    return counts
+
+
+def terms(title, short_description, blog_body):
+    """Alan ağırlıklı terim (önek) frekansları."""
+    tf = _prefix_counts(blog_body)
+    for text, weight in ((title, TITLE_WEIGHT), (short_description, DESCRIPTION_WEIGHT)):
+        for term, count in _prefix_counts(text).items():
+            tf[term] += weight * count
+    return tf
+
+
+def idf_table(df, n):
+    """{terim: log(N / df)} — tek yazıda geçen ve fazla yaygın terimler hariç."""
+    max_df = max(2, int(MAX_DF_RATIO * n))
+    return {term: math.log(n / count) for term, count in df.items() if 2 <= count <= max_df}
+
+
+def vectorize(tf, idf):
+    """[(terim, ağırlık)] — en ağır MAX_TERMS terim, L2 normalize."""
+    log = math.log
+    weighted = [(term, (1 + log(tf[term])) * idf[term]) for term in tf.keys() & idf.keys()]
+    weighted.sort(key=itemgetter(1), reverse=True)
+    top = [(t, w) for t, w in weighted[:MAX_TERMS] if w > 0]
+    norm = math.sqrt(sum(w * w for _, w in top))
+    return [(t, w / norm) for t, w in top]
+
+
+# ---- Tam yeniden kurulum ----
+def _insert(model, columns, rows):
+    """executemany ile toplu INSERT (ORM nesnesi kurmadan); yazılan satır sayısını döner."""
+    qn = connection.ops.quote_name
+    sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        qn(model._meta.db_table), ", ".join(qn(c) for c in columns), ", ".join(["%s"] * len(columns))
+    )
+    written, batch = 0, []
+    with connection.cursor() as cursor:
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= WRITE_BATCH:
+                cursor.executemany(sql, batch)
+                written, batch = written + len(batch), []
+        if batch:
+            cursor.executemany(sql, batch)
+            written += len(batch)
+    return written
+
+
+def _neighbours(vectors, k):
+    """Her doküman için [(komşu indeksi, skor)] — kırpılmış ters indeksle."""
+    postings = {}
+    for doc, vector in enumerate(vectors):
+        for term, weight in vector:
+            postings.setdefault(term, []).append((weight, doc))
+    index = {}
+    for term, plist in postings.items():
+        if len(plist) < 2:
+            continue
+        if len(plist) > POSTING_LIMIT:
+            plist = heapq.nlargest(POSTING_LIMIT, plist)
+        index[term] = (array("i", [d for _, d in plist]), array("d", [w for w, _ in plist]))
+    del postings
+
+    # Skorlar dict yerine doküman indeksli düz listede birikir (daha ucuz),
+    # dokunulan hücreler her dokümandan sonra sıfırlanır
+    scratch = [0.0] * len(vectors)
+    for doc, vector in enumerate(vectors):
+        touched = set()
+        for term, weight in vector:
+            entry = index.get(term)
+            if entry is None:
+                continue
+            docs, weights = entry
+            touched.update(docs)
+            for other, other_weight in zip(docs, weights):
+                scratch[other] += weight * other_weight
+        touched.discard(doc)
+        best = heapq.nlargest(k, touched, key=scratch.__getitem__)
+        yield [(j, scratch[j]) for j in best if scratch[j] >= MIN_SCORE]
+        for other in touched:
+            scratch[other] = 0.0
+        scratch[doc] = 0.0
+
+
+def rebuild(k=K):
+    """Tüm vektörleri ve komşu listelerini sıfırdan kurar; (yazı, ilişki) sayısını döner."""
+    ids, tfs = array("q"), []
+    rows = Blog.objects.filter(status="Published").values_list("pk", "title", "short_description", "blog_body")
+    for pk, *text in rows.iterator(chunk_size=2_000):
+        ids.append(pk)
+        tfs.append(terms(*text))
+    n = len(ids)
+    df = Counter()
+    for tf in tfs:
+        df.update(tf.keys())
+    idf = idf_table(df, n)
+    vectors = [vectorize(tf, idf) for tf in tfs]
+    del idf
+    del tfs
+
+    related = (
+        (ids[doc], ids[j], score)
+        for doc, best in enumerate(_neighbours(vectors, k))
+        for j, score in best
+    )
+    with transaction.atomic():
+        RelatedPost.objects.all().delete()
+        PostTerm.objects.all().delete()
+        TermStat.objects.all().delete()
+        _insert(TermStat, ["term", "df"], df.items())
+        _insert(PostTerm, ["blog_id", "term", "weight"],
+                ((ids[doc], t, w) for doc, vector in enumerate(vectors) for t, w in vector))
+        links = _insert(RelatedPost, ["source_id", "target_id", "score"], related)
+    # Tüm detay sayfaları etkilenir; sayfa anahtarlarının hepsi GLOBAL sürümü içerir
+    invalidate_pages(GLOBAL)
+    return n, links
+
+
+# ---- Artımlı güncelleme ----
+def _scores(vector, exclude):
+    """{blog_id: kosinüs} (>= MIN_SCORE) — PostTerm üzerinde tek GROUP BY."""
+    if not vector:
+        return {}
+    mine = Case(*[When(term=t, then=Value(w)) for t, w in vector], default=Value(0.0), output_field=FloatField())
+    rows = (
+        PostTerm.objects.filter(term__in=[t for t, _ in vector])
+        .exclude(blog_id=exclude)
+        .values("blog_id")
+        .annotate(score=Sum(F("weight") * mine))
+        .filter(score__gte=MIN_SCORE)
+        .values_list("blog_id", "score")
+    )
+    return dict(rows)
+
+
+def _replace_list(source_id, scores, k):
+    best = heapq.nlargest(k, scores.items(), key=itemgetter(1))
+    RelatedPost.objects.filter(source_id=source_id).delete()
+    RelatedPost.objects.bulk_create(
+        [RelatedPost(source_id=source_id, target_id=target, score=score) for target, score in best]
+    )
+
+
+def _refresh(source_id, k):
+    vector = list(PostTerm.objects.filter(blog_id=source_id).values_list("term", "weight"))
+    _replace_list(source_id, _scores(vector, source_id), k)
+
+
+def update_post(blog_id, referrers=(), k=K):
+    """
+    Tek yazının vektörünü ve etkilenen komşu listelerini günceller.
+    Yazı silinmiş / yayından kalkmışsa izleri temizlenir; referrers silinmeden
+    önce onu listesinde tutan yazılardır (CASCADE sonrası bulunamazlar).
+    """
+    row = (
+        Blog.objects.filter(pk=blog_id, status="Published")
+        .values_list("title", "short_description", "blog_body")
+        .first()
+    )
+    with transaction.atomic():
+        affected = set(referrers)
+        affected.update(RelatedPost.objects.filter(target_id=blog_id).values_list("source_id", flat=True))
+        PostTerm.objects.filter(blog_id=blog_id).delete()
+        RelatedPost.objects.filter(source_id=blog_id).delete()
+        RelatedPost.objects.filter(target_id=blog_id).delete()
+
+        if row is not None:
+            tf = terms(*row)
+            df = Counter(dict(TermStat.objects.filter(term__in=list(tf)).values_list("term", "df")))
+            df.update(tf.keys())  # +1: bu yazı son rebuild'de olmayabilir
+            n = Blog.objects.filter(status="Published").count()
+            vector = vectorize(tf, idf_table(df, max(n, 2)))
+            PostTerm.objects.bulk_create([PostTerm(blog_id=blog_id, term=t, weight=w) for t, w in vector])
+            scores = _scores(vector, blog_id)
+            _replace_list(blog_id, scores, k)
+
+            # Bu yazıyı listesine alabilecekler: listesi dolu değil ya da en düşük skoru geçiliyor
+            lists = dict(
+                (source, (size, low))
+                for source, size, low in RelatedPost.objects.filter(source_id__in=list(scores))
+                .values("source_id")
+                .annotate(size=Count("pk"), low=Min("score"))
+                .values_list("source_id", "size", "low")
+            )
+            affected.update(
+                pk for pk, score in scores.items()
+                if lists.get(pk, (0, 0.0))[0] < k or score > lists[pk][1]
+            )
+
+        affected.discard(blog_id)
+        for source_id in affected:
+            _refresh(source_id, k)
+
+    slugs = Blog.objects.filter(pk__in=affected | {blog_id}).values_list("slug", flat=True)
+    invalidate_pages(*(post_scope(s) for s in slugs))
+    return affected
+
+
+# ---- Arka plan ----
+_pool = None
+
+
+def _executor():
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="related")
+    return _pool
+
+
+def _update_background(blog_id, referrers):
+    try:
+        update_post(blog_id, referrers)
+    except Exception:
+        logger.exception("İlgili yazılar güncellenemedi (blog=%s)", blog_id)
+    finally:
+        connections.close_all()
+
+
+def schedule(blog_id, referrers=()):
+    """Commit sonrası artımlı güncellemeyi arka plana verir (RELATED_POSTS kapalıysa hiçbir şey)."""
+    if not getattr(settings, "RELATED_POSTS", True):
+        return
+    referrers = tuple(referrers)
+    transaction.on_commit(lambda: _executor().submit(_update_background, blog_id, referrers))
+
+
+def related_posts(blog, limit=K):
+    """Detay sayfası için komşu yazılar (tek sorgu)."""
+    return [
+        link.target
+        for link in RelatedPost.objects.filter(source=blog, target__status="Published")
+        .select_related("target")
+        .only("target", "target__title", "target__slug", "target__featured_image", "target__created_at")
+        .order_by("-score")[:limit]
+    ]
@@ -0,0 +1,132 @@
+# blogs/remoderation.py
+"""
+Mevcut yorumları güncel sözlüklerle (blogs/ml.py) yeniden değerlendirme.
+
+- Yorumlar pk üzerinden keyset parçalar halinde okunur (OFFSET yok).
+- Metinler `analyze_text` ile process havuzunda skorlanır; worker'lar
+  DB'ye dokunmaz, sadece (pk, skor) döner. Ana process parçaları sırayla
+  okur, havuzda en fazla 2 * workers parça bekletir.
+- Değişen satırlar parça başına, aynı sonucu alanlar gruplanarak toplu
+  UPDATE ile yazılır (bkz. `_write`); onay durumu değişen yazıların
+  sayaçları aynı transaction'da yeniden hesaplanır, sayfa önbellekleri
+  sonda düşürülür.
+- Admin'in elle verdiği kararlar (ADMIN_REASONS) varsayılan olarak korunur.
+"""
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.db import connections, transaction
+
+from .counters import sync_comment_counts
+from .ml import analyze_text
+from .models import Blog, Comment, CommentStatus
+from .moderation import combine
+from .pagecache import comment_count_scopes, invalidate as invalidate_pages
+
+CHUNK = 2_000
+UPDATE_BATCH = 500
+FIELDS = ("toxicity", "sentiment", "is_spam", "reason", "status")
+ADMIN_APPROVED = "admin onayı"
+ADMIN_REJECTED = "admin reddi"
+ADMIN_REASONS = (ADMIN_APPROVED, ADMIN_REJECTED)
+
+
+def score_texts(rows):
+    """Worker: [(pk, metin)] -> [(pk, analyze_text sonucu)]."""
+    return [(pk, analyze_text(text)) for pk, text in rows]
+
+
+class Report:
+    def __init__(self, sample_size=0):
+        self.scanned = 0
+        self.changed = 0
+        self.transitions = Counter()  # (eski durum, yeni durum) -> adet
+        self.samples = []             # (pk, eski, yeni) — dry-run diff'i için
+        self.sample_size = sample_size
+
+    def add(self, pk, old, new):
+        self.changed += 1
+        self.transitions[old["status"], new["status"]] += 1
+        if len(self.samples) < self.sample_size:
+            self.samples.append((pk, old, new))
+
+
+def _chunks(queryset, chunk_size):
+    """[(pk, metin, blog_id, {eski alanlar})] parçaları; pk > son pk ile devam."""
+    qs = queryset.order_by("pk").values_list("pk", "comment", "blog_id", *FIELDS)
+    last = 0
+    while True:
+        rows = list(qs.filter(pk__gt=last)[:chunk_size])
+        if not rows:
+            return
+        last = rows[-1][0]
+        yield [(pk, text, blog_id, dict(zip(FIELDS, old))) for pk, text, blog_id, *old in rows]
+
+
+def _scored(chunks, workers):
+    """(parça, skorlar) çiftlerini okuma sırasıyla üretir."""
+    if workers <= 1:
+        for chunk in chunks:
+            yield chunk, score_texts([(pk, text) for pk, text, *_ in chunk])
+        return
+
+    # Fork edilen process'ler açık DB bağlantısını paylaşmasın: havuz ilk
+    # parça okunmadan (bağlantı kapalıyken) ayağa kaldırılır
+    connections.close_all()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pool.submit(int).result()
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(score_texts, [(pk, text) for pk, text, *_ in chunk])))
+            if len(pending) >= 2 * workers:
+                chunk, future = pending.popleft()
+                yield chunk, future.result()
+        while pending:
+            chunk, future = pending.popleft()
+            yield chunk, future.result()
+
+
+def _write(groups):
+    """
+    Aynı sonucu alan yorumlar tek UPDATE ... WHERE pk IN (...) ile yazılır.
+    Skorlar az sayıda farklı değer aldığından grup sayısı küçüktür;
+    bulk_update'in satır başına CASE ifadesinden çok daha ucuzdur.
+    """
+    for values, pks in groups.items():
+        for start in range(0, len(pks), UPDATE_BATCH):
+            Comment.objects.filter(pk__in=pks[start:start + UPDATE_BATCH]).update(**dict(zip(FIELDS, values)))
+
+
+def remoderate(queryset, workers=1, chunk_size=CHUNK, dry_run=False, keep_manual=True,
+               sample_size=0, on_chunk=None):
+    """queryset'teki yorumları yeniden skorlar; Report döner. dry_run'da hiçbir şey yazılmaz."""
+    if keep_manual:
+        queryset = queryset.exclude(reason__in=ADMIN_REASONS)
+    report = Report(sample_size)
+    touched = set()  # onay durumu değişen blog id'leri
+
+    for chunk, scores in _scored(_chunks(queryset, chunk_size), workers):
+        report.scanned += len(chunk)
+        groups, blogs = defaultdict(list), set()
+        for (pk, _, blog_id, old), (_, raw) in zip(chunk, scores):
+            new = combine([raw])
+            new["status"] = str(new["status"])  # CommentStatus -> DB değeri (diff / rapor için)
+            if all(new[f] == old[f] for f in FIELDS):
+                continue
+            report.add(pk, old, new)
+            groups[tuple(new[f] for f in FIELDS)].append(pk)
+            if (old["status"] == CommentStatus.APPROVED) != (new["status"] == CommentStatus.APPROVED):
+                blogs.add(blog_id)
+        if groups and not dry_run:
+            with transaction.atomic():
+                _write(groups)
+                if blogs:
+                    sync_comment_counts(blogs)
+            touched |= blogs
+        if on_chunk:
+            on_chunk(report)
+
+    if touched:
+        blogs = Blog.objects.filter(pk__in=touched).values_list("slug", "category_id")
+        invalidate_pages(*{scope for blog in blogs for scope in comment_count_scopes(*blog)})
+    return report
@@ -0,0 +1,312 @@
+# blogs/search.py
+"""
+Tam metin arama backend'leri.
+
+- SQLiteFTSBackend   : FTS5 sanal tablosu (fallback DB + testler)
+- PostgresBackend    : tsvector kolonu + GIN indeks
+- IContainsBackend   : FTS olmayan ortamlar için eski icontains davranışı
+
+İndekse yazılan metin önce `fold()` ile Türkçe kurallarına göre katlanır
+(İ/I, ı, ş, ğ, ç, ö, ü); sorgu da aynı fonksiyondan geçer. Böylece
+"Işık", "ışık", "isik" aynı terime düşer ve sorgu anında tabloyu
+LOWER()/icontains ile taramak gerekmez.
+
+Sadece Published yazılar indekslenir; senkronizasyon signals.py'deki
+Blog post_save / post_delete receiver'ları ile yapılır.
+"""
+import html
+import re
+
+from django.conf import settings
+from django.db import connection
+from django.utils.module_loading import import_string
+
+# ---- Türkçe katlama (karakter başına 1:1, ofsetler korunur) ----
+_FOLD = str.maketrans({
+    "İ": "i", "I": "i", "ı": "i",
+    "Ş": "s", "ş": "s", "Ğ": "g", "ğ": "g",
+    "Ç": "c", "ç": "c", "Ö": "o", "ö": "o", "Ü": "u", "ü": "u",
+    "Â": "a", "â": "a", "Î": "i", "î": "i", "Û": "u", "û": "u",
+})
+_TAG_RE = re.compile(r"<[^>]+>")
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+SNIPPET_CHARS = 160
+
+
+def fold(text):
+    """Türkçe büyük/küçük harf + aksan katlama. Uzunluk değişmez."""
+    text = (text or "").translate(_FOLD)
+    # str.lower() bazı karakterlerde uzunluk değiştirir; onları olduğu gibi bırak
+    return "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+
+
+def strip_tags(text):
+    return _TAG_RE.sub(" ", text or "")
+
+
+def query_terms(keyword):
+    """Kullanıcı girdisinden katlanmış arama terimleri."""
+    return _TERM_RE.findall(fold(keyword))[:10]
+
+
+def snippet(text, terms, size=SNIPPET_CHARS):
+    """
+    Ham metinden, ilk eşleşmenin etrafında `size` karakterlik bir parça keser
+    ve terimle başlayan kelimeleri <mark> ile işaretler (FTS prefix eşleşmesi
+    ile aynı kural). Dönen değer HTML-escape edilmiştir.
+    """
+    raw = " ".join(strip_tags(text).split())
+    folded = fold(raw)
+    pattern = re.compile(r"\b(?:%s)\w*" % "|".join(re.escape(t) for t in terms)) if terms else None
+
+    first = pattern.search(folded) if pattern else None
+    start = max(0, first.start() - size // 3) if first else 0
+    end = min(len(raw), start + size)
+
+    out, pos = [], start
+    if pattern:
+        for m in pattern.finditer(folded, start, end):
+            out.append(html.escape(raw[pos:m.start()]))
+            out.append(f"<mark>{html.escape(raw[m.start():m.end()])}</mark>")
+            pos = m.end()
+    out.append(html.escape(raw[pos:end]))
+    prefix = "… " if start > 0 else ""
+    suffix = " …" if end < len(raw) else ""
+    return prefix + "".join(out) + suffix
+
+
+def normalize(text):
+    """HTML'i atılmış, katlanmış küçük harf metin. fold()'dan hızlı; ofset korumaz."""
+    return strip_tags(text or "").translate(_FOLD).lower()
+
+
+def document(title, short_description, blog_body):
+    """İndekse yazılacak katlanmış (title, short_description, body) üçlüsü."""
+    return fold(title), fold(strip_tags(short_description)), fold(strip_tags(blog_body))
+
+
+# -------------------------------------------------------------------
+# Backend'ler
+# -------------------------------------------------------------------
+class BaseSearchBackend:
+    """
+    search() sıralı (blog_id) listesi ve toplam sonuç sayısı döner;
+    Blog nesnelerinin yüklenmesi ve snippet üretimi SearchResults'ta.
+    """
+
+    def index(self, blog_id, title, short_description, blog_body, conn=None):
+        raise NotImplementedError
+
+    def remove(self, blog_id, conn=None):
+        raise NotImplementedError
+
+    def clear(self, conn=None):
+        raise NotImplementedError
+
+    def count(self, terms):
+        raise NotImplementedError
+
+    def search(self, terms, offset, limit):
+        raise NotImplementedError
+
+    def rebuild(self, rows, conn=None):
+        """rows: (id, title, short_description, blog_body) iterable'ı."""
+        self.clear(conn)
+        n = 0
+        for row in rows:
+            self.index(*row, conn=conn)
+            n += 1
+        return n
+
+
+class SQLiteFTSBackend(BaseSearchBackend):
+    table = "blogs_blog_fts"
+    # bm25 kolon ağırlıkları: title, short_description, blog_body
+    weights = (10.0, 4.0, 1.0)
+
+    def _match(self, terms):
+        # Her terim prefix eşleşmesi; tırnaklar FTS sözdizimini etkisizleştirir
+        return " ".join('"%s"*' % t.replace('"', '""') for t in terms)
+
+    def index(self, blog_id, title, short_description, blog_body, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [blog_id])
+            cur.execute(
+                f"INSERT INTO {self.table} (rowid, title, short_description, blog_body) "
+                f"VALUES (%s, %s, %s, %s)",
+                [blog_id, *document(title, short_description, blog_body)],
+            )
+
+    def remove(self, blog_id, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(f"DELETE FROM {self.table} WHERE rowid = %s", [blog_id])
+
+    def clear(self, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(f"DELETE FROM {self.table}")
+
+    def count(self, terms):
+        with connection.cursor() as cur:
+            cur.execute(
+                f"SELECT COUNT(*) FROM {self.table} WHERE {self.table} MATCH %s",
+                [self._match(terms)],
+            )
+            return cur.fetchone()[0]
+
+    def search(self, terms, offset, limit):
+        w = ", ".join(str(x) for x in self.weights)
+        with connection.cursor() as cur:
+            cur.execute(
+                f"SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s "
+                f"ORDER BY bm25({self.table}, {w}) LIMIT %s OFFSET %s",
+                [self._match(terms), limit, offset],
+            )
+            return [r[0] for r in cur.fetchall()]
+
+
+class PostgresBackend(BaseSearchBackend):
+    table = "blogs_blog_search"
+
+    def _tsquery(self, terms):
+        return " & ".join(f"{t}:*" for t in terms)
+
+    def index(self, blog_id, title, short_description, blog_body, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(
+                f"""
+                INSERT INTO {self.table} (blog_id, document)
+                VALUES (%s,
+                    setweight(to_tsvector('simple', %s), 'A') ||
+                    setweight(to_tsvector('simple', %s), 'B') ||
+                    setweight(to_tsvector('simple', %s), 'C'))
+                ON CONFLICT (blog_id) DO UPDATE SET document = EXCLUDED.document
+                """,
+                [blog_id, *document(title, short_description, blog_body)],
+            )
+
+    def remove(self, blog_id, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(f"DELETE FROM {self.table} WHERE blog_id = %s", [blog_id])
+
+    def clear(self, conn=None):
+        with (conn or connection).cursor() as cur:
+            cur.execute(f"TRUNCATE {self.table}")
+
+    def count(self, terms):
+        with connection.cursor() as cur:
+            cur.execute(
+                f"SELECT COUNT(*) FROM {self.table} "
+                f"WHERE document @@ to_tsquery('simple', %s)",
+                [self._tsquery(terms)],
+            )
+            return cur.fetchone()[0]
+
+    def search(self, terms, offset, limit):
+        with connection.cursor() as cur:
+            cur.execute(
+                f"""
+                SELECT blog_id FROM {self.table}, to_tsquery('simple', %s) q
+                WHERE document @@ q
+                ORDER BY ts_rank_cd(document, q) DESC, blog_id DESC
+                LIMIT %s OFFSET %s
+                """,
+                [self._tsquery(terms), limit, offset],
+            )
+            return [r[0] for r in cur.fetchall()]
+
+
+class IContainsBackend(BaseSearchBackend):
+    """İndeks yok; eski icontains taraması (FTS desteklemeyen DB'ler için)."""
+
+    def index(self, *args, **kwargs):
+        pass
+
+    def remove(self, *args, **kwargs):
+        pass
+
+    def clear(self, *args, **kwargs):
+        pass
+
+    def rebuild(self, rows, conn=None):
+        return 0
+
+    def _qs(self, terms):
+        from django.db.models import Q
+        from .models import Blog
+
+        qs = Blog.objects.filter(status="Published")
+        for t in terms:
+            qs = qs.filter(
+                Q(title__icontains=t) | Q(short_description__icontains=t) | Q(blog_body__icontains=t)
+            )
+        return qs
+
+    def count(self, terms):
+        return self._qs(terms).count()
+
+    def search(self, terms, offset, limit):
+        return list(self._qs(terms).order_by("-updated_at").values_list("pk", flat=True)[offset:offset + limit])
+
+
+VENDOR_BACKENDS = {
+    "sqlite": "blogs.search.SQLiteFTSBackend",
+    "postgresql": "blogs.search.PostgresBackend",
+}
+
+
+def backend_for(conn):
+    path = getattr(settings, "SEARCH_BACKEND", None) or VENDOR_BACKENDS.get(
+        conn.vendor, "blogs.search.IContainsBackend"
+    )
+    return import_string(path)()
+
+
+def get_backend():
+    return backend_for(connection)
+
+
+# -------------------------------------------------------------------
+# Paginator uyumlu sonuç kümesi
+# -------------------------------------------------------------------
+class SearchResults:
+    """
+    Django Paginator'ın beklediği count()/slice arayüzü. Sadece istenen
+    sayfanın id'leri backend'den çekilir, Blog'lar tek sorguda yüklenir
+    ve her birine `snippet` (HTML) eklenir.
+    """
+
+    def __init__(self, keyword, backend=None):
+        self.terms = query_terms(keyword)
+        self.backend = backend or get_backend()
+        self._count = None
+
+    def count(self):
+        if self._count is None:
+            self._count = self.backend.count(self.terms) if self.terms else 0
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, key):
+        if not isinstance(key, slice):
+            raise TypeError("SearchResults sadece slice destekler")
+        from .models import Blog
+
+        if not self.terms:
+            return []
+        offset = key.start or 0
+        limit = (key.stop if key.stop is not None else self.count()) - offset
+        ids = self.backend.search(self.terms, offset, max(limit, 0))
+        by_id = Blog.objects.select_related("author", "category").in_bulk(ids)
+        results = []
+        for pk in ids:
+            post = by_id.get(pk)
+            if post is None or post.status != "Published":
+                continue
+            post.snippet = snippet(
+                " ".join([post.short_description or "", post.blog_body or ""]), self.terms
+            )
+            results.append(post)
+        return results
@@ -1,16 +1,19 @@
 # blogs/signals.py
-from django.db.models.signals import post_save, post_migrate
+from django.db.models.signals import pre_save, post_save, pre_delete, post_delete, post_migrate, m2m_changed
+from django.db.models import QuerySet
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
-from django.core.mail import send_mail
-from django.conf import settings
 
-from .models import Profile, Blog, Comment, CommentStatus
-from .ml import analyze_text  # <<< ML analiz fonksiyonumuz
-
-def full_url(path: str) -> str:
-    return f"{settings.SITE_DOMAIN.rstrip('/')}{path}"
+from assignments.models import SocialLink
 
+from .models import Profile, Blog, Category, Comment, CommentStatus, EventKind, RelatedPost
+from .moderation import moderate  # <<< ML moderasyon pipeline'ı
+from .counters import adjust_comment_counts, adjust_post_count, sync_comment_counts, sync_like_counts
+from .search import get_backend as get_search_backend
+from .outbox import enqueue_new_post
+from .context_processors import categories_cache, social_links_cache
+from . import analytics, metrics, pagecache, related
+from .images import schedule as schedule_image_derivatives
 
 # --- USER PROFILE SYNC (tek receiver yeterli) ---
 @receiver(post_save, sender=get_user_model())
@@ -26,58 +29,252 @@ def create_or_update_user_profile(sender, instance, created, **kwargs):
             Profile.objects.create(user=instance)
 
 
-# --- BLOG YAYINLANDIĞINDA E-POSTA ---
+# --- BLOG YAYINLANDIĞINDA E-POSTA (outbox'a yaz; gönderimi `send_outbox` yapar) ---
 @receiver(post_save, sender=Blog)
-def notify_users_on_new_post(sender, instance, created, **kwargs):
-    # Sadece yeni oluşturulmuş ve Published ise mail at (Draft'ta atmasın)
-    if not created or getattr(instance, "status", "") != "Published":
+def notify_users_on_new_post(sender, instance, created, raw=False, **kwargs):
+    # Sadece yeni oluşturulmuş ve Published ise (Draft'ta atmasın)
+    if raw or not created or getattr(instance, "status", "") != "Published":
         return
+    enqueue_new_post(instance)
 
-    post_url = full_url(instance.get_absolute_url())
-    subject = f"Yeni Yazı Yayında: {instance.title}"
-    snippet = (getattr(instance, "short_description", "") or getattr(instance, "content", "") or "")[:160]
-    message = f"{snippet}...\nDevamını oku: {post_url}"
 
-    User = get_user_model()
-    recipients = list(
-        User.objects.filter(is_active=True)
-        .exclude(email__isnull=True)
-        .exclude(email__exact="")
-        .exclude(email__icontains="example.com")
-        .values_list("email", flat=True)
+# --- ARAMA İNDEKSİ SENKRONU ---
+@receiver(post_save, sender=Blog)
+def update_search_index(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # loaddata: indeks `rebuild_search_index` ile kurulur
+    backend = get_search_backend()
+    if instance.status == "Published":
+        backend.index(instance.pk, instance.title, instance.short_description, instance.blog_body)
+    else:
+        backend.remove(instance.pk)
+
+
+@receiver(post_delete, sender=Blog)
+def remove_from_search_index(sender, instance, **kwargs):
+    get_search_backend().remove(instance.pk)
+
+
+# --- YORUM KAYDEDİLMEDEN ÖNCE OTOMATİK ML MODERASYON ---
+@receiver(pre_save, sender=Comment)
+def auto_moderate_comment(sender, instance: Comment, raw=False, **kwargs):
+    # Sadece yeni yorumda değerlendir; skorlar aynı INSERT ile yazılır
+    if raw or not instance._state.adding:
+        return
+    moderate(instance)
+    metrics.moderation_decisions.inc(stage="sync", status=instance.status)
+
+
+# --- LIKE SAYAÇLARI (admin / .add() / .set() gibi toggle dışı yollar) ---
+@receiver(m2m_changed, sender=Blog.likes.through)
+@receiver(m2m_changed, sender=Comment.likes.through)
+def sync_like_count_on_m2m_change(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    target = Blog if sender is Blog.likes.through else Comment
+    if not reverse:
+        sync_like_counts(target, [instance.pk])
+    elif pk_set:
+        sync_like_counts(target, pk_set)
+    else:
+        # user.liked_posts.clear(): hangi satırların etkilendiği bilinmiyor
+        sync_like_counts(target)
+    # Beğeni sayısı detay sayfasında görünür
+    if not reverse:
+        slugs = [instance.slug if target is Blog else instance.blog.slug]
+    elif pk_set and target is Blog:
+        slugs = Blog.objects.filter(pk__in=pk_set).values_list("slug", flat=True)
+    elif pk_set:
+        slugs = Comment.objects.filter(pk__in=pk_set).values_list("blog__slug", flat=True)
+    else:
+        slugs = []
+    pagecache.invalidate(*{pagecache.post_scope(s) for s in slugs})
+
+
+# --- CONTEXT PROCESSOR ÖNBELLEKLERİ ---
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+def invalidate_categories_cache(sender, **kwargs):
+    categories_cache.invalidate()
+
+
+@receiver(post_save, sender=SocialLink)
+@receiver(post_delete, sender=SocialLink)
+def invalidate_social_links_cache(sender, **kwargs):
+    social_links_cache.invalidate()
+
+
+# --- ÖNCEKİ DURUM (sayaçlar + sayfa önbelleği için) ---
+@receiver(pre_save, sender=Blog)
+def remember_blog_state(sender, instance, raw=False, **kwargs):
+    # (category_id, slug, status): kategori / slug / yayın durumu değişebilir
+    instance._old_state = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    instance._old_state = (
+        Blog.objects.filter(pk=instance.pk).values_list("category_id", "slug", "status").first()
     )
 
-    print("[MAIL DEBUG] FROM=", settings.DEFAULT_FROM_EMAIL,
-          "HOST=", settings.EMAIL_HOST,
-          "PORT=", settings.EMAIL_PORT,
-          "TLS=", settings.EMAIL_USE_TLS,
-          "USER=", settings.EMAIL_HOST_USER,
-          "RECIPIENTS=", recipients)
 
-    if recipients:
-        try:
-            send_mail(subject, message, settings.DEFAULT_FROM_EMAIL, recipients, fail_silently=False)
-            print("[MAIL DEBUG] send_mail OK")
-        except Exception as e:
-            print("[MAIL ERROR]", repr(e))
+@receiver(pre_save, sender=Comment)
+def remember_comment_status(sender, instance, raw=False, **kwargs):
+    instance._old_status = None
+    if raw or instance._state.adding or not instance.pk:
+        return
+    instance._old_status = Comment.objects.filter(pk=instance.pk).values_list("status", flat=True).first()
+
+
+# --- DENORMALİZE SAYAÇLAR (yorum / yazı sayıları) ---
+@receiver(post_save, sender=Comment)
+def update_comment_counts_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # loaddata: `recount` ile onarılır
+    was = getattr(instance, "_old_status", None) == CommentStatus.APPROVED
+    now = instance.status == CommentStatus.APPROVED
+    adjust_comment_counts(instance.blog_id, instance.parent_comment_id is None, int(now) - int(was))
+
+
+def _bulk_cascade(origin):
+    # Blog / Category / User silmesinden CASCADE ile gelen yorumlar: yorum başına
+    # sayaç / önbellek işi gereksiz (yazı ve kullanıcı başına receiver'lar toplu yapar)
+    model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    return model in (Blog, Category, get_user_model())
+
+
+@receiver(post_delete, sender=Comment)
+def update_comment_counts_on_delete(sender, instance, origin=None, **kwargs):
+    if instance.status == CommentStatus.APPROVED and not _bulk_cascade(origin):
+        adjust_comment_counts(instance.blog_id, instance.parent_comment_id is None, -1)
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def update_post_counts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    current = (instance.category_id, instance.status == "Published")
+    if kwargs.get("signal") is post_delete:
+        before, after = current, (None, False)
+    else:
+        old = getattr(instance, "_old_state", None)
+        before = (old[0], old[2] == "Published") if old else (None, False)
+        after = current
+    if before == after:
+        return
+    if before[1]:
+        adjust_post_count(before[0], -1)
+    if after[1]:
+        adjust_post_count(after[0], +1)
+    if before[1] or after[1]:
+        # Navbar'daki kategori sayıları değişti
+        categories_cache.invalidate()
+        pagecache.invalidate(pagecache.GLOBAL)
+
+
+# --- ANONİM SAYFA ÖNBELLEĞİ ---
+@receiver(post_save, sender=Blog)
+@receiver(post_delete, sender=Blog)
+def invalidate_blog_pages(sender, instance, **kwargs):
+    scopes = {pagecache.LISTING, pagecache.category_scope(instance.category_id), pagecache.post_scope(instance.slug)}
+    old = getattr(instance, "_old_state", None)
+    if old:
+        scopes |= {pagecache.category_scope(old[0]), pagecache.post_scope(old[1])}
+    pagecache.invalidate(*scopes)
 
 
-# --- YORUM KAYDEDİLİNCE OTOMATİK ML MODERASYON ---
 @receiver(post_save, sender=Comment)
-def auto_moderate_comment(sender, instance: Comment, created, **kwargs):
-    # Sadece yeni yaratıldığında değerlendir
-    if not created:
+@receiver(post_delete, sender=Comment)
+def invalidate_comment_pages(sender, instance, created=False, origin=None, **kwargs):
+    # Yeni PENDING/REJECTED yorum sayfada görünmez; düzenleme/silme her durumda düşürür
+    if created and instance.status != CommentStatus.APPROVED:
+        return
+    if kwargs.get("signal") is post_delete:
+        if _bulk_cascade(origin):
+            return
+        count_changed = instance.status == CommentStatus.APPROVED
+    else:
+        was = getattr(instance, "_old_status", None) == CommentStatus.APPROVED
+        count_changed = was != (instance.status == CommentStatus.APPROVED)
+    blog = instance.blog
+    if count_changed:
+        # Anasayfa / kategori listeleri yorum sayısını gösteriyor
+        pagecache.invalidate(*pagecache.comment_count_scopes(blog.slug, blog.category_id))
+    else:
+        pagecache.invalidate(pagecache.post_scope(blog.slug))
+
+
+# --- KULLANICI SİLME (yorumları ve altlarındaki cevaplar CASCADE ile gider) ---
+@receiver(pre_delete, sender=get_user_model())
+def remember_commented_blogs(sender, instance, **kwargs):
+    # Kendi yazıları zaten siliniyor; diğer yazılar sonra, yazı başına bir kez düzeltilir
+    instance._commented_blogs = list(
+        Blog.objects.filter(comments__user=instance)
+        .exclude(author=instance)
+        .order_by()
+        .distinct()
+        .values_list("pk", "slug", "category_id")
+    )
+
+
+@receiver(post_delete, sender=get_user_model())
+def sync_commented_blogs(sender, instance, **kwargs):
+    blogs = getattr(instance, "_commented_blogs", ())
+    if not blogs:
         return
+    sync_comment_counts([pk for pk, _, _ in blogs])
+    pagecache.invalidate(*{
+        scope for _, slug, category_id in blogs for scope in pagecache.comment_count_scopes(slug, category_id)
+    })
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_delete, sender=Category)
+@receiver(post_save, sender=SocialLink)
+@receiver(post_delete, sender=SocialLink)
+def invalidate_all_pages(sender, **kwargs):
+    # Navbar / footer her sayfada
+    pagecache.invalidate(pagecache.GLOBAL)
+
+
+# --- ANALİTİK OLAYLARI ---
+@receiver(post_save, sender=Comment)
+def record_comment_event(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        analytics.record(EventKind.COMMENT, instance.blog_id, instance.user_id)
+
+
+# --- RESPONSIVE GÖRSEL TÜREVLERİ (commit sonrası arka planda) ---
+IMAGE_FIELDS = {Blog: ("featured_image",), Comment: ("image",), Profile: ("avatar", "cover")}
+
+
+@receiver(post_save, sender=Blog)
+@receiver(post_save, sender=Comment)
+@receiver(post_save, sender=Profile)
+def build_image_derivatives(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # mevcut dosyalar: `build_image_derivatives` komutu
+    schedule_image_derivatives(*(getattr(instance, f).name for f in IMAGE_FIELDS[sender]))
+
+
+# --- İLGİLİ YAZILAR (commit sonrası arka planda, artımlı) ---
+@receiver(post_save, sender=Blog)
+def update_related_posts(sender, instance, raw=False, **kwargs):
+    if raw:
+        return  # loaddata / import: `rebuild_related_posts` ile kurulur
+    related.schedule(instance.pk)
+
+
+@receiver(pre_delete, sender=Blog)
+def remember_related_referrers(sender, instance, **kwargs):
+    # CASCADE RelatedPost satırlarını siler; listeleri boşalan yazıları önceden not et
+    instance._related_referrers = list(
+        RelatedPost.objects.filter(target=instance).values_list("source_id", flat=True)
+    )
 
-    result = analyze_text(instance.comment or "")
-    instance.toxicity = result["toxicity"]
-    instance.sentiment = result["sentiment"]
-    instance.is_spam = result["is_spam"]
-    instance.reason = result["reason"]
-    instance.status = getattr(CommentStatus, result["decision"], CommentStatus.PENDING)
 
-    # Sinyali yeniden tetiklememek için alan bazlı kayıt
-    instance.save(update_fields=["toxicity", "sentiment", "is_spam", "reason", "status"])
+@receiver(post_delete, sender=Blog)
+def update_related_after_delete(sender, instance, **kwargs):
+    related.schedule(instance.pk, getattr(instance, "_related_referrers", ()))
 
 
 # --- PROD İÇİN TEK SEFERLİK SUPERUSER OLUŞTURMA (ENV bayraklı) ---
@@ -1,15 +1,131 @@
-from django.contrib.sitemaps import Sitemap
+# blogs/sitemaps.py
+"""
+Parçalı (shard'lı) sitemap.
+
+/sitemap.xml                -> sitemap index
+/sitemap-blogs-<n>.xml      -> n. parça: pk aralığı [n*SHARD_SIZE, (n+1)*SHARD_SIZE)
+
+pk aralığıyla bölmek her parçanın en fazla SHARD_SIZE URL içermesini
+garanti eder ve parça sınırlarını sabit tutar (OFFSET yok). Sadece
+slug / updated_at okunur, XML parça parça stream edilir.
+
+Çıktı Blog generation'ına (pagecache.LISTING; her Blog kaydı/silmesi
+artırır) bağlı olarak cache'lenir. Parça gövdesi üretilirken zlib ile
+sıkıştırılıp saklanır; cache'ten servis de açılarak stream edilir.
+"""
+import zlib
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F, Max
+from django.http import Http404, StreamingHttpResponse
+from django.urls import reverse
+
+from .cache import get_version
 from .models import Blog
+from .pagecache import LISTING
+
+SHARD_SIZE = 50_000
+CHUNK = 2_000        # DB iterator / stream parça boyutu
+CACHE_TTL = 24 * 60 * 60
+
+XML_HEAD = '<?xml version="1.0" encoding="UTF-8"?>\n'
+URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+INDEX_OPEN = '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+
+
+def _published():
+    return Blog.objects.filter(status="Published")
+
+
+def _base_url(request):
+    return settings.SITE_DOMAIN or f"{request.scheme}://{request.get_host()}"
+
+
+def _cache_key(request, name):
+    return f"sitemap:{name}:{request.get_host()}:{get_version(LISTING)}"
+
+
+def shard_summary():
+    """[(shard no, en yeni updated_at)] — tek GROUP BY sorgusu; boş parçalar yok."""
+    return list(
+        _published()
+        .annotate(shard=F("pk") / SHARD_SIZE)
+        .order_by("shard")
+        .values("shard")
+        .annotate(lastmod=Max("updated_at"))
+        .values_list("shard", "lastmod")
+    )
+
+
+def _stream_cached(blob):
+    inflater = zlib.decompressobj()
+    for start in range(0, len(blob), 64 * 1024):
+        yield inflater.decompress(blob[start:start + 64 * 1024])
+    yield inflater.flush()
+
+
+def _stream_and_cache(key, chunks):
+    """chunks'ı (str) stream eder; sonunda sıkıştırılmış kopyasını cache'e yazar."""
+    deflater = zlib.compressobj(6)
+    packed = []
+    for chunk in chunks:
+        data = chunk.encode()
+        packed.append(deflater.compress(data))
+        yield data
+    packed.append(deflater.flush())
+    cache.set(key, b"".join(packed), CACHE_TTL)
+
+
+def _response(key, blob, build):
+    body = _stream_cached(blob) if blob is not None else _stream_and_cache(key, build())
+    return StreamingHttpResponse(body, content_type="application/xml; charset=utf-8")
+
+
+def index(request):
+    base = _base_url(request)
+
+    def build():
+        yield XML_HEAD + INDEX_OPEN
+        for shard, lastmod in shard_summary():
+            yield (
+                f"<sitemap><loc>{escape(base)}/sitemap-blogs-{shard}.xml</loc>"
+                f"<lastmod>{lastmod.date().isoformat()}</lastmod></sitemap>\n"
+            )
+        yield "</sitemapindex>\n"
+
+    key = _cache_key(request, "index")
+    return _response(key, cache.get(key), build)
 
-class BlogSitemap(Sitemap):
-    changefreq = "weekly"
-    priority = 0.7
 
-    def items(self):
-        return Blog.objects.filter(is_published=True).order_by("-updated_at")   
+def shard(request, shard):
+    lo = shard * SHARD_SIZE
+    rows = (
+        _published()
+        .filter(pk__gte=lo, pk__lt=lo + SHARD_SIZE)
+        .order_by("pk")
+        .values_list("slug", "updated_at")
+    )
+    key = _cache_key(request, f"blogs-{shard}")
+    blob = cache.get(key)
+    if blob is None and not rows.exists():
+        raise Http404("Sitemap parçası yok")
+    # reverse() satır başına değil bir kez: slug yer tutucusu ile şablon
+    pattern = escape(_base_url(request) + reverse("blogs:blogs", kwargs={"slug": "__slug__"}))
 
-    def lastmod(self, obj: Blog):
-        return getattr(obj, "updated_at", None)
+    def build():
+        yield XML_HEAD + URLSET_OPEN
+        buf = []
+        for slug, updated_at in rows.iterator(chunk_size=CHUNK):
+            buf.append(
+                f"<url><loc>{pattern.replace('__slug__', escape(slug))}</loc>"
+                f"<lastmod>{updated_at.date().isoformat()}</lastmod>"
+                "<changefreq>weekly</changefreq><priority>0.7</priority></url>\n"
+            )
+            if len(buf) >= CHUNK:
+                yield "".join(buf)
+                buf = []
+        yield "".join(buf) + "</urlset>\n"
 
-    def location(self, obj: Blog):
-        return obj.get_absolute_url()
+    return _response(key, blob, build)
@@ -0,0 +1,88 @@
+# blogs/slugs.py
+"""
+Tekil slug tahsisi.
+
+Başlığın slug'ı (`base`) ve çakışanları (`base-2`, `base-3`, ...) tek bir
+önek sorgusuyla (slug LIKE 'base%') okunur, ilk boş sonek bellekte seçilir.
+Eşzamanlı iki kayıt aynı slug'ı seçerse unique kısıtı yakalar;
+`Blog.save` bu durumda yeniden tahsis edip tekrar dener.
+
+`assign_slugs` bulk_create öncesi bir nesne listesine aynı işi yapar:
+base'ler OR'lanmış önek sorgularıyla birlikte okunur, liste içi
+çakışmalar da bellekte çözülür.
+"""
+from django.db.models import Q
+from django.utils.text import slugify
+
+BASE_LENGTH = 50
+FALLBACK = "yazi"
+SAVE_RETRIES = 5
+QUERY_CHUNK = 200  # OR'lanan önek sayısı (SQLite ifade derinliği sınırı)
+
+
+def slug_base(title):
+    return slugify(title)[:BASE_LENGTH] or FALLBACK
+
+
+def _candidates(slug):
+    """(base, sonek) adayları: `a-2` hem `a`nın 2. hem `a-2`nin 1. sonekidir."""
+    yield slug, 1
+    head, _, tail = slug.rpartition("-")
+    if head and tail.isdigit():
+        yield head, int(tail)
+
+
+def _mark(taken, slug):
+    for base, n in _candidates(slug):
+        if base in taken:
+            taken[base].add(n)
+
+
+def _taken(queryset, bases):
+    """{base: {kullanılan sonekler}} — QUERY_CHUNK base başına bir önek sorgusu."""
+    taken = {base: set() for base in bases}
+    names = list(taken)
+    for start in range(0, len(names), QUERY_CHUNK):
+        prefix = Q()
+        for base in names[start:start + QUERY_CHUNK]:
+            prefix |= Q(slug__startswith=base)
+        for slug in queryset.filter(prefix).values_list("slug", flat=True).iterator():
+            _mark(taken, slug)
+    return taken
+
+
+def _next_free(base, used):
+    n = 1
+    while n in used:
+        n += 1
+    used.add(n)
+    return base if n == 1 else f"{base}-{n}"
+
+
+def allocate_slug(model, title, exclude_pk=None):
+    base = slug_base(title)
+    qs = model._default_manager.all()
+    if exclude_pk is not None:
+        qs = qs.exclude(pk=exclude_pk)
+    return _next_free(base, _taken(qs, [base])[base])
+
+
+def assign_slugs(objs):
+    """
+    Slug'ı boş nesnelere (bulk_create öncesi) tekil slug atar.
+    Liste içinde aynı başlıklar da farklı sonek alır. Nesneleri döner.
+    """
+    pending = [obj for obj in objs if not obj.slug]
+    if not pending:
+        return objs
+    model = type(pending[0])
+    bases = {id(obj): slug_base(obj.title) for obj in pending}
+    taken = _taken(model._default_manager.all(), set(bases.values()))
+    # Listede elle verilmiş slug'lar da dolu sayılır
+    for obj in objs:
+        if obj.slug:
+            _mark(taken, obj.slug)
+    for obj in pending:
+        base = bases[id(obj)]
+        obj.slug = _next_free(base, taken[base])
+    return objs
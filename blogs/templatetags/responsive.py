@@ -0,0 +1,63 @@
+# blogs/templatetags/responsive.py
+"""
+Responsive görsel tag'leri (türevler: blogs/images.py).
+
+    {% load responsive %}
+    {% responsive_img post.featured_image alt=post.title sizes="(max-width: 820px) 100vw, 820px" class="img-fluid" %}
+    <img src="{{ img.url }}" srcset="{% srcset img 'jpg' %}">
+    style="background-image:url('{% image_url post.featured_image 1280 %}')"
+
+Türev henüz yoksa orijinal dosyaya düşer.
+"""
+from django import template
+from django.utils.html import format_html, format_html_join
+
+from ..images import derivative_info
+
+register = template.Library()
+
+
+def _entries(image, ext):
+    if not image:
+        return []
+    width, files = derivative_info(image.name)
+    named = sorted((int(w), name) for w, name in files.get(ext, {}).items())
+    entries = [(image.storage.url(name), w) for w, name in named]
+    if entries and width and ext == "jpg":
+        entries.append((image.url, width))  # en büyük aday: orijinal
+    return entries
+
+
+def _srcset(entries):
+    return ", ".join(f"{url} {w}w" for url, w in entries)
+
+
+@register.simple_tag
+def srcset(image, ext="jpg"):
+    return _srcset(_entries(image, ext))
+
+
+@register.simple_tag
+def image_url(image, width):
+    """width'i karşılayan en küçük türevin (JPEG) URL'i; yoksa orijinal."""
+    if not image:
+        return ""
+    for url, w in _entries(image, "jpg"):
+        if w >= int(width):
+            return url
+    return image.url
+
+
+@register.simple_tag
+def responsive_img(image, alt="", sizes="100vw", **attrs):
+    if not image:
+        return ""
+    jpg = _entries(image, "jpg")
+    extra = format_html_join("", ' {}="{}"', attrs.items())
+    if not jpg:
+        return format_html('<img src="{}" alt="{}" loading="lazy" decoding="async"{}>', image.url, alt, extra)
+    return format_html(
+        '<picture><source type="image/webp" srcset="{}" sizes="{}">'
+        '<img src="{}" srcset="{}" sizes="{}" alt="{}" loading="lazy" decoding="async"{}></picture>',
+        _srcset(_entries(image, "webp")), sizes, image.url, _srcset(jpg), sizes, alt, extra,
+    )
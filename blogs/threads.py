@@ -0,0 +1,40 @@
+# blogs/threads.py
+from .models import Comment, CommentStatus
+
+
+def attach_threads(roots, status=CommentStatus.APPROVED):
+    """
+    Bir sayfa kök yorumun altındaki TÜM cevapları (derinlik sınırsız) tek
+    sorguda çeker ve her düğüme `children` listesi olarak bağlar.
+
+    path sıralaması ebeveyni her zaman çocuklarından önce getirir (ebeveynin
+    path'i çocuğunkinin ön ekidir), bu yüzden ağaç tek geçişte kurulur.
+    Ebeveyni görünmeyen (ör. onaysız) cevaplar alt ağaçlarıyla birlikte düşer.
+    """
+    roots = list(roots)
+    nodes = {}
+    for c in roots:
+        c.children = []
+        nodes[c.pk] = c
+    if not roots:
+        return roots
+
+    replies = Comment.objects.filter(root_id__in=list(nodes)).select_related("user")
+    if status is not None:
+        replies = replies.filter(status=status)
+
+    for c in replies.order_by("path", "created_at"):
+        parent = nodes.get(c.parent_comment_id)
+        if parent is None:
+            continue
+        c.children = []
+        parent.children.append(c)
+        nodes[c.pk] = c
+    return roots
+
+
+def walk(roots):
+    """attach_threads ağacındaki tüm düğümler (önce ebeveyn)."""
+    for c in roots:
+        yield c
+        yield from walk(getattr(c, "children", ()))
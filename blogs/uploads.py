@@ -0,0 +1,125 @@
+# blogs/uploads.py
+"""
+Güvenli görsel yükleme (yorum görselleri, avatar).
+
+Tarayıcının bildirdiği content_type / uzantıya güvenilmez:
+
+1. boyut sınırı (bayt),
+2. biçim, dosyanın ilk baytlarından (magic number) tespit edilir,
+3. piksel sayısı header'dan okunur; sınırı aşan dosya decode edilmeden
+   reddedilir (decompression bomb). JPEG'ler draft() ile ölçekli decode
+   edilir, bellek hedef boyutla orantılıdır; ölçekli decode edilemeyen
+   biçimler (PNG/WebP/GIF, animasyonlar) tam boyutta açıldığı için
+   çok daha düşük MAX_DECODE_PIXELS ile sınırlanır,
+4. görsel yeniden encode edilir: EXIF / XMP / GPS vb. metadata düşer,
+   oryantasyon piksellere uygulanır, MAX_SIDE'dan büyükse küçültülür.
+   Animasyonlar da kare kare yeniden yazılır.
+
+Hata durumunda `code`'u views'taki JSON hata kodlarıyla aynı olan
+ValidationError fırlatır.
+"""
+import io
+import posixpath
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps, ImageSequence
+
+MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
+MAX_PIXELS = 40_000_000           # ~40 MP; üstü decode edilmez (JPEG, draft ile)
+MAX_DECODE_PIXELS = 12_000_000    # tam decode edilen biçimler; RGBA'da ~48 MB
+MAX_SIDE = 2048                   # saklanan en uzun kenar
+HEADER_BYTES = 16
+
+# biçim -> (uzantı, kayıt seçenekleri)
+FORMATS = {
+    "JPEG": ("jpg", {"quality": 85, "optimize": True, "progressive": True}),
+    "PNG": ("png", {"optimize": True}),
+    "WEBP": ("webp", {"quality": 85}),
+    "GIF": ("gif", {}),
+}
+
+
+def sniff(fileobj):
+    """Header baytlarından biçim adı (JPEG/PNG/GIF/WEBP) ya da None; konumu geri alır."""
+    pos = fileobj.tell()
+    head = fileobj.read(HEADER_BYTES)
+    fileobj.seek(pos)
+    if head.startswith(b"\xff\xd8\xff"):
+        return "JPEG"
+    if head.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "PNG"
+    if head[:6] in (b"GIF87a", b"GIF89a"):
+        return "GIF"
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "WEBP"
+    return None
+
+
+def _reencode_animation(img, fmt, max_side, options):
+    """Animasyonlu GIF/WebP'yi kare kare yeniden yazar; EXIF/XMP/yorum taşınmaz."""
+    frames, durations = [], []
+    for frame in ImageSequence.Iterator(img):
+        durations.append(frame.info.get("duration", 100))
+        frame = frame.convert("RGBA")
+        frame.thumbnail((max_side, max_side), Image.LANCZOS)
+        frame.info = {}
+        frames.append(frame)
+    out = io.BytesIO()
+    frames[0].save(
+        out, fmt, save_all=True, append_images=frames[1:], duration=durations,
+        loop=img.info.get("loop", 0), **options,
+    )
+    return out.getvalue()
+
+
+def ingest_image(upload, max_bytes=MAX_IMAGE_SIZE, max_pixels=MAX_PIXELS, max_side=MAX_SIDE,
+                 max_decode_pixels=MAX_DECODE_PIXELS):
+    """UploadedFile -> storage'a yazılmaya hazır, temizlenmiş ContentFile."""
+    if upload.size > max_bytes:
+        raise ValidationError(f"Görsel en fazla {max_bytes // (1024 * 1024)} MB olmalı.", code="too_large")
+
+    upload.seek(0)
+    fmt = sniff(upload)
+    if fmt is None:
+        raise ValidationError("Desteklenmeyen görsel türü.", code="bad_image_type")
+
+    try:
+        img = Image.open(upload)  # lazy: sadece header okunur
+        width, height = img.size
+        frames = getattr(img, "n_frames", 1)
+    except (OSError, SyntaxError, Image.DecompressionBombError):
+        raise ValidationError("Görsel okunamadı.", code="bad_image_type")
+    if img.format != fmt:
+        raise ValidationError("Dosya içeriği uzantısıyla uyuşmuyor.", code="bad_image_type")
+    if fmt != "JPEG" or frames > 1:
+        max_pixels = min(max_pixels, max_decode_pixels)  # küçültülmüş decode yok
+    if width * height * frames > max_pixels:
+        raise ValidationError("Görsel çözünürlüğü çok yüksek.", code="too_many_pixels")
+
+    ext, options = FORMATS[fmt]
+    stem = posixpath.splitext(posixpath.basename(upload.name or "image"))[0] or "image"
+    name = f"{stem}.{ext}"
+
+    if frames > 1:
+        # Piksel bütçesi yukarıda tüm karelerle kontrol edildi
+        try:
+            return ContentFile(_reencode_animation(img, fmt, max_side, options), name=name)
+        except (OSError, SyntaxError, ValueError, EOFError, Image.DecompressionBombError):
+            raise ValidationError("Görsel okunamadı.", code="bad_image_type")
+
+    try:
+        if fmt == "JPEG":
+            img.draft(img.mode, (max_side, max_side))
+        img = ImageOps.exif_transpose(img)  # yüklemeyi de yapar
+        img.thumbnail((max_side, max_side), Image.LANCZOS)
+    except (OSError, SyntaxError, ValueError, Image.DecompressionBombError):
+        raise ValidationError("Görsel okunamadı.", code="bad_image_type")
+
+    if fmt == "JPEG" and img.mode not in ("RGB", "L", "CMYK"):
+        img = img.convert("RGB")
+
+    out = io.BytesIO()
+    # exif verilmez: metadata yeni dosyaya taşınmaz; renk profili korunur
+    img.save(out, fmt, icc_profile=img.info.get("icc_profile"), **options)
+    return ContentFile(out.getvalue(), name=name)
@@ -1,16 +1,22 @@
 from django.urls import path
-from . import views
+from . import feeds, views
 
 app_name = "blogs"
 
 urlpatterns = [
     path("category/<int:category_id>/", views.posts_by_category, name="posts_by_category"),
+    path("category/<int:category_id>/feed/rss/", feeds.category_rss, name="category_feed_rss"),
+    path("category/<int:category_id>/feed/atom/", feeds.category_atom, name="category_feed_atom"),
+    path("feed/rss/", feeds.latest_rss, name="feed_rss"),
+    path("feed/atom/", feeds.latest_atom, name="feed_atom"),
     path("comment/<int:comment_id>/like/", views.like_comment, name="like_comment"),
     path("<slug:slug>/like/", views.like_post, name="like_post"),
     path("<slug:slug>/save/", views.toggle_save_post, name="toggle_save_post"),
+    # "profile/<username>/" bu path'i yutmasın diye önce
+    path("profile/edit/", views.profile_edit_me, name="profile_edit_me"),
     path("profile/<str:username>/", views.profile_view, name="profile"),
     path("profile/<str:username>/edit/", views.profile_edit, name="profile_edit"),
-    path("profile/edit/", views.profile_edit_me, name="profile_edit_me"),
+    path("profile/<str:username>/tabs/<str:tab>/", views.profile_tab, name="profile_tab"),
     path("search/", views.search, name="search"),
     path("about/", views.about, name="about"),
     path("privacy-policy/", views.privacy_policy, name="privacy"),
@@ -0,0 +1,126 @@
+# blogs/viewcounts.py
+"""
+Write-behind görüntülenme sayacı.
+
+Detay sayfası her istekte Blog satırına UPDATE atmak yerine artışı
+process içi, shard'lı bir tampona yazar. Tampon arka plan thread'i ile
+her VIEW_COUNT_FLUSH_INTERVAL saniyede (ve process kapanırken) tek
+UPDATE ... CASE ile toplu olarak veritabanına yazılır. Worker çökerse
+en fazla bir flush aralığı kadar artış kaybolur.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Case, F, PositiveIntegerField, Value, When
+
+logger = logging.getLogger(__name__)
+
+SHARDS = 16
+FLUSH_BATCH = 500  # tek UPDATE'teki en fazla CASE kolu
+
+
+class ViewCountBuffer:
+    """Blog id -> bekleyen artış; her shard kendi kilidiyle korunur."""
+
+    def __init__(self, shards=SHARDS):
+        self._shards = [(threading.Lock(), Counter()) for _ in range(shards)]
+        self._flusher = None
+        self._flusher_lock = threading.Lock()
+
+    def _shard(self, blog_id):
+        return self._shards[blog_id % len(self._shards)]
+
+    def incr(self, blog_id, n=1):
+        lock, counts = self._shard(blog_id)
+        with lock:
+            counts[blog_id] += n
+        self._ensure_flusher()
+
+    def pending(self, blog_id):
+        lock, counts = self._shard(blog_id)
+        with lock:
+            return counts.get(blog_id, 0)
+
+    def drain(self):
+        """Tüm shard'ları boşaltıp birleşik sayacı döner."""
+        drained = Counter()
+        for lock, counts in self._shards:
+            with lock:
+                drained.update(counts)
+                counts.clear()
+        return drained
+
+    def flush(self):
+        """Bekleyen artışları DB'ye yazar; yazılan blog sayısını döner."""
+        from .analytics import record_views
+        from .models import Blog
+
+        drained = self.drain()
+        if not drained:
+            return 0
+
+        items = list(drained.items())
+        written = 0
+        for start in range(0, len(items), FLUSH_BATCH):
+            chunk = items[start:start + FLUSH_BATCH]
+            delta = Case(
+                *[When(pk=pk, then=Value(n)) for pk, n in chunk],
+                default=Value(0),
+                output_field=PositiveIntegerField(),
+            )
+            try:
+                with transaction.atomic():
+                    Blog.objects.filter(pk__in=[pk for pk, _ in chunk]).update(
+                        view_count=F("view_count") + delta
+                    )
+                    # Analitik: blog başına tek view olayı (aralıktaki toplam)
+                    record_views(dict(chunk))
+                written += len(chunk)
+            except Exception:
+                logger.exception("View count flush başarısız; artışlar tampona geri alındı")
+                for pk, n in items[start:]:
+                    self.incr(pk, n)
+                break
+        return written
+
+    # ---- arka plan flush ----
+    def _ensure_flusher(self):
+        if self._flusher is not None:
+            return
+        interval = getattr(settings, "VIEW_COUNT_FLUSH_INTERVAL", 30)
+        if not interval:
+            return  # 0 => otomatik flush kapalı (testler / manuel flush)
+        with self._flusher_lock:
+            if self._flusher is None:
+                self._flusher = threading.Thread(
+                    target=self._run, args=(interval,), name="viewcount-flusher", daemon=True
+                )
+                self._flusher.start()
+
+    def _run(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self.flush()
+            finally:
+                # Bu thread'in açtığı bağlantıyı bekletme
+                connections.close_all()
+
+
+buffer = ViewCountBuffer()
+atexit.register(buffer.flush)
+
+
+def record_view(blog):
+    """Detay sayfası okuması: DB'ye yazmaz, sadece tamponu artırır."""
+    buffer.incr(blog.pk)
+
+
+def displayed_view_count(blog):
+    """Kalıcı değer + bu process'te henüz flush edilmemiş artış."""
+    return blog.view_count + buffer.pending(blog.pk)
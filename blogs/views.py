@@ -3,9 +3,11 @@ from django.contrib import messages
 import logging
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
-from django.db.models import Q, F, Prefetch
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseRedirect, JsonResponse
+from django.core.exceptions import ValidationError
+from django.db import transaction
 from django.shortcuts import get_object_or_404, redirect, render
+from django.template.loader import render_to_string
 from django.urls import reverse
 from django.utils import timezone
 from django.utils.timesince import timesince
@@ -17,15 +19,20 @@ import os
 logger = logging.getLogger(__name__)
 # Modeller ve formlar
 from .models import (
-    Profile, Blog, Category, Comment, ContactMessage, StaticPage, SavedPost, CommentStatus
+    Profile, Blog, Category, Comment, ContactMessage, StaticPage, SavedPost, CommentStatus, EventKind
 )
 from .forms import ProfileForm
 from .forms import CommentForm  # yorum formu
-
-
-# ---- Yorum görseli için basit validasyon sabitleri ----
-ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/webp", "image/gif"}
-MAX_IMAGE_SIZE = 5 * 1024 * 1024  # 5 MB
+from . import analytics, images, metrics
+from .counters import profile_stat_annotations, toggle_like
+from .viewcounts import record_view, displayed_view_count
+from .search import SearchResults
+from .related import related_posts
+from .threads import attach_threads, walk as walk_threads
+from .uploads import ingest_image
+from .pagination import KeysetPaginator
+from .pagecache import anonymous_page_cache, category_scope, counts_scope, post_scope, invalidate as invalidate_pages
+from .viewcounts import buffer as view_buffer
 
 
 def _comment_json(c, parent_id=None):
@@ -37,7 +44,7 @@ def _comment_json(c, parent_id=None):
         "comment": c.comment,
         "created": f"{timesince(c.created_at)} ago",
         "parent_id": parent_id,
-        "like_count": c.likes.count(),
+        "like_count": c.like_count,
         "status": c.status,
         "reason": c.reason,
         "image_url": (c.image.url if getattr(c, "image", None) else None),
@@ -47,27 +54,34 @@ def _comment_json(c, parent_id=None):
 # -----------------------
 # LİSTELEME / KATEGORİ
 # -----------------------
+@anonymous_page_cache(lambda request, category_id: [category_scope(category_id), counts_scope(category_id)])
 def posts_by_category(request, category_id):
     category = get_object_or_404(Category, pk=category_id)
-    posts = Blog.objects.filter(status="Published", category=category).order_by("-updated_at")
-    return render(request, "posts_by_category.html", {"posts": posts, "category": category})
+    posts_qs = Blog.objects.filter(status="Published", category=category).select_related("author")
+    page_obj = KeysetPaginator(posts_qs, 10).get_page(request.GET.get("cursor"))
+    return render(request, "posts_by_category.html", {"posts": page_obj, "page_obj": page_obj, "category": category})
 
 
 # -----------------------
 # DETAY SAYFASI (blogs.html)
 # -----------------------
+def _count_cached_view(request, meta):
+    # Önbellekten dönen detay sayfası da okunma sayılır
+    if meta.get("blog_id"):
+        view_buffer.incr(meta["blog_id"])
+
+
+@anonymous_page_cache(lambda request, slug: [post_scope(slug)], timeout=2 * 60, on_hit=_count_cached_view)
 def blogs(request, slug):
     """
     Tekil blog + yorum yazma formu ÜSTTE + altta sayfalı kök yorumlar (+cevaplar).
     """
-    single_blog = get_object_or_404(Blog, slug=slug, status="Published")
+    single_blog = get_object_or_404(Blog.objects.select_related("author"), slug=slug, status="Published")
 
-    # View counter
-    Blog.objects.filter(pk=single_blog.pk).update(view_count=F("view_count") + 1)
-    single_blog.refresh_from_db(fields=["view_count"])
+    # View counter (write-behind tampon; okuma yolunda DB yazımı yok)
+    record_view(single_blog)
 
-    # Onaylı kök yorumlar (+1 seviye onaylı cevapları prefetch)
-    replies_qs = Comment.objects.filter(status=CommentStatus.APPROVED).select_related("user").order_by("created_at")
+    # Onaylı kök yorumlar (cevap ağacı sayfalamadan sonra tek sorguda bağlanır)
     roots_qs = (
         Comment.objects.filter(
             blog=single_blog,
@@ -75,10 +89,7 @@ def blogs(request, slug):
             parent_comment__isnull=True,
         )
         .select_related("user")
-        .prefetch_related(Prefetch("replies", queryset=replies_qs))
-        .order_by("-created_at")
     )
-    comment_count = roots_qs.count()
 
     # Yorum gönderimi (aynı sayfaya POST)
     if request.method == "POST":
@@ -114,19 +125,22 @@ def blogs(request, slug):
         # (İsteğe bağlı) Görsel
         img = request.FILES.get("image")
         if img:
-            if img.content_type not in ALLOWED_IMAGE_TYPES:
-                if is_ajax:
-                    return JsonResponse({"ok": False, "error": "bad_image_type"}, status=400)
-                messages.error(request, "Desteklenmeyen görsel türü.")
-                return HttpResponseRedirect(reverse("blogs:blogs", args=[slug]) + "#comments")
-            if img.size > MAX_IMAGE_SIZE:
+            try:
+                comment.image = ingest_image(img)  # biçim / piksel kontrolü, EXIF temizliği, küçültme
+            except ValidationError as exc:
                 if is_ajax:
-                    return JsonResponse({"ok": False, "error": "too_large"}, status=400)
-                messages.error(request, "Görsel en fazla 5 MB olmalı.")
+                    return JsonResponse({"ok": False, "error": exc.code}, status=400)
+                messages.error(request, exc.message)
                 return HttpResponseRedirect(reverse("blogs:blogs", args=[slug]) + "#comments")
-            comment.image = img  # models.py'de Comment.image alanı olmalı
 
-        comment.save()
+        try:
+            with transaction.atomic():  # yorum + blog sayaçları birlikte
+                comment.save()
+        except ValidationError as exc:  # çok derin yanıt zinciri
+            if is_ajax:
+                return JsonResponse({"ok": False, "error": exc.code}, status=400)
+            messages.error(request, exc.message)
+            return HttpResponseRedirect(reverse("blogs:blogs", args=[slug]) + "#comments")
 
         # Duruma göre kullanıcı mesajı
         if comment.status == CommentStatus.APPROVED:
@@ -143,11 +157,22 @@ def blogs(request, slug):
         # Normal redirect (yorumlara dön)
         return HttpResponseRedirect(reverse("blogs:blogs", args=[slug]) + "#comments")
 
-    # ---- KÖK yorumlarda sayfalama ----
-    cpage = request.GET.get("cpage", 1)
-    paginator = Paginator(roots_qs, 10)  # her sayfada 10 kök yorum
-    c_page_obj = paginator.get_page(cpage)
-    comments = c_page_obj.object_list  # sadece bu sayfanın kök yorumları
+    # ---- KÖK yorumlarda keyset sayfalama (COUNT / OFFSET yok) ----
+    c_page_obj = KeysetPaginator(roots_qs, 10, field="created_at").get_page(request.GET.get("cpage"))
+    comments = attach_threads(c_page_obj.object_list)  # bu sayfanın kökleri + tüm alt ağaçları
+    # Kapak + tüm yorum görselleri için türev bilgisi tek get_many'de
+    images.prefetch([single_blog.featured_image, *(c.image for c in walk_threads(comments))])
+
+    # AJAX "daha fazla yorum": ayrı query parametresi => sayfa önbelleğinde ayrı anahtar
+    if request.GET.get("format") == "json":
+        return JsonResponse({
+            "ok": True,
+            "html": render_to_string(
+                "comments/comments_thread.html", {"post": single_blog, "comments": comments}, request=request
+            ),
+            "next": c_page_obj.next_cursor,
+            "prev": c_page_obj.previous_cursor,
+        })
 
     # is_saved bayrağı
     is_saved = False
@@ -157,12 +182,16 @@ def blogs(request, slug):
     context = {
         "single_blog": single_blog,
         "comments": comments,
-        "comment_count": comment_count,
+        "comment_count": single_blog.root_comment_count,
         "c_page_obj": c_page_obj,   # <-- template'te sayfalama için
         "form": CommentForm(),
         "is_saved": is_saved,
+        "view_count": displayed_view_count(single_blog),
+        "related": related_posts(single_blog),
     }
-    return render(request, "blogs.html", context)
+    response = render(request, "blogs.html", context)
+    response.page_cache_meta = {"blog_id": single_blog.pk}
+    return response
 
 
 # -----------------------
@@ -170,27 +199,24 @@ def blogs(request, slug):
 # -----------------------
 @login_required
 def like_comment(request, comment_id):
-    comment = get_object_or_404(Comment, id=comment_id)
-    if request.user in comment.likes.all():
-        comment.likes.remove(request.user)
-    else:
-        comment.likes.add(request.user)
+    comment = get_object_or_404(Comment.objects.select_related("blog"), id=comment_id)
+    _, like_count = toggle_like(comment, request.user)
+    invalidate_pages(post_scope(comment.blog.slug))
 
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return JsonResponse({"ok": True, "comment_id": comment.id, "like_count": comment.likes.count()})
+        return JsonResponse({"ok": True, "comment_id": comment.id, "like_count": like_count})
     return redirect(f'{request.META.get("HTTP_REFERER", "/")}#comment_{comment.id}')
 
 
 @login_required
 def like_post(request, slug):
     post = get_object_or_404(Blog, slug=slug, status="Published")
-    if request.user in post.likes.all():
-        post.likes.remove(request.user)
-    else:
-        post.likes.add(request.user)
+    liked, like_count = toggle_like(post, request.user)
+    invalidate_pages(post_scope(slug))
+    analytics.record(EventKind.LIKE if liked else EventKind.UNLIKE, post.pk, request.user.pk)
 
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
-        return JsonResponse({"ok": True, "likes": post.likes.count()})
+        return JsonResponse({"ok": True, "likes": like_count})
     return redirect(request.META.get("HTTP_REFERER", "home"))
 
 
@@ -201,6 +227,8 @@ def toggle_save_post(request, slug):
     saved = True if created else False
     if not created:
         obj.delete()
+    else:
+        analytics.record(EventKind.SAVE, post.pk, request.user.pk)
     if request.headers.get("X-Requested-With") == "XMLHttpRequest":
         return JsonResponse({"ok": True, "saved": saved})
     return redirect(request.META.get("HTTP_REFERER", reverse("blogs:blogs", args=[slug])))
@@ -239,40 +267,95 @@ def profile_edit_me(request):
     return redirect("blogs:profile_edit", username=request.user.username)
 
 
+# Profil sekmeleri: ad -> (queryset kurucu, keyset alanı, satır şablonu)
+PROFILE_TAB_SIZE = 20
+PROFILE_TABS = {
+    "liked": (
+        lambda user: Blog.objects.filter(likes=user).only("title", "slug", "created_at", "updated_at"),
+        "updated_at",
+        "profile/_liked_items.html",
+    ),
+    "comments": (
+        lambda user: Comment.objects.filter(user=user)
+        .select_related("blog")
+        .only("comment", "created_at", "blog__title", "blog__slug"),
+        "created_at",
+        "profile/_comment_items.html",
+    ),
+    "saved": (
+        lambda user: SavedPost.objects.filter(user=user)
+        .select_related("post")
+        .only("saved_at", "post__title", "post__slug"),
+        "saved_at",
+        "profile/_saved_items.html",
+    ),
+}
+
+
+def _profile_tab_page(request, user, tab):
+    build, field, template = PROFILE_TABS[tab]
+    page = KeysetPaginator(build(user), PROFILE_TAB_SIZE, field=field).get_page(request.GET.get("cursor"))
+    return page, template
+
+
 @login_required
 def profile_view(request, username):
-    profile_user = get_object_or_404(User, username=username)
-    profile_obj, _ = Profile.objects.get_or_create(user=profile_user)
+    # Başlık sayıları kullanıcı satırıyla aynı SELECT'te (alt sorgular)
+    profile_user = get_object_or_404(
+        User.objects.select_related("profile").annotate(**profile_stat_annotations()),
+        username=username,
+    )
+    try:
+        profile_obj = profile_user.profile
+    except Profile.DoesNotExist:
+        profile_obj, _ = Profile.objects.get_or_create(user=profile_user)
 
-    liked_posts = Blog.objects.filter(likes=profile_user)
-    comments = Comment.objects.filter(user=profile_user)
-    saved_posts = SavedPost.objects.filter(user=profile_user).select_related("post")
+    # Sadece aktif sekmenin ilk sayfası render edilir; diğerleri AJAX ile
+    tab = request.GET.get("tab")
+    if tab not in PROFILE_TABS:
+        tab = "liked"
+    page_obj, items_template = _profile_tab_page(request, profile_user, tab)
 
     context = {
         "profile_user": profile_user,
         "profile": profile_obj,
-        "liked_posts": liked_posts,
-        "comments": comments,
-        "saved_posts": saved_posts,
-        "total_likes": liked_posts.count(),
-        "total_comments": comments.count(),
+        "tab": tab,
+        "page_obj": page_obj,
+        "items_template": items_template,
+        "total_likes": profile_user.total_likes,
+        "total_comments": profile_user.total_comments,
+        "total_saved": profile_user.total_saved,
     }
     return render(request, "profile.html", context)
 
 
+@login_required
+def profile_tab(request, username, tab):
+    """Profil sekmesinin bir sayfası (JSON: satır HTML'i + sonraki cursor)."""
+    if tab not in PROFILE_TABS:
+        raise Http404("Sekme yok")
+    profile_user = get_object_or_404(User, username=username)
+    page_obj, items_template = _profile_tab_page(request, profile_user, tab)
+    return JsonResponse({
+        "ok": True,
+        "html": render_to_string(items_template, {"page_obj": page_obj}, request=request),
+        "next": page_obj.next_cursor,
+        "prev": page_obj.previous_cursor,
+    })
+
+
 # -----------------------
 # ARAMA / HAKKIMIZDA / İLETİŞİM / STATİK SAYFA
 # -----------------------
 def search(request):
     keyword = (request.GET.get("keyword") or "").strip()
-    blogs = Blog.objects.filter(status="Published")
-    if keyword:
-        blogs = blogs.filter(
-            Q(title__icontains=keyword) |
-            Q(short_description__icontains=keyword) |
-            Q(blog_body__icontains=keyword)
-        )
-    return render(request, "search.html", {"blogs": blogs, "keyword": keyword})
+    # FTS backend (sıralı id'ler) + sadece bu sayfanın Blog'ları ve snippet'leri
+    page_obj = Paginator(SearchResults(keyword), 10).get_page(request.GET.get("page"))
+    return render(request, "search.html", {
+        "blogs": page_obj.object_list,
+        "page_obj": page_obj,
+        "keyword": keyword,
+    })
 
 
 def about(request):
@@ -326,6 +409,7 @@ def contact_view(request):
                 headers={"Reply-To": email},  # → Gmail’den yanıtladığında doğrudan kullanıcıya gider
             )
             em.send(fail_silently=False)
+            metrics.mail_messages.inc(source="contact", outcome="sent")
 
             # 3) Kullanıcıya otomatik “alındı” maili
             try:
@@ -335,11 +419,13 @@ def contact_view(request):
                     from_email=settings.DEFAULT_FROM_EMAIL,
                     to=[email],
                 )
-                ack.send(fail_silently=True)
+                sent = ack.send(fail_silently=True)
+                metrics.mail_messages.inc(source="contact_ack", outcome="sent" if sent else "error")
             except Exception:
-                pass
+                metrics.mail_messages.inc(source="contact_ack", outcome="error")
 
         except Exception as exc:
+            metrics.mail_messages.inc(source="contact", outcome="error")
             logger.exception("Contact mail gönderilemedi: %s", exc)
 
         # 4) Kullanıcıya başarı mesajı + redirect
@@ -394,19 +480,22 @@ def comment_add(request, post_id):
     # (İsteğe bağlı) Görsel
     img = request.FILES.get("image")
     if img:
-        if img.content_type not in ALLOWED_IMAGE_TYPES:
-            if is_ajax:
-                return JsonResponse({"ok": False, "error": "bad_image_type"}, status=400)
-            messages.error(request, "Desteklenmeyen görsel türü.")
-            return redirect("blogs:blogs", slug=post.slug)
-        if img.size > MAX_IMAGE_SIZE:
+        try:
+            c.image = ingest_image(img)
+        except ValidationError as exc:
             if is_ajax:
-                return JsonResponse({"ok": False, "error": "too_large"}, status=400)
-            messages.error(request, "Görsel en fazla 5 MB olmalı.")
+                return JsonResponse({"ok": False, "error": exc.code}, status=400)
+            messages.error(request, exc.message)
             return redirect("blogs:blogs", slug=post.slug)
-        c.image = img
 
-    c.save()
+    try:
+        with transaction.atomic():  # yorum + blog sayaçları birlikte
+            c.save()
+    except ValidationError as exc:  # çok derin yanıt zinciri
+        if is_ajax:
+            return JsonResponse({"ok": False, "error": exc.code}, status=400)
+        messages.error(request, exc.message)
+        return redirect("blogs:blogs", slug=post.slug)
 
     if c.status == CommentStatus.APPROVED:
         messages.success(request, "Yorumun yayınlandı. 🤖")
@@ -1,7 +1,7 @@
 from django import forms
 from blogs.models import Blog, Category
 from django.contrib.auth.forms import UserCreationForm
-from django.contrib.auth.models import User
+from django.contrib.auth.models import Permission, User
 
 
 class CategoryForm(forms.ModelForm):
@@ -17,13 +17,20 @@ class BlogPostForm(forms.ModelForm):
 
 
 
-class AddUserForm(UserCreationForm):
+class PermissionChoicesMixin:
+    # Permission.__str__ content_type'ı okur; seçenek başına ayrı sorgu olmasın
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["user_permissions"].queryset = Permission.objects.select_related("content_type")
+
+
+class AddUserForm(PermissionChoicesMixin, UserCreationForm):
     class Meta:
         model = User
         fields = ("username","email","first_name","last_name","is_active","is_staff","is_superuser","groups","user_permissions")
 
 
-class EditUserForm(forms.ModelForm):
+class EditUserForm(PermissionChoicesMixin, forms.ModelForm):
     class Meta:
         model = User
         fields = ("username","email","first_name","last_name","is_active","is_staff","is_superuser","groups","user_permissions")        
\ No newline at end of file
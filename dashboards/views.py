@@ -3,15 +3,26 @@ from blogs.models import Blog, Category
 from .forms import AddUserForm, BlogPostForm, CategoryForm, EditUserForm
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from blogs import analytics
 
 def dashboard(request):
     if not request.user.is_authenticated:
         return redirect('/')
     category_count = Category.objects.all().count()
     blogs_count = Blog.objects.all().count()
+    # Grafik ve listeler sadece günlük özet tablosundan (rollup_analytics)
+    daily = analytics.daily_totals(30)
+    peak = max((d["views"] for d in daily), default=0) or 1
+    for d in daily:
+        d["pct"] = round(100 * d["views"] / peak)
     context = {
         "category_count": category_count,
         "blogs_count": blogs_count,
+        "daily": daily,
+        "totals": {col: sum(d[col] for d in daily) for col in analytics.COLUMNS},
+        "top_viewed": analytics.top_posts(7, "views"),
+        "top_liked": analytics.top_posts(30, "likes"),
+        "top_commented": analytics.top_posts(30, "comments"),
     }
     return render(request, "dashboard/dashboard.html", context)
 
@@ -62,7 +73,7 @@ def posts(request):
     if not request.user.is_authenticated:
         return redirect('/')
     # Admin tarafı: tüm yazıları listelemek mantıklı, en yeniler en üstte
-    post_list = Blog.objects.all().order_by('-id')
+    post_list = Blog.objects.select_related("category", "author").order_by('-id')
     paginator = Paginator(post_list, 5)  # sayfa başı 5 post
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)